@@ -2,8 +2,11 @@
 # pyright: reportUnknownVariableType = false
 
 import logging
-import re
+import math
 from collections.abc import Iterable
+from dataclasses import fields
+from functools import cached_property
+from itertools import chain
 from pathlib import Path
 from typing import Final
 
@@ -12,8 +15,11 @@ import pandas as pd
 import seaborn as sns
 
 from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.salary_cube import SalaryCube
+from hh_inspect.skill_cooccurrence import SkillCooccurrence
+from hh_inspect.text_stats import DEFAULT_STOPWORDS, WordCounter
 from hh_inspect.utils import find_top_words_in_list
-from hh_inspect.vacancy import Vacancy
+from hh_inspect.vacancy import CATEGORICAL_FIELDS, Vacancy
 
 
 logger = logging.getLogger(__name__)
@@ -21,15 +27,61 @@ printer = ConsolePrinter()
 
 pd.set_option("display.max_colwidth", 35)
 
+SALARY_FIELDS: Final = ("salary_from", "salary_to")
+_LIST_FIELDS: Final = ("work_format", "key_skills")
+_COLUMNS: Final = tuple(f.name for f in fields(Vacancy))
+
 
 class Analyzer:
-    def __init__(self, vacancies: list[Vacancy], show_excluded: bool = False) -> None:
+    """Salary and skill statistics of vacancies.
+
+    working_df is built column by column with compact dtypes. Descriptions are the bulk of the data
+    and are loaded only when they are needed: by the description statistics or the CSV export.
+    """
+
+    def __init__(
+        self, vacancies: list[Vacancy], show_excluded: bool = False, extra_stopwords: Iterable[str] = ()
+    ) -> None:
         self.vacancies = vacancies
-        self.working_df = pd.DataFrame([vars(v) for v in self.vacancies if show_excluded or not v.excluded])
-        # print(self.working_df.dtypes)  # noqa: ERA001
+        self.stopwords = DEFAULT_STOPWORDS.union(extra_stopwords)
+        self._selected = [v for v in self.vacancies if show_excluded or not v.excluded]
+        self.working_df = pd.DataFrame(
+            {name: self._make_column(name) for name in _COLUMNS if name != "description"}, copy=False
+        )
+
+    def _make_column(self, name: str) -> pd.Series:
+        values = [getattr(v, name) for v in self._selected]
+        if name in CATEGORICAL_FIELDS:
+            return pd.Series(values, dtype="category")
+        if name in SALARY_FIELDS:
+            return pd.Series(values, dtype="Int32")
+        if name in {"accredited_it", "excluded"}:
+            return pd.Series(values, dtype="bool")
+        if name == "published_at":
+            # Dates without time, so that the CSV keeps them as YYYY-MM-DD
+            return pd.Series(pd.to_datetime(values, format="%Y-%m-%d", errors="coerce"))
+        if name in _LIST_FIELDS:
+            return pd.Series(values, dtype="object")
+        return pd.Series(values, dtype="str")
+
+    def load_descriptions(self) -> None:
+        """Add the description column at its place among the Vacancy fields, if it is not loaded yet."""
+        if "description" not in self.working_df:
+            self.working_df.insert(_COLUMNS.index("description"), "description", self._make_column("description"))
+
+    def get_memory_usage(self) -> pd.Series:
+        """Return the bytes taken by each column of working_df, strings and lists included."""
+        return self.working_df.memory_usage(index=False, deep=True)
+
+    def print_memory_usage(self) -> None:
+        usage = self.get_memory_usage()
+        printer.print(f"\nworking_df: {len(self.working_df)} rows, {usage.sum() / 2**20:.1f} MiB")
+        for column, num_bytes in usage.sort_values(ascending=False).items():
+            printer.print(f"{column[:20]:20} {num_bytes / 2**20:8.2f} MiB  {self.working_df[column].dtype}")
 
     def save_vacancies_to_csv(self, filename: Path) -> None:
         logger.info(f"Saving vacancies to '{filename}'...")
+        self.load_descriptions()
         self.working_df.to_csv(filename, index=False)
 
     def print_salary_stats(self) -> None:
@@ -51,6 +103,8 @@ class Analyzer:
 
     def get_salary_stats_for_field(self, field_name: str) -> dict[str, float]:
         series = self.working_df[field_name][self.working_df[field_name] > 0]
+        if series.empty:
+            return dict.fromkeys(("min", "max", "mean", "median"), math.nan)
         return {
             "min": series.min(),
             "max": series.max(),
@@ -58,35 +112,57 @@ class Analyzer:
             "median": series.median(),
         }
 
+    @cached_property
+    def salary_cube(self) -> SalaryCube:
+        """Salary statistics by experience, region, schedule, work format, employer and key skill."""
+        return SalaryCube.build(self.working_df)
+
+    def print_salary_by(self, dimension: str, print_amount: int = 10) -> None:
+        """Print salary statistics of the groups with the most salaries."""
+        top = self.salary_cube.top(dimension, amount=print_amount)
+        printer.print(f"\nSalaries by {dimension}, {print_amount} largest groups:")
+        printer.print(f"{'':20} {'count':>6} {'mean':>8} {'p25':>8} {'median':>8} {'p75':>8}")
+        for value, row in top.iterrows():
+            printer.print(
+                f"{str(value)[:20]:20} {row['count']:6.0f} {row['mean']:8.0f} "
+                f"{row['p25']:8.0f} {row['median']:8.0f} {row['p75']:8.0f}"
+            )
+
+    @cached_property
+    def skill_cooccurrence(self) -> SkillCooccurrence:
+        return SkillCooccurrence(self.working_df["key_skills"])
+
+    def print_related_skills(self, skill: str, print_amount: int = 10) -> None:
+        related = self.skill_cooccurrence.related(skill, print_amount)
+        printer.print(
+            f"\nKey skills most related to '{skill}' ({self.skill_cooccurrence.skill_count(skill)} vacancies):"
+        )
+        if not related:
+            printer.print("none found")
+        for other, count, lift in related:
+            printer.print(f"{other[:20]:20} {count:6} lift {lift:.1f}")
+
     def print_top_key_skills(self, print_amount: int = 10) -> None:
-        top_skills = self.get_top_key_skills()
+        top_skills = self.get_top_key_skills(print_amount)
         printer.print(f"\nThe {print_amount} most frequently used words in Key skills:")
-        for key, value in top_skills[:print_amount]:
+        for key, value in top_skills:
             printer.print(f"{key[:20]:20} {value}")
 
     def print_top_words_in_description(self, print_amount: int = 10) -> None:
-        top_words = self.get_top_description_words()
+        top_words = self.get_top_description_words(print_amount)
         printer.print(f"\nThe {print_amount} most frequently used words in Description:")
-        for key, value in top_words[:print_amount]:
+        for key, value in top_words:
             printer.print(f"{key[:20]:20} {value}")
 
-    def get_top_key_skills(self) -> list[tuple[str, int]]:
-        df_column = self.working_df["key_skills"]
-        key_skills_list: list[list[str]] = df_column.to_list()
-        skills_list = [x for elem in key_skills_list for x in elem]
-        return find_top_words_in_list(skills_list)
-
-    def get_top_description_words(self) -> list[tuple[str, int]]:
-        df_column: pd.Series[str] = self.working_df["description"]
-        words_list = " ".join(df_column.to_list())
-        eng_words_list: Final[list[str]] = re.findall("[a-zA-Z_]+", words_list)
-        filtered_list = Analyzer.filter_noise_words(eng_words_list)
-        return find_top_words_in_list(filtered_list)
-
-    @staticmethod
-    def filter_noise_words(string_list: list[str]) -> Iterable[str]:
-        noise_words = {"API", "IT", "quot", "and", "or", "I", "it"}
-        return filter(lambda w: w not in noise_words, string_list)
+    def get_top_key_skills(self, amount: int | None = None) -> list[tuple[str, int]]:
+        """Return the amount (all if None) most frequent key skills."""
+        return find_top_words_in_list(chain.from_iterable(self.working_df["key_skills"]), amount)
+
+    def get_top_description_words(self, amount: int | None = None) -> list[tuple[str, int]]:
+        """Count words of the descriptions one by one, the description column is not needed."""
+        counter = WordCounter(self.stopwords)
+        counter.update(v.description for v in self._selected)
+        return counter.most_common(amount)
 
     def draw_plots(self) -> None:
         printer.print("\nClose an image window to exit...")
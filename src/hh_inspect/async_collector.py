@@ -0,0 +1,133 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Final, cast
+
+from tqdm.asyncio import tqdm_asyncio
+
+from hh_inspect.data_collector import REQUEST_TIMEOUT, RESPONSE_OK, DataCollector, printer
+from hh_inspect.http_session import RETRY_STATUSES
+from hh_inspect.response_cache import CacheEntry
+from hh_inspect.vacancy import Vacancy
+
+
+try:
+    import aiohttp
+except ImportError as e:
+    msg = "The asyncio backend requires aiohttp, install it with 'uv sync --extra async'"
+    raise ImportError(msg) from e
+
+
+_FETCH_ERRORS: Final = (aiohttp.ClientError, TimeoutError)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDataCollector(DataCollector):
+    """DataCollector that fetches vacancy details with asyncio instead of a thread pool.
+
+    The number of requests in flight is bounded by `num_workers`, which can be set
+    to hundreds here since every request costs a coroutine, not a thread.
+    """
+
+    def build_vacancy_list(self, vacancy_ids: Iterable[str]) -> list[Vacancy]:
+        return asyncio.run(self._build_vacancy_list_async(vacancy_ids))
+
+    async def _build_vacancy_list_async(self, vacancy_ids: Iterable[str]) -> list[Vacancy]:
+        semaphore: Final = asyncio.BoundedSemaphore(self.num_workers)
+        connector: Final = aiohttp.TCPConnector(limit=self.num_workers)
+        timeout: Final = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        headers: Final = dict(self.session.session.headers)
+
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            ids: list[str] = []
+            tasks: list[asyncio.Task[Vacancy | bytes | None]] = []
+            async for vacancy_id in _iterate_in_thread(vacancy_ids):
+                ids.append(vacancy_id)
+                tasks.append(asyncio.create_task(self.get_vacancy_or_none_async(session, semaphore, vacancy_id)))
+            for task in tasks:
+                task.add_done_callback(self.record_fetched)  # same interface as concurrent.futures.Future
+            results: list[Vacancy | bytes | None] = await tqdm_asyncio.gather(
+                *tasks, desc="Getting data from api.hh.ru", ncols=100, disable=not printer.print_to_console
+            )
+        return self._collect_results(zip(ids, results, strict=True))
+
+    def stream_vacancy_list(self, vacancy_ids: Iterable[str], write: Callable[[Vacancy], None]) -> int:
+        return asyncio.run(self._stream_vacancy_list_async(vacancy_ids, write))
+
+    async def _stream_vacancy_list_async(self, vacancy_ids: Iterable[str], write: Callable[[Vacancy], None]) -> int:
+        semaphore: Final = asyncio.BoundedSemaphore(self.num_workers)
+        connector: Final = aiohttp.TCPConnector(limit=self.num_workers)
+        timeout: Final = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+        headers: Final = dict(self.session.session.headers)
+
+        count = 0
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            pending: dict[asyncio.Task[Vacancy | bytes | None], str] = {}
+            async for vacancy_id in _iterate_in_thread(vacancy_ids):
+                task = asyncio.create_task(self.get_vacancy_or_none_async(session, semaphore, vacancy_id))
+                pending[task] = vacancy_id
+                if len(pending) >= 2 * self.num_workers:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    count += self._write_results(((pending.pop(t), t.result()) for t in done), write)
+            if pending:
+                await asyncio.wait(pending)
+            count += self._write_results(((vacancy_id, t.result()) for t, vacancy_id in pending.items()), write)
+        return count
+
+    async def get_vacancy_or_none_async(
+        self, session: aiohttp.ClientSession, semaphore: asyncio.BoundedSemaphore, vacancy_id: str
+    ) -> Vacancy | bytes | None:
+        """Async twin of get_vacancy_or_none() with the same rate limiting and retry policy."""
+        cached: CacheEntry | None = None
+        if self.cache is not None:
+            cached = self.cache.get(vacancy_id)
+            if cached is not None and self.cache.is_fresh(cached):
+                return self.make_vacancy(self.cache.use(cached))
+
+        url = f"{self.api_url}{vacancy_id}"
+        headers = cached.conditional_headers() if cached is not None else None
+        limiter = self.session.rate_limiter
+        async with semaphore:
+            attempt = 0
+            while True:
+                await asyncio.sleep(limiter.reserve())
+                start = time.perf_counter()
+                try:
+                    async with session.get(url, headers=headers) as response:
+                        status = response.status
+                        response_headers = response.headers.copy()
+                        content = await response.read() if status == RESPONSE_OK else None
+                        num_bytes = len(content) if content is not None else response.content_length or 0
+                    self.metrics.observe_request("vacancy", status, time.perf_counter() - start, num_bytes)
+                except _FETCH_ERRORS as e:
+                    self.metrics.observe_request("vacancy", 0, time.perf_counter() - start, 0)
+                    if attempt >= self.session.max_retries:
+                        logger.exception(f"Error fetching vacancy {vacancy_id}")
+                        self.dropped_ids[vacancy_id] = type(e).__name__
+                        return None
+                    delay = self.session.get_retry_delay(attempt, None, None)
+                else:
+                    if status not in RETRY_STATUSES or attempt >= self.session.max_retries:
+                        break
+                    delay = self.session.get_retry_delay(attempt, status, response_headers.get("Retry-After"))
+
+                logger.warning(f"Retrying '{url}' in {delay:.1f} s (attempt {attempt + 1})")
+                await asyncio.sleep(delay)
+                attempt += 1
+
+        return self.handle_response(vacancy_id, status, response_headers, content, cached)
+
+
+async def _iterate_in_thread[T](iterable: Iterable[T]) -> AsyncIterator[T]:
+    """Iterate over a blocking iterable (e.g. ids from search pages) without blocking the event loop."""
+    if isinstance(iterable, list | tuple):
+        for item in iterable:
+            yield item
+        return
+
+    iterator = iter(iterable)
+    sentinel: Final = object()
+    while (item := await asyncio.to_thread(next, iterator, sentinel)) is not sentinel:
+        yield cast("T", item)
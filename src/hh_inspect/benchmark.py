@@ -0,0 +1,284 @@
+import argparse
+import contextlib
+import json
+import logging
+import re
+import statistics
+import time
+import timeit
+import tracemalloc
+from collections import Counter
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field, replace
+from typing import Any, Final
+
+from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.data_collector import DataCollector, create_collector
+from hh_inspect.mock_api import MockApiConfig, MockApiServer, make_sample_vacancy
+from hh_inspect.settings import CollectorBackend, FilterAfterSettings, GeneralSettings, Settings
+from hh_inspect.text_stats import WordCounter
+from hh_inspect.vacancy import Vacancy, parse_vacancy_data
+
+
+_DEFAULT_WORKERS: Final = [1, 4, 16, 64]
+
+printer = ConsolePrinter()
+
+
+def _parse_with_dicts(content: bytes) -> Vacancy:
+    return parse_vacancy_data(json.loads(content)).to_basic_vacancy()
+
+
+def _measure(parse: Callable[[bytes], Vacancy], bodies: list[bytes], repeat: int) -> float:
+    """Return the best time of parsing one body in microseconds."""
+    best = min(timeit.repeat(lambda: [parse(body) for body in bodies], number=1, repeat=repeat))
+    return best / len(bodies) * 1e6
+
+
+def bench_parser(num_vacancies: int, repeat: int) -> None:
+    """Compare the dict-walking parser with the typed msgspec decoder."""
+    bodies = [json.dumps(make_sample_vacancy(str(i)), ensure_ascii=False).encode() for i in range(num_vacancies)]
+    parsers: dict[str, Callable[[bytes], Vacancy]] = {"json + parse_vacancy_data": _parse_with_dicts}
+    try:
+        from hh_inspect.fast_parser import decode_vacancy  # noqa: PLC0415 (msgspec is optional)
+    except ImportError as e:
+        printer.print(f"Skipping the typed decoder: {e}")
+    else:
+        check_parser(decode_vacancy, bodies)
+        parsers["msgspec decode_vacancy"] = decode_vacancy
+
+    printer.print(f"Parsing {num_vacancies} vacancies of {len(bodies[0]) / 1024:.1f} KiB, best of {repeat}:")
+    baseline = 0.0
+    for name, parse in parsers.items():
+        per_vacancy = _measure(parse, bodies, repeat)
+        baseline = baseline or per_vacancy
+        printer.print(f"  {name:28} {per_vacancy:8.1f} us/vacancy  x{baseline / per_vacancy:.1f}")
+
+
+def check_parser(parse: Callable[[bytes], Vacancy], bodies: list[bytes]) -> None:
+    """Raise RuntimeError if parse() differs from the dict-walking parser on any body."""
+    for body in bodies:
+        expected = _parse_with_dicts(body)
+        if parse(body) != expected:
+            msg = f"The parsers disagree on vacancy {expected.vacancy_id}"
+            raise RuntimeError(msg)
+
+
+def bench_frame(num_vacancies: int) -> None:
+    """Compare the memory and build time of a row-wise DataFrame with the columnar one of Analyzer."""
+    import pandas as pd  # noqa: PLC0415 (pandas and matplotlib are slow to import)
+
+    from hh_inspect.analyzer import Analyzer  # noqa: PLC0415
+
+    vacancies = _make_varied_vacancies(num_vacancies)
+    start = time.perf_counter()
+    rows_df = pd.DataFrame([vars(v) for v in vacancies])
+    rows_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    analyzer = Analyzer(vacancies)
+    columns_seconds = time.perf_counter() - start
+
+    rows_mib = rows_df.memory_usage(index=False, deep=True).sum() / 2**20
+    columns_mib = analyzer.get_memory_usage().sum() / 2**20
+    printer.print(f"DataFrame of {num_vacancies} vacancies:")
+    printer.print(f"  {'rows of vars()':28} {rows_mib:8.1f} MiB {rows_seconds:6.2f} s")
+    printer.print(f"  {'Analyzer, no descriptions':28} {columns_mib:8.1f} MiB {columns_seconds:6.2f} s")
+    analyzer.load_descriptions()
+    with_descriptions_mib = analyzer.get_memory_usage().sum() / 2**20
+    printer.print(f"  {'Analyzer, with descriptions':28} {with_descriptions_mib:8.1f} MiB")
+    analyzer.print_memory_usage()
+
+
+def bench_words(num_vacancies: int) -> None:
+    """Compare word counting over the joined descriptions with the streaming WordCounter."""
+    descriptions = [v.description for v in _make_varied_vacancies(num_vacancies)]
+
+    def count_joined() -> None:
+        Counter(re.findall("[a-zA-Z_]+", " ".join(descriptions)))
+
+    def count_streaming() -> None:
+        WordCounter().update(descriptions)
+
+    printer.print(f"Counting words of {num_vacancies} descriptions, time and peak traced memory:")
+    for name, count in (("join + findall (Latin only)", count_joined), ("WordCounter", count_streaming)):
+        start = time.perf_counter()
+        count()
+        seconds = time.perf_counter() - start
+        tracemalloc.start()  # slows allocations down a lot, so the time is measured by another run
+        count()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        printer.print(f"  {name:28} {seconds:6.2f} s {peak / 2**20:8.1f} MiB")
+
+
+def _make_varied_vacancies(num_vacancies: int) -> list[Vacancy]:
+    """Return copies of the sample vacancy with a realistic spread of employers, regions and salaries."""
+    sample = _parse_with_dicts(json.dumps(make_sample_vacancy("0"), ensure_ascii=False).encode())
+    return [
+        replace(
+            sample,
+            vacancy_id=str(i),
+            employer_name=f"Employer {i % 3000}",
+            region=f"Region {i % 80}",
+            salary_from=100_000 + i % 200 * 1000,
+            description=f"{i} {sample.description}",  # distinct strings, like real descriptions
+        )
+        for i in range(num_vacancies)
+    ]
+
+
+@dataclass
+class CollectResult:
+    backend: CollectorBackend
+    num_workers: int
+    vacancies: int
+    seconds: float
+    latencies: list[float] = field(repr=False)  # seconds per vacancy, retries included
+    dropped: int = 0
+
+    @property
+    def vacancies_per_second(self) -> float:
+        return self.vacancies / self.seconds if self.seconds > 0 else 0.0
+
+    def percentile(self, percent: int) -> float:
+        """Return the latency percentile in milliseconds."""
+        if len(self.latencies) < 2:  # noqa: PLR2004
+            return sum(self.latencies) * 1000
+        return statistics.quantiles(self.latencies, n=100, method="inclusive")[percent - 1] * 1000
+
+    def __str__(self) -> str:
+        return (
+            f"{self.backend:8} {self.num_workers:7} {self.vacancies_per_second:10.1f} "
+            f"{self.percentile(50):8.1f} {self.percentile(95):8.1f} {self.percentile(99):8.1f} {self.dropped:8}"
+        )
+
+
+def run_collection(api_url: str, backend: CollectorBackend, num_workers: int) -> CollectResult:
+    """Collect all vacancies served at api_url and measure the throughput and the latency of every vacancy."""
+    settings = Settings(
+        filter_after=FilterAfterSettings(excluded_companies=[]),
+        general=GeneralSettings(
+            num_workers=num_workers, backend=backend, checkpoint_every=0, print_output_to_console=False
+        ),
+    )
+    settings.query.per_page = 100
+    collector = create_collector(settings)
+    collector.api_url = api_url
+    latencies = _track_latencies(collector)
+
+    print_to_console = printer.print_to_console
+    printer.print_to_console = False  # progress bars and messages of the collector would break the table
+    try:
+        start = time.perf_counter()
+        vacancies = collector.collect_vacancies()
+        seconds = time.perf_counter() - start
+    finally:
+        printer.print_to_console = print_to_console
+        collector.close()
+    return CollectResult(backend, num_workers, len(vacancies), seconds, latencies, len(collector.dropped_ids))
+
+
+def _track_latencies(collector: DataCollector) -> list[float]:
+    """Wrap the per-vacancy fetch method of the collector to record the time it holds a worker."""
+    latencies: list[float] = []
+    fetch_async: Callable[..., Coroutine[Any, Any, Any]] | None = getattr(collector, "get_vacancy_or_none_async", None)
+    if fetch_async is not None:
+
+        async def timed_fetch_async(session: Any, semaphore: Any, vacancy_id: str) -> Any:
+            async with semaphore:  # waiting for a free worker is not a part of the latency, as with threads
+                start = time.perf_counter()
+                try:
+                    return await fetch_async(session, contextlib.nullcontext(), vacancy_id)
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+        setattr(collector, "get_vacancy_or_none_async", timed_fetch_async)  # noqa: B010
+        return latencies
+
+    fetch = collector.get_vacancy_or_none
+
+    def timed_fetch(vacancy_id: str) -> Vacancy | bytes | None:
+        start = time.perf_counter()
+        try:
+            return fetch(vacancy_id)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    setattr(collector, "get_vacancy_or_none", timed_fetch)  # noqa: B010
+    return latencies
+
+
+def bench_collect(config: MockApiConfig, backends: list[CollectorBackend], workers: list[int]) -> list[CollectResult]:
+    """Collect vacancies from the local mock API with every backend and number of workers."""
+    logging.basicConfig(level=logging.ERROR)  # retries are expected, do not mix their warnings with the table
+    server = MockApiServer(config)
+    server.start()
+    printer.print(
+        f"Collecting {config.num_vacancies} vacancies, latency {config.latency * 1000:.0f}"
+        f"±{config.jitter * 1000:.0f} ms, errors {config.error_rate:.0%}, throttled {config.throttle_rate:.0%}"
+    )
+    printer.print(
+        f"{'backend':8} {'workers':>7} {'vac/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'dropped':>8}"
+    )
+
+    results: list[CollectResult] = []
+    try:
+        for backend in backends:
+            for num_workers in workers:
+                try:
+                    result = run_collection(server.url, backend, num_workers)
+                except ImportError as e:
+                    printer.print(f"Skipping the {backend} backend: {e}")
+                    break
+                printer.print(result)
+                results.append(result)
+    finally:
+        server.stop()
+    return results
+
+
+def main() -> None:
+    """Run with `python -m hh_inspect.benchmark <name>`."""
+    parser = argparse.ArgumentParser(description="HH Inspector benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+    parser_cmd = subparsers.add_parser("parser", help="Parsing of vacancy responses")
+    parser_cmd.add_argument("-n", "--num_vacancies", type=int, default=2000)
+    parser_cmd.add_argument("-r", "--repeat", type=int, default=5)
+
+    collect_cmd = subparsers.add_parser("collect", help="Collection from a local mock API")
+    collect_cmd.add_argument("-n", "--num_vacancies", type=int, default=1000)
+    collect_cmd.add_argument("-w", "--workers", type=int, nargs="+", default=_DEFAULT_WORKERS)
+    collect_cmd.add_argument(
+        "-b", "--backends", nargs="+", choices=["threads", "asyncio"], default=["threads", "asyncio"]
+    )
+    collect_cmd.add_argument("--latency", type=float, default=0.05, help="Seconds before every response")
+    collect_cmd.add_argument("--jitter", type=float, default=0.02)
+    collect_cmd.add_argument("--error_rate", type=float, default=0.0, help="Share of 503 responses")
+    collect_cmd.add_argument("--throttle_rate", type=float, default=0.0, help="Share of 429 responses")
+
+    frame_cmd = subparsers.add_parser("frame", help="Memory of the Analyzer DataFrame")
+    frame_cmd.add_argument("-n", "--num_vacancies", type=int, default=100_000)
+
+    words_cmd = subparsers.add_parser("words", help="Word statistics of descriptions")
+    words_cmd.add_argument("-n", "--num_vacancies", type=int, default=20_000)
+
+    args = parser.parse_args()
+    if args.benchmark == "parser":
+        bench_parser(args.num_vacancies, args.repeat)
+    elif args.benchmark == "collect":
+        config = MockApiConfig(
+            num_vacancies=args.num_vacancies,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+        )
+        bench_collect(config, args.backends, args.workers)
+    elif args.benchmark == "frame":
+        bench_frame(args.num_vacancies)
+    elif args.benchmark == "words":
+        bench_words(args.num_vacancies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import json
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict
+from pathlib import Path
+from typing import Final
+
+from hh_inspect.vacancy import Vacancy
+
+
+_IDS_FILENAME: Final = "ids.json"
+_VACANCIES_FILENAME: Final = "vacancies.jsonl"
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    """Progress of a collection stored on disk, so an interrupted run can be resumed.
+
+    Harvested vacancy ids are saved once all search pages are fetched, fetched vacancies
+    are appended to a JSON Lines file in batches of `flush_every`.
+    """
+
+    def __init__(self, directory: Path, flush_every: int = 100) -> None:
+        self.directory = directory
+        self.flush_every = max(flush_every, 1)
+        self._buffer: list[Vacancy] = []
+        self._lock = threading.Lock()
+
+    @property
+    def ids_path(self) -> Path:
+        return self.directory / _IDS_FILENAME
+
+    @property
+    def vacancies_path(self) -> Path:
+        return self.directory / _VACANCIES_FILENAME
+
+    def load_ids(self) -> list[str] | None:
+        if not self.ids_path.exists():
+            return None
+        try:
+            with open(self.ids_path, encoding="utf-8") as f:
+                return [str(vacancy_id) for vacancy_id in json.load(f)]
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Cannot read '{self.ids_path}' ({e!r}), ids will be harvested again")
+            return None
+
+    def load_vacancies(self) -> dict[str, Vacancy]:
+        vacancies: dict[str, Vacancy] = {}
+        if not self.vacancies_path.exists():
+            return vacancies
+        with open(self.vacancies_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    vac = Vacancy(**json.loads(line))
+                except (ValueError, TypeError) as e:
+                    # e.g. the last line was cut off by a crash
+                    logger.warning(f"Skipping broken line in '{self.vacancies_path}' ({e!r})")
+                    continue
+                vacancies[vac.vacancy_id] = vac
+        logger.info(f"Loaded {len(vacancies)} vacancies from '{self.vacancies_path}'")
+        return vacancies
+
+    def track_ids(self, vacancy_ids: Iterable[str]) -> Iterator[str]:
+        """Pass the ids through and save all of them when the iteration is over."""
+        harvested: list[str] = []
+        for vacancy_id in vacancy_ids:
+            harvested.append(vacancy_id)
+            yield vacancy_id
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.ids_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(harvested, f)
+        tmp_path.replace(self.ids_path)
+
+    def add(self, vacancy: Vacancy) -> None:
+        with self._lock:
+            self._buffer.append(vacancy)
+            if len(self._buffer) >= self.flush_every:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def clear(self) -> None:
+        """Remove the checkpoint after the collection has finished."""
+        with self._lock:
+            self._buffer.clear()
+            self.ids_path.unlink(missing_ok=True)
+            self.vacancies_path.unlink(missing_ok=True)
+
+    def _flush_locked(self) -> None:
+        if not self._buffer:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.vacancies_path, "a", encoding="utf-8") as f:
+            f.writelines(f"{json.dumps(asdict(vac), ensure_ascii=False)}\n" for vac in self._buffer)
+        self._buffer.clear()
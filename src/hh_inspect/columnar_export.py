@@ -0,0 +1,96 @@
+from collections.abc import Iterable
+from datetime import date
+from pathlib import Path
+from typing import Any, Final
+
+import pandas as pd
+
+from hh_inspect.vacancy import CATEGORICAL_FIELDS, Vacancy
+
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError as e:
+    msg = "Parquet/Arrow export requires pyarrow, install it with 'uv sync --extra parquet'"
+    raise ImportError(msg) from e
+
+
+# CATEGORICAL_FIELDS are stored as dictionary-encoded columns, they become pandas categoricals on load
+_CATEGORY: Final = pa.dictionary(pa.int32(), pa.string())
+SCHEMA: Final = pa.schema(
+    [
+        ("vacancy_id", pa.string()),
+        ("region", _CATEGORY),
+        ("employer_id", pa.string()),
+        ("employer_name", _CATEGORY),
+        ("employer_city", _CATEGORY),
+        ("accredited_it", pa.bool_()),
+        ("vacancy_name", pa.string()),
+        ("salary_from", pa.int64()),
+        ("salary_to", pa.int64()),
+        ("experience", _CATEGORY),
+        ("employment", _CATEGORY),
+        ("schedule", _CATEGORY),
+        ("work_format", pa.list_(pa.string())),
+        ("key_skills", pa.list_(pa.string())),
+        ("description", pa.string()),
+        ("vacancy_url", pa.string()),
+        ("published_at", pa.date32()),
+        ("excluded", pa.bool_()),
+    ]
+)
+
+
+def vacancies_to_table(vacancies: Iterable[Vacancy], show_excluded: bool = True) -> pa.Table:
+    """Build an Arrow table column by column, list fields stay lists."""
+    columns: dict[str, list[Any]] = {name: [] for name in SCHEMA.names}
+    for vac in vacancies:
+        if not show_excluded and vac.excluded:
+            continue
+        for name, values in columns.items():
+            values.append(getattr(vac, name))
+    columns["published_at"] = [_parse_date(value) for value in columns["published_at"]]
+
+    arrays = [
+        pa.array(columns[name], type=pa.string()).dictionary_encode()
+        if name in CATEGORICAL_FIELDS
+        else pa.array(columns[name], type=SCHEMA.field(name).type)
+        for name in SCHEMA.names
+    ]
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def save_vacancies_columnar(vacancies: Iterable[Vacancy], path: Path, show_excluded: bool = True) -> None:
+    """Save to Parquet if the name ends with '.parquet', otherwise to an uncompressed Arrow IPC file.
+
+    The Arrow file can be memory-mapped without copying, Parquet is smaller and reads almost as fast.
+    """
+    table = vacancies_to_table(vacancies, show_excluded)
+    if path.suffix == ".parquet":
+        pq.write_table(table, path, compression="zstd")
+        return
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_vacancies_table(path: Path, columns: list[str] | None = None) -> pa.Table:
+    """Read a file saved by save_vacancies_columnar(), memory-mapped, only the given columns if set."""
+    if path.suffix == ".parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+    # Closing the file keeps the mapping, the buffers of the table own it and unmap the file when they are freed
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns is not None else table
+
+
+def load_vacancies_dataframe(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Load vacancies for analysis, dictionary columns become categoricals, list columns hold arrays of strings."""
+    return read_vacancies_table(path, columns).to_pandas()
+
+
+def _parse_date(value: str) -> date | None:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return None
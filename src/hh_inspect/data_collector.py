@@ -1,111 +1,627 @@
+import json
 import logging
-from concurrent.futures import ThreadPoolExecutor
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field, replace
+from datetime import UTC, datetime
+from pathlib import Path
 from typing import Any, Final
 
 import requests
 from tqdm import tqdm
 
+from hh_inspect.checkpoint import Checkpoint
 from hh_inspect.console_printer import ConsolePrinter
-from hh_inspect.settings import Settings
-from hh_inspect.vacancy import FullVacancy, Vacancy, parse_vacancy_data
+from hh_inspect.employer_filter import EmployerFilter
+from hh_inspect.http_session import ConnectionStats, HttpSession, RetryStats
+from hh_inspect.metrics import RunMetrics
+from hh_inspect.query_planner import MAX_SEARCH_DEPTH, SEARCH_PERIOD, QueryPlanner
+from hh_inspect.response_cache import CacheEntry, CacheStats, ResponseCache
+from hh_inspect.settings import QueryDict, Settings
+from hh_inspect.snapshot import VacancySnapshot, fingerprint_search_item
+from hh_inspect.vacancy import FullVacancy, Vacancy, parse_search_item, parse_vacancy_data
+from hh_inspect.vacancy_parser import ParsePool, parse_vacancy_body
 
 
 REQUEST_TIMEOUT: Final = 5
 RESPONSE_OK: Final = 200
+RESPONSE_NOT_MODIFIED: Final = 304
 
-_API_URL: Final = "https://api.hh.ru/vacancies/"
+API_URL: Final = "https://api.hh.ru/vacancies/"
 
 logger = logging.getLogger(__name__)
 printer = ConsolePrinter()
 
 
+@dataclass
+class CollectionReport:
+    """Per-run summary of what the transport layer did and which vacancies were lost."""
+
+    connections: ConnectionStats
+    retries: RetryStats
+    dropped_ids: dict[str, str] = field(default_factory=dict)  # vacancy id -> reason
+    cache: CacheStats | None = None
+
+    def __str__(self) -> str:
+        cache = f"; cache {self.cache}" if self.cache is not None else ""
+        return f"{self.connections}; {self.retries}; dropped: {len(self.dropped_ids)}{cache}"
+
+
 class DataCollector:
-    def __init__(self, settings: Settings) -> None:
-        self.query_params = settings.convert_query_to_dict()
+    def __init__(self, settings: Settings, output_dir: Path | None = None) -> None:
         self.num_workers = max(settings.general.num_workers, 1)
-        self.excluded_companies = settings.filter_after.excluded_companies
+        self.employer_filter = EmployerFilter(
+            settings.filter_after.excluded_companies, settings.filter_after.excluded_employer_ids
+        )
+        self.skip_excluded = not settings.general.show_excluded  # not shown, so not worth fetching
+        self.list_only = settings.general.list_only
+        self.split_large_queries = settings.general.split_large_queries
+        self.api_url = API_URL
+        self.metrics = RunMetrics()
+        # Search pages and vacancy details are fetched by two pools at the same time
+        self.session = HttpSession(
+            2 * self.num_workers,
+            requests_per_second=settings.general.requests_per_second,
+            max_retries=settings.general.max_retries,
+            metrics=self.metrics,
+        )
+        self.dropped_ids: dict[str, str] = {}
+
+        self.cache: ResponseCache | None = None
+        if settings.general.use_cache and output_dir is not None:
+            self.cache = ResponseCache(
+                output_dir / "cache",
+                ttl=settings.general.cache_ttl_hours * 3600,
+                max_size=settings.general.cache_max_size_mb * 1024 * 1024,
+            )
+
+        self.output_dir = output_dir
+        self.checkpoint_every = settings.general.checkpoint_every
+        self.resume = settings.general.resume
+        if self.resume and self.checkpoint_every <= 0:
+            logger.warning("Nothing to resume from, checkpoints are disabled (checkpoint_every is 0)")
+        self.parse_workers = settings.general.parse_workers
+        self.parse_pool: ParsePool | None = None  # started on first use, shared by all queries of a batch run
+        self.snapshot: VacancySnapshot | None = None
+        self.checkpoint: Checkpoint | None = None
+        self.resumed_ids: list[str] | None = None
+        self.known_vacancies: dict[str, Vacancy] | None = None
+        self._init_query(settings)
+
+    @property
+    def excluded_companies(self) -> list[str]:
+        return self.employer_filter.names
+
+    @excluded_companies.setter
+    def excluded_companies(self, names: list[str]) -> None:
+        self.employer_filter = EmployerFilter(names, self.employer_filter.ids)
+
+    def set_query(self, settings: Settings) -> None:
+        """Switch to the next query of a batch run.
+
+        From now on vacancies fetched for previous queries are reused instead of being requested again.
+        Metrics are started anew for every query.
+        """
+        self.metrics = RunMetrics()
+        self.session.metrics = self.metrics
+        self._init_query(settings)
+        if self.known_vacancies is None:
+            self.known_vacancies = {}
+
+    def _init_query(self, settings: Settings) -> None:
+        self.query_params = settings.convert_query_to_dict()
+        self.found = 0
+        self.snapshot = None
+        if settings.general.incremental and self.output_dir is not None:
+            self.snapshot = VacancySnapshot(self.output_dir / "snapshots" / f"{settings.general.output_filename}.json")
+
+        self.checkpoint = None
+        self.resumed_ids = None
+        if self.checkpoint_every > 0 and self.output_dir is not None:
+            self.checkpoint = Checkpoint(
+                self.output_dir / "checkpoints" / settings.general.output_filename, self.checkpoint_every
+            )
+            if self.resume:
+                self._resume_from_checkpoint(self.checkpoint)
+            else:
+                self.checkpoint.clear()
+
+    def _resume_from_checkpoint(self, checkpoint: Checkpoint) -> None:
+        """Take the vacancies fetched by the interrupted run as already known, and its ids if they were saved."""
+        self.resumed_ids = checkpoint.load_ids()
+        restored = checkpoint.load_vacancies()
+        self.known_vacancies = (self.known_vacancies or {}) | restored
+        printer.print(f"Resuming: {len(restored)} vacancies are already fetched")
 
     def collect_vacancies(self) -> list[Vacancy]:
         num_pages = self._get_num_pages()
         if num_pages == 0:
             return []
-        vacancy_ids = self._build_vacancy_ids(num_pages)
-        return self.build_vacancy_list(vacancy_ids)
+        if self.list_only:
+            vacancies = self._collect_from_search_pages(num_pages)
+        elif self.snapshot is not None:
+            vacancies = self._collect_incremental(num_pages, self.snapshot)
+        else:
+            vacancy_ids = self._build_vacancy_ids(num_pages) if self.resumed_ids is None else self.resumed_ids
+            if self.checkpoint is not None and self.resumed_ids is None:
+                vacancy_ids = self.checkpoint.track_ids(vacancy_ids)
+            vacancies = self._fetch_vacancies(vacancy_ids)
+        if self.cache is not None:
+            self.cache.prune()
+        if self.checkpoint is not None:
+            self.checkpoint.clear()
+        self._log_report()
+        return vacancies
+
+    def stream_vacancies(self, write: Callable[[Vacancy], None]) -> int:
+        """Pass every vacancy to write() as soon as it is fetched instead of returning a list.
+
+        Incremental runs, checkpoints and resume keep vacancies in memory, so they are not used here.
+        Batch runs still keep the vacancies of previous queries, so shared ones are not fetched again.
+        Return the number of written vacancies.
+        """
+        num_pages = self._get_num_pages()
+        if num_pages == 0:
+            return 0
+        if self.list_only:
+            vacancies = map(self.make_vacancy_from_search_item, self._iter_search_items(num_pages))
+            count = sum(1 for _ in map(write, vacancies))
+        else:
+            count = self._stream_vacancies(self._build_vacancy_ids(num_pages), write)
+        if self.cache is not None:
+            self.cache.prune()
+        self._log_report()
+        return count
+
+    def close(self) -> None:
+        """Close the HTTP session and stop the parse workers."""
+        self.session.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+            self.parse_pool = None
+
+    def get_report(self) -> CollectionReport:
+        return CollectionReport(
+            connections=self.session.get_stats(),
+            retries=self.session.retry_stats,
+            dropped_ids=self.dropped_ids,
+            cache=self.cache.stats if self.cache is not None else None,
+        )
+
+    def _log_report(self) -> None:
+        report = self.get_report()
+        logger.info(f"Collection report: {report}")
+        if report.dropped_ids:
+            logger.warning(f"Dropped vacancies: {report.dropped_ids}")
+        if report.retries.retries or report.dropped_ids:
+            printer.print(f"Retries: {report.retries.retries}, dropped vacancies: {len(report.dropped_ids)}")
 
     def _get_num_pages(self) -> int:
-        url: Final = f"{_API_URL}"
-        response = requests.get(url, params=self.query_params, timeout=REQUEST_TIMEOUT)
+        url: Final = f"{self.api_url}"
+        response = self.session.get(url, params=self.query_params, timeout=REQUEST_TIMEOUT, endpoint="search")
         logger.info(f"Requested '{response.url}'")
         # printer.print(f"Requested '{response.url}'")  # noqa: ERA001
 
         if response.status_code != RESPONSE_OK:
             logger.error(f"Response code: {response.status_code}")
-            logger.error(response.json())
+            logger.error(response.text)
             logger.error(f"Headers: {response.headers}")
             printer.print(f"Response code: {response.status_code}")
-            printer.print(response.json())
+            printer.print(response.text)
             return 0
 
-        found: Final[int] = response.json().get("found", 0)
-        num_pages: Final[int] = response.json().get("pages", 0)
+        data: Final[dict[str, Any]] = response.json()
+        found: Final[int] = data.get("found", 0)
+        num_pages: Final[int] = data.get("pages", 0)
         logger.info(f"found: {found}, num_pages: {num_pages}")
         printer.print(f"Found: {found}")
+        self.found = found
+        if found > MAX_SEARCH_DEPTH and not self.split_large_queries:
+            printer.print(
+                f"Only the first {MAX_SEARCH_DEPTH} vacancies are available, set split_large_queries to get all"
+            )
         return num_pages
 
-    def _build_vacancy_ids(self, num_pages: int) -> list[str]:
-        url = f"{_API_URL}"
-        ids: list[str] = []
-        for idx in range(num_pages):
-            params = self.query_params.copy()
-            params["page"] = idx
-            try:
-                response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
-                response.raise_for_status()
-                logger.info(f"Requested '{response.url}'")
-                data = response.json()
-                ids.extend(x["id"] for x in data["items"])
-            except requests.exceptions.HTTPError:
-                logger.exception(f"Error fetching page {idx}")
-        return ids
-
-    def build_vacancy_list(self, vacancy_ids: list[str]) -> list[Vacancy]:
-        vacancy_list: list[Vacancy] = []
-        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-            vacancy_list.extend(
-                [
-                    vacancy
-                    for vacancy in tqdm(
-                        executor.map(self.get_vacancy_or_none, vacancy_ids),
-                        desc="Getting data from api.hh.ru",
-                        ncols=100,
-                        total=len(vacancy_ids),
-                    )
-                    if vacancy is not None
-                ]
+    def _collect_from_search_pages(self, num_pages: int) -> list[Vacancy]:
+        """Build vacancies from search pages only, without requesting details of every vacancy."""
+        vacancies = [self.make_vacancy_from_search_item(item) for item in self._iter_search_items(num_pages)]
+        logger.info(f"List-only run: {len(vacancies)} vacancies built from {num_pages} search pages")
+        return vacancies
+
+    def _collect_incremental(self, num_pages: int, snapshot: VacancySnapshot) -> list[Vacancy]:
+        """Fetch details only for vacancies which are new or whose search-page metadata has changed.
+
+        Unchanged vacancies are taken from the snapshot of the previous run.
+        """
+        previous = snapshot.load()
+        order: list[str] = []
+        fingerprints: dict[str, str] = {}
+        reused: dict[str, Vacancy] = {}
+
+        def ids_to_fetch() -> Iterator[str]:
+            for item in self._iter_search_items(num_pages):
+                vacancy_id: str = item["id"]
+                order.append(vacancy_id)
+                fingerprints[vacancy_id] = fingerprint_search_item(item)
+                old = previous.get(vacancy_id)
+                if old is not None and old.fingerprint == fingerprints[vacancy_id]:
+                    excluded = self.is_excluded_employer(old.vacancy.employer_name, old.vacancy.employer_id)
+                    reused[vacancy_id] = replace(old.vacancy, excluded=excluded)
+                else:
+                    yield vacancy_id
+
+        fetched = {vac.vacancy_id: vac for vac in self._fetch_vacancies(ids_to_fetch())}
+        vacancies = [vac for vacancy_id in order if (vac := reused.get(vacancy_id) or fetched.get(vacancy_id))]
+        logger.info(f"Incremental run: {len(reused)} vacancies reused, {len(fetched)} fetched")
+        printer.print(f"Unchanged since the last run: {len(reused)}, fetched: {len(fetched)}")
+
+        snapshot.save(vacancies, fingerprints)
+        return vacancies
+
+    def _build_vacancy_ids(self, num_pages: int) -> Iterator[str]:
+        return (item["id"] for item in self._iter_search_items(num_pages))
+
+    def _iter_search_items(self, num_pages: int) -> Iterator[dict[str, Any]]:
+        """Fetch all search pages concurrently and yield items of unique vacancies.
+
+        Items of a page are yielded as soon as the page (and all pages before it) arrive,
+        so build_vacancy_list() can start fetching details while other pages are loading.
+        Vacancies of excluded employers are skipped unless they are to be shown.
+        No more than 2 * num_workers pages are fetched ahead of the consumer.
+        """
+        seen: set[str] = set()
+        skipped = 0
+        page_params = self._plan_search_pages(num_pages)
+        with ThreadPoolExecutor(max_workers=max(min(self.num_workers, len(page_params)), 1)) as executor:
+            for page_items in _map_ahead(executor, self._get_page_items, page_params, 2 * self.num_workers):
+                for item in page_items:
+                    if item["id"] in seen:
+                        continue
+                    seen.add(item["id"])
+                    if self.skip_excluded and self.employer_filter and self.employer_filter.is_excluded_item(item):
+                        skipped += 1
+                        continue
+                    yield item
+        if skipped:
+            logger.info(f"{skipped} vacancies of excluded employers are skipped")
+            printer.print(f"Vacancies of excluded employers: {skipped}")
+        self.metrics.set_value("excluded_before_fetch", skipped)
+
+    def _plan_search_pages(self, num_pages: int) -> list[QueryDict]:
+        """Return query parameters of every search page to fetch.
+
+        If the query finds more vacancies than the API can return, it is split into
+        sub-queries by publication date and pages of all sub-queries are returned.
+        """
+        per_page = self.query_params.get("per_page")
+        per_page = per_page if isinstance(per_page, int) else 20
+        if not self.split_large_queries or self.found <= num_pages * per_page:
+            return [self.query_params | {"page": page} for page in range(num_pages)]
+
+        date_to = datetime.now(UTC).replace(microsecond=0)
+        planner = QueryPlanner(self._count_found, max_workers=self.num_workers)
+        sub_queries = planner.plan(self.query_params, date_to - SEARCH_PERIOD, date_to)
+        printer.print(f"Query is split into {len(sub_queries)} parts to get all vacancies")
+        return [
+            sub_query.params | {"page": page}
+            for sub_query in sub_queries
+            for page in range(sub_query.num_pages(per_page))
+        ]
+
+    def _count_found(self, params: QueryDict) -> int:
+        try:
+            response = self.session.get(
+                self.api_url, params=params | {"per_page": 1}, timeout=REQUEST_TIMEOUT, endpoint="search"
             )
-        return vacancy_list
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            logger.exception(f"Error counting vacancies for {params}")
+            return 0
+        return response.json().get("found", 0)
+
+    def _get_page_items(self, params: QueryDict) -> list[dict[str, Any]]:
+        url = f"{self.api_url}"
+        try:
+            response = self.session.get(url, params=params, timeout=REQUEST_TIMEOUT, endpoint="search")
+            response.raise_for_status()
+            logger.info(f"Requested '{response.url}'")
+            data = response.json()
+        except requests.exceptions.RequestException:
+            logger.exception(f"Error fetching page {params.get('page')}")
+            return []
+        return data["items"]
+
+    def _fetch_vacancies(self, vacancy_ids: Iterable[str]) -> list[Vacancy]:
+        """Call build_vacancy_list(), in batch runs only for ids not fetched by previous queries."""
+        known = self.known_vacancies
+        if known is None:
+            return self._build_vacancy_list_with_checkpoint(vacancy_ids)
 
-    def get_vacancy_or_none(self, vacancy_id: str) -> Vacancy | None:
-        def get_employer_name(vac: FullVacancy) -> str:
-            if vac.employer is not None and vac.employer.name is not None:
-                return vac.employer.name
-            return ""
+        order: list[str] = []
 
-        def is_excluded(vac: FullVacancy) -> bool:
-            employer_name = get_employer_name(vac).lower()
-            return any(name.lower() in employer_name for name in self.excluded_companies)
+        def new_ids() -> Iterator[str]:
+            for vacancy_id in vacancy_ids:
+                order.append(vacancy_id)
+                if vacancy_id not in known:
+                    yield vacancy_id
 
-        url = f"{_API_URL}{vacancy_id}"
+        fetched = self._build_vacancy_list_with_checkpoint(new_ids())
+        known.update((vac.vacancy_id, vac) for vac in fetched)
+        if len(order) > len(fetched):
+            logger.info(f"{len(order) - len(fetched)} vacancies were fetched by previous queries or dropped")
+        return [vac for vacancy_id in order if (vac := known.get(vacancy_id)) is not None]
+
+    def _stream_vacancies(self, vacancy_ids: Iterable[str], write: Callable[[Vacancy], None]) -> int:
+        """Call stream_vacancy_list(), in batch runs vacancies fetched by previous queries are written without it."""
+        known = self.known_vacancies
+        if known is None:
+            return self.stream_vacancy_list(vacancy_ids, write)
+
+        reused = 0
+
+        def new_ids() -> Iterator[str]:
+            nonlocal reused
+            for vacancy_id in vacancy_ids:
+                vacancy = known.get(vacancy_id)
+                if vacancy is None:
+                    yield vacancy_id
+                else:
+                    write(vacancy)
+                    reused += 1
+
+        def write_new(vacancy: Vacancy) -> None:
+            known[vacancy.vacancy_id] = vacancy
+            write(vacancy)
+
+        count = self.stream_vacancy_list(new_ids(), write_new)
+        if reused:
+            logger.info(f"{reused} vacancies were fetched by previous queries")
+        return count + reused
+
+    def _build_vacancy_list_with_checkpoint(self, vacancy_ids: Iterable[str]) -> list[Vacancy]:
         try:
-            response = requests.get(url, timeout=REQUEST_TIMEOUT)
-        except requests.exceptions.ConnectTimeout:
-            logger.exception("Timeout")
+            return self.build_vacancy_list(vacancy_ids)
+        finally:
+            if self.checkpoint is not None:
+                self.checkpoint.flush()  # keep the progress even if the run is interrupted
+
+    def record_fetched(self, future: Future[Vacancy | bytes | None]) -> None:
+        """Add the vacancy to the checkpoint as soon as its fetch is done (used as a done callback)."""
+        if self.checkpoint is not None and not future.cancelled() and future.exception() is None:
+            vacancy = future.result()
+            if isinstance(vacancy, Vacancy):
+                self.checkpoint.add(vacancy)
+
+    def build_vacancy_list(self, vacancy_ids: Iterable[str]) -> list[Vacancy]:
+        """Fetch details of all vacancies, a new fetch is submitted as soon as its id is produced."""
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            return self._collect_results(self._iter_fetched(executor, vacancy_ids))
+
+    def _iter_fetched(
+        self, executor: ThreadPoolExecutor, vacancy_ids: Iterable[str]
+    ) -> Iterator[tuple[str, Vacancy | bytes | None]]:
+        """Yield fetch results in the order of the ids, finished ones already while the ids are being produced."""
+        pending: deque[tuple[str, Future[Vacancy | bytes | None]]] = deque()
+        with tqdm(
+            total=0, desc="Getting data from api.hh.ru", ncols=100, disable=not printer.print_to_console
+        ) as progress:
+            for vacancy_id in vacancy_ids:
+                future = executor.submit(self.get_vacancy_or_none, vacancy_id)
+                future.add_done_callback(self.record_fetched)
+                pending.append((vacancy_id, future))
+                progress.total += 1
+                while pending and pending[0][1].done():
+                    done_id, done = pending.popleft()
+                    progress.update()
+                    yield done_id, done.result()
+            while pending:
+                done_id, done = pending.popleft()
+                result = done.result()
+                progress.update()
+                yield done_id, result
+
+    def stream_vacancy_list(self, vacancy_ids: Iterable[str], write: Callable[[Vacancy], None]) -> int:
+        """Fetch details of all vacancies and write them in the order of completion.
+
+        No more than 2 * num_workers fetches are in flight, so memory does not grow with the number of vacancies.
+        """
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            return self._write_results(self._iter_completed(executor, vacancy_ids), write)
+
+    def _iter_completed(
+        self, executor: ThreadPoolExecutor, vacancy_ids: Iterable[str]
+    ) -> Iterator[tuple[str, Vacancy | bytes | None]]:
+        """Yield fetch results in the order of completion, submitting the next ids as the results are taken."""
+        pending: dict[Future[Vacancy | bytes | None], str] = {}
+        ids = tqdm(vacancy_ids, desc="Getting data from api.hh.ru", ncols=100, disable=not printer.print_to_console)
+        for vacancy_id in ids:
+            pending[executor.submit(self.get_vacancy_or_none, vacancy_id)] = vacancy_id
+            if len(pending) >= 2 * self.num_workers:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
+        for future in as_completed(pending):
+            yield pending[future], future.result()
+
+    def _write_results(
+        self, results: Iterable[tuple[str, Vacancy | bytes | None]], write: Callable[[Vacancy], None]
+    ) -> int:
+        """Write fetched vacancies and return their number, raw bodies (with parse_workers) go to the parse pool."""
+        if self.parse_workers > 0:
+            vacancies = self._parse_in_pool(results, None)  # streamed runs keep no checkpoint
         else:
-            vacancy_json: dict[str, Any] = response.json()
-            # print(response.status_code, json.dumps(vacancy_json, ensure_ascii=False, indent=2))  # noqa: ERA001
-
-            if response.status_code == RESPONSE_OK:
-                full_vac = parse_vacancy_data(vacancy_json)
-                excluded = is_excluded(full_vac)
-                return full_vac.to_basic_vacancy(excluded)
-        return None
+            vacancies = (result for _, result in results if isinstance(result, Vacancy))
+        return sum(1 for _ in map(write, vacancies))
+
+    def _decode_or_drop(self, vacancy_id: str, content: bytes) -> Vacancy | None:
+        try:
+            return self.decode_vacancy(content)
+        except ValueError as e:
+            logger.exception(f"Invalid response for vacancy {vacancy_id}")
+            self.dropped_ids[vacancy_id] = type(e).__name__
+            return None
+
+    def _collect_results(self, results: Iterable[tuple[str, Vacancy | bytes | None]]) -> list[Vacancy]:
+        """Return fetched vacancies in order, raw bodies (with parse_workers) are parsed in worker processes."""
+        if self.parse_workers <= 0:
+            return [result for _, result in results if isinstance(result, Vacancy)]
+        return list(self._parse_in_pool(results, self.checkpoint))
+
+    def _parse_in_pool(
+        self, results: Iterable[tuple[str, Vacancy | bytes | None]], checkpoint: Checkpoint | None
+    ) -> Iterator[Vacancy]:
+        """Yield fetched vacancies in the order of the results, raw bodies are parsed by the parse pool.
+
+        Parsed vacancies go to the checkpoint batch by batch, while the following ones are still being fetched.
+        """
+        if self.parse_pool is None:
+            self.parse_pool = ParsePool(self.parse_workers)
+        pool = self.parse_pool
+        pending: deque[tuple[str, Vacancy | bytes | None]] = deque()  # fetched, but not yielded yet
+
+        def raw_contents() -> Iterator[bytes]:
+            for vacancy_id, result in results:
+                pending.append((vacancy_id, result))
+                if isinstance(result, bytes):
+                    yield result
+
+        try:
+            for parsed in pool.parse(raw_contents()):
+                yield from _pop_fetched(pending)
+                vacancy_id, _ = pending.popleft()
+                vacancy = self._accept_parsed(vacancy_id, parsed)
+                if vacancy is not None:
+                    if checkpoint is not None:
+                        checkpoint.add(vacancy)
+                    yield vacancy
+        except BaseException:
+            if checkpoint is not None:
+                self._save_pending(pending, checkpoint)
+            raise
+        self.metrics.observe_parse(pool.parse_seconds, pool.parsed)
+        yield from _pop_fetched(pending)
+
+    def _save_pending(self, pending: Iterable[tuple[str, Vacancy | bytes | None]], checkpoint: Checkpoint) -> None:
+        """Keep the progress of an interrupted run, bodies still waiting for the workers are parsed right here."""
+        for vacancy_id, result in pending:
+            if isinstance(result, bytes) and (vacancy := self._decode_or_drop(vacancy_id, result)) is not None:
+                checkpoint.add(vacancy)
+
+    def _accept_parsed(self, vacancy_id: str, parsed: Vacancy | str) -> Vacancy | None:
+        """Mark a vacancy parsed by the pool as excluded or not, drop it if it could not be parsed."""
+        if isinstance(parsed, str):
+            logger.error(f"Invalid response for vacancy {vacancy_id}: {parsed}")
+            self.dropped_ids[vacancy_id] = parsed
+            return None
+        parsed.excluded = self.is_excluded_employer(parsed.employer_name, parsed.employer_id)
+        return parsed
+
+    def get_vacancy_or_none(self, vacancy_id: str) -> Vacancy | bytes | None:
+        cached: CacheEntry | None = None
+        if self.cache is not None:
+            cached = self.cache.get(vacancy_id)
+            if cached is not None and self.cache.is_fresh(cached):
+                return self.make_vacancy(self.cache.use(cached))
+
+        url = f"{self.api_url}{vacancy_id}"
+        headers = cached.conditional_headers() if cached is not None else None
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT, headers=headers, endpoint="vacancy")
+        except requests.exceptions.RequestException as e:
+            logger.exception(f"Error fetching vacancy {vacancy_id}")
+            self.dropped_ids[vacancy_id] = type(e).__name__
+            return None
+
+        content = response.content if response.status_code == RESPONSE_OK else None
+        return self.handle_response(vacancy_id, response.status_code, response.headers, content, cached)
+
+    def handle_response(
+        self,
+        vacancy_id: str,
+        status: int,
+        headers: Mapping[str, str],
+        content: bytes | None,
+        cached: CacheEntry | None,
+    ) -> Vacancy | bytes | None:
+        """Turn the final response for a vacancy into Vacancy, updating the cache on the way.
+
+        With parse_workers the body is returned as is, see _collect_results().
+        """
+        if status == RESPONSE_NOT_MODIFIED and cached is not None and self.cache is not None:
+            self.cache.refresh(vacancy_id, cached)
+            return self.make_vacancy(cached.body)
+
+        if status != RESPONSE_OK or content is None:
+            self.dropped_ids[vacancy_id] = f"HTTP {status}"
+            return None
+
+        if self.cache is None and self.parse_workers > 0:
+            return content  # parsed later in the process pool
+        try:
+            if self.cache is None:
+                return self.decode_vacancy(content)
+            vacancy_json = json.loads(content)
+        except ValueError as e:
+            logger.exception(f"Invalid response for vacancy {vacancy_id}")
+            self.dropped_ids[vacancy_id] = type(e).__name__
+            return None
+        self.cache.put(vacancy_id, vacancy_json, headers.get("ETag"), headers.get("Last-Modified"))
+        return self.make_vacancy(vacancy_json)
+
+    def decode_vacancy(self, content: bytes) -> Vacancy:
+        """Parse the raw response body, straight into Vacancy if msgspec is installed."""
+        start = time.perf_counter()
+        vacancy = parse_vacancy_body(content)
+        self.metrics.observe_parse(time.perf_counter() - start)
+        vacancy.excluded = self.is_excluded_employer(vacancy.employer_name, vacancy.employer_id)
+        return vacancy
+
+    def make_vacancy(self, vacancy_json: dict[str, Any]) -> Vacancy:
+        start = time.perf_counter()
+        full_vac = parse_vacancy_data(vacancy_json)
+        self.metrics.observe_parse(time.perf_counter() - start)
+        return full_vac.to_basic_vacancy(self.is_excluded(full_vac))
+
+    def make_vacancy_from_search_item(self, item: dict[str, Any]) -> Vacancy:
+        full_vac = parse_search_item(item)
+        return full_vac.to_basic_vacancy(self.is_excluded(full_vac))
+
+    def is_excluded(self, vac: FullVacancy) -> bool:
+        if vac.employer is not None:
+            return self.is_excluded_employer(vac.employer.name or "", vac.employer.id or "")
+        return self.is_excluded_employer("")
+
+    def is_excluded_employer(self, employer_name: str, employer_id: str = "") -> bool:
+        return self.employer_filter.is_excluded(employer_name, employer_id)
+
+
+def create_collector(settings: Settings, output_dir: Path | None = None) -> DataCollector:
+    """Return the collector of the configured backend."""
+    if settings.general.backend == "asyncio":
+        from hh_inspect.async_collector import AsyncDataCollector  # noqa: PLC0415 (aiohttp is optional)
+
+        return AsyncDataCollector(settings, output_dir)
+    return DataCollector(settings, output_dir)
+
+
+def _map_ahead[T, R](
+    executor: ThreadPoolExecutor, fn: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[R]:
+    """Like executor.map(), but only `window` calls are submitted ahead of the results taken."""
+    futures: deque[Future[R]] = deque()
+    for item in items:
+        futures.append(executor.submit(fn, item))
+        if len(futures) >= window:
+            yield futures.popleft().result()
+    while futures:
+        yield futures.popleft().result()
+
+
+def _pop_fetched(pending: deque[tuple[str, Vacancy | bytes | None]]) -> Iterator[Vacancy]:
+    """Pop the results before the next raw body, yield the vacancies among them."""
+    while pending and not isinstance(pending[0][1], bytes):
+        _, result = pending.popleft()
+        if result is not None:
+            yield result
@@ -0,0 +1,76 @@
+from collections import deque
+from collections.abc import Iterable
+from typing import Any
+
+
+class EmployerFilter:
+    """Decide whether a vacancy is excluded by its employer: by a part of the name or by the employer id.
+
+    Name parts are matched case-insensitively with an Aho-Corasick automaton, so checking a name
+    takes one pass over it however many names are blacklisted. Results are memoized per name,
+    since the same employers come up again and again.
+    """
+
+    def __init__(self, names: Iterable[str], ids: Iterable[str] = ()) -> None:
+        self.names = [name for name in names if name]
+        self.ids = frozenset(str(employer_id) for employer_id in ids)
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._matches: list[bool] = [False]
+        self._cache: dict[str, bool] = {}
+        for name in self.names:
+            self._add_pattern(name.lower())
+        self._link_states()
+
+    def __bool__(self) -> bool:
+        return bool(self.names or self.ids)
+
+    def is_excluded(self, employer_name: str, employer_id: str = "") -> bool:
+        if employer_id and employer_id in self.ids:
+            return True
+        excluded = self._cache.get(employer_name)
+        if excluded is None:
+            excluded = self._cache[employer_name] = self._search(employer_name.lower())
+        return excluded
+
+    def is_excluded_item(self, item: dict[str, Any]) -> bool:
+        """Check a vacancy of a search page (or a vacancy response) by its employer."""
+        employer = item.get("employer") or {}
+        return self.is_excluded(employer.get("name") or "", str(employer.get("id") or ""))
+
+    def _add_pattern(self, pattern: str) -> None:
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._matches.append(False)
+                self._goto[state][char] = next_state
+            state = next_state
+        self._matches[state] = True
+
+    def _link_states(self) -> None:
+        """Set failure links breadth-first, a state matches if any of its suffixes is a pattern."""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._matches[next_state] = self._matches[next_state] or self._matches[self._fail[next_state]]
+
+    def _search(self, text: str) -> bool:
+        goto, fail, matches = self._goto, self._fail, self._matches
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if matches[state]:
+                return True
+        return False
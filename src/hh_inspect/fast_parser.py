@@ -0,0 +1,113 @@
+from typing import Final
+
+from hh_inspect.vacancy import EXPERIENCE_LABELS, Vacancy, calc_net_salary
+
+
+try:
+    import msgspec
+except ImportError as e:
+    msg = "The fast parser requires msgspec, install it with 'uv sync --extra fast'"
+    raise ImportError(msg) from e
+
+
+# Typed views of the vacancy JSON, only the fields used by Vacancy are decoded,
+# the rest of the document is skipped without building Python objects.
+# Defaults mirror the dict.get() defaults of parse_vacancy_data().
+
+
+class _Named(msgspec.Struct, gc=False):
+    name: str | None = ""
+
+
+class _Identified(msgspec.Struct, gc=False):
+    id: str
+
+
+class _Skill(msgspec.Struct, gc=False):
+    name: str
+
+
+class _Area(msgspec.Struct, gc=False):
+    id: str
+    name: str
+    url: str
+
+
+class _Address(msgspec.Struct, gc=False):
+    city: str | None = ""
+
+
+class _Employer(msgspec.Struct, gc=False):
+    id: str | None = ""
+    name: str | None = ""
+    accredited_it_employer: bool | None = False
+
+
+class _SalaryRange(msgspec.Struct, gc=False):
+    currency: str | None = ""
+    from_: int | float | None = msgspec.field(default=None, name="from")
+    to: int | float | None = None
+    gross: bool | None = False
+
+
+class _VacancyStruct(msgspec.Struct, gc=False):
+    area: _Area
+    id: str = ""
+    name: str | None = ""
+    address: _Address | None = None
+    description: str | None = ""
+    employer: _Employer | None = None
+    employment: _Named | None = None
+    experience: _Named | None = None
+    key_skills: list[_Skill] = []
+    salary_range: _SalaryRange | None = None
+    schedule: _Named | None = None
+    work_format: list[_Identified] = []
+    published_at: str = ""
+    alternate_url: str = ""
+
+
+_decoder: Final = msgspec.json.Decoder(_VacancyStruct)
+
+
+def decode_vacancy(content: bytes) -> Vacancy:
+    """Parse the raw body of a vacancy response into Vacancy (not excluded).
+
+    Gives the same result as parse_vacancy_data(json.loads(content)).to_basic_vacancy(),
+    raises ValueError (msgspec.DecodeError) if the body is not a valid vacancy.
+    """
+    vac = _decoder.decode(content)
+
+    if vac.salary_range is not None:
+        salary = vac.salary_range
+        salary_from, salary_to = calc_net_salary(salary.currency, salary.from_, salary.to, salary.gross)
+    else:
+        salary_from, salary_to = 0, 0
+
+    employer = vac.employer
+    return Vacancy(
+        vacancy_id=vac.id,
+        vacancy_name=vac.name or "",
+        employer_name=(employer.name or "") if employer is not None else "",
+        employer_city=(vac.address.city or "") if vac.address is not None else "",
+        accredited_it=bool(employer.accredited_it_employer) if employer is not None else False,
+        region=vac.area.name,
+        salary_from=salary_from,
+        salary_to=salary_to,
+        experience=EXPERIENCE_LABELS.get(_get_name(vac.experience), ""),
+        employment=_get_name(vac.employment),
+        schedule=_get_name(vac.schedule),
+        work_format=[wf.id for wf in vac.work_format],
+        key_skills=[skill.name for skill in vac.key_skills],
+        description=vac.description or "",
+        vacancy_url=vac.alternate_url,
+        published_at=vac.published_at[:10],
+        excluded=False,
+        employer_id=(employer.id or "") if employer is not None else "",
+    )
+
+
+def _get_name(named: _Named | None) -> str:
+    if named is None or named.name is None:
+        return ""
+    return named.name
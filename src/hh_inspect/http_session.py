@@ -0,0 +1,186 @@
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from typing import Final
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from hh_inspect.metrics import RunMetrics
+from hh_inspect.rate_limiter import TokenBucket
+from hh_inspect.settings import QueryDict
+
+
+TOO_MANY_REQUESTS: Final = 429
+RETRY_STATUSES: Final = frozenset({TOO_MANY_REQUESTS, 500, 502, 503, 504})
+
+_USER_AGENT: Final = "hh-inspect/0.1.0"
+_NUM_HOST_POOLS: Final = 4  # we talk to api.hh.ru only, a few spare pools are enough
+
+_CONNECTION_ERRORS: Final = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+_BACKOFF_BASE: Final = 0.5  # seconds
+_BACKOFF_MAX: Final = 30.0
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ConnectionStats:
+    """How many requests were sent and how many TCP(+TLS) connections had to be opened for them."""
+
+    requests: int = 0
+    opened: int = 0
+
+    @property
+    def reused(self) -> int:
+        return max(self.requests - self.opened, 0)
+
+    def __str__(self) -> str:
+        return f"requests: {self.requests}, connections opened: {self.opened}, reused: {self.reused}"
+
+
+@dataclass
+class RetryStats:
+    retries: int = 0
+    throttled: int = 0  # responses with 429 Too Many Requests
+    server_errors: int = 0  # responses with 5xx
+    connection_errors: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"retries: {self.retries}, throttled: {self.throttled}, "
+            f"server errors: {self.server_errors}, connection errors: {self.connection_errors}"
+        )
+
+
+class HttpSession:
+    """Keep-alive HTTP session with a connection pool shared by all worker threads.
+
+    The pool holds up to `pool_size` connections per host, so every worker keeps
+    its own connection open instead of doing a new handshake for each request.
+
+    All requests pass through a shared token bucket (`requests_per_second`, 0 = no limit).
+    Throttled (429) and 5xx responses as well as connection errors are retried up to
+    `max_retries` times with jittered exponential backoff, Retry-After is honoured.
+    Every attempt is recorded in `metrics`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        requests_per_second: float = 0,
+        max_retries: int = 3,
+        metrics: RunMetrics | None = None,
+    ) -> None:
+        self.pool_size = max(pool_size, 1)
+        self.max_retries = max(max_retries, 0)
+        self.rate_limiter = TokenBucket(requests_per_second)
+        self.retry_stats = RetryStats()
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        self._stats_lock = threading.Lock()
+        self._adapter = HTTPAdapter(pool_connections=_NUM_HOST_POOLS, pool_maxsize=self.pool_size)
+
+        self.session = requests.Session()
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update(
+            {
+                "User-Agent": _USER_AGENT,
+                "Accept-Encoding": "gzip, deflate",
+                "Connection": "keep-alive",
+            }
+        )
+
+    def get(
+        self,
+        url: str,
+        params: QueryDict | None = None,
+        timeout: float | None = None,
+        headers: dict[str, str] | None = None,
+        endpoint: str = "other",
+    ) -> requests.Response:
+        """Send GET request, retrying it if needed, `endpoint` labels the request in metrics.
+
+        Return the last response even if it is still an error, raise the last
+        requests.exceptions.ConnectionError/Timeout if the server could not be reached at all.
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=timeout, headers=headers)
+            except _CONNECTION_ERRORS:
+                self.metrics.observe_request(endpoint, 0, time.perf_counter() - start, 0)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.get_retry_delay(attempt, None, None)
+            else:
+                self.metrics.observe_request(
+                    endpoint, response.status_code, time.perf_counter() - start, len(response.content)
+                )
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                delay = self.get_retry_delay(attempt, response.status_code, response.headers.get("Retry-After"))
+
+            logger.warning(f"Retrying '{url}' in {delay:.1f} s (attempt {attempt + 1})")
+            time.sleep(delay)
+            attempt += 1
+
+    def get_retry_delay(self, attempt: int, status: int | None, retry_after: str | None) -> float:
+        """Count the retry and return how long to wait before it (status None means connection error)."""
+        delay = _parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0.5, 1.0) * min(_BACKOFF_MAX, _BACKOFF_BASE * 2**attempt)  # noqa: S311
+
+        with self._stats_lock:
+            self.retry_stats.retries += 1
+            if status is None:
+                self.retry_stats.connection_errors += 1
+                reason = "connection_error"
+            elif status == TOO_MANY_REQUESTS:
+                self.retry_stats.throttled += 1
+                reason = "throttled"
+            else:
+                self.retry_stats.server_errors += 1
+                reason = "server_error"
+        self.metrics.observe_retry(reason)
+
+        if status == TOO_MANY_REQUESTS:
+            self.rate_limiter.pause(delay)  # the whole client is throttled, not only this worker
+        return delay
+
+    def get_stats(self) -> ConnectionStats:
+        stats = ConnectionStats()
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():  # noqa: SIM118 (RecentlyUsedContainer is not iterable)
+            pool = pools.get(key)
+            if pool is not None:
+                stats.requests += pool.num_requests
+                stats.opened += pool.num_connections
+        return stats
+
+    def close(self) -> None:
+        logger.info(f"Closing HTTP session ({self.get_stats()})")
+        self.session.close()
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Retry-After is either a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return min(max(float(value), 0.0), _BACKOFF_MAX)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except ValueError:
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=UTC)
+    return min(max((retry_at - datetime.now(UTC)).total_seconds(), 0.0), _BACKOFF_MAX)
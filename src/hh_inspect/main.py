@@ -1,13 +1,21 @@
 import logging
+from collections.abc import Callable
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Final
 
 from hh_inspect.analyzer import Analyzer
 from hh_inspect.console_printer import ConsolePrinter
-from hh_inspect.data_collector import DataCollector
-from hh_inspect.settings import Settings, load_settings
+from hh_inspect.data_collector import DataCollector, create_collector
+from hh_inspect.metrics import RunMetrics
+from hh_inspect.salary_stats import SalaryAccumulator
+from hh_inspect.settings import QueryDict, Settings, load_settings
+from hh_inspect.text_stats import DEFAULT_STOPWORDS
+from hh_inspect.top_k import TopSketches
 from hh_inspect.vacancy import Vacancy
 from hh_inspect.vacancy_output import convert_vacancies_to_json, save_vacancies_to_html, save_vacancies_to_json
+from hh_inspect.vacancy_sink import JsonLinesSink, make_jsonl_filename
+from hh_inspect.vacancy_store import VacancyStore
 
 
 _ROOT_DIR: Final = Path.resolve(Path(__file__).parent.parent.parent)
@@ -35,19 +43,106 @@ class HHInspector:
     collector: DataCollector
     settings: Settings
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(self, settings: Settings, collector: DataCollector | None = None) -> None:
+        """Use the given collector (shared by all queries of a batch run) or create a new one."""
         self.settings = settings
-        self.collector = DataCollector(settings)
+        if collector is None:
+            self.collector = create_collector(settings, _OUTPUT_DIR)
+        else:
+            self.collector = collector
+            self.collector.set_query(settings)
+
+    @property
+    def metrics(self) -> RunMetrics:
+        return self.collector.metrics
 
     def collect_vacancies(self) -> list[Vacancy]:
         logger.info("Creating the list of vacancies...")
-        vacancies = self.collector.collect_vacancies()
+        with self.metrics.stage("collect"):
+            vacancies = self.collector.collect_vacancies()
+        self.metrics.set_value("vacancies", len(vacancies))
 
         if len(vacancies) == 0:
             return []
         return vacancies
 
+    def stream_vacancies(self) -> int:
+        """Write vacancies to a JSON Lines file as they arrive, return their number.
+
+        Salary statistics and top sketches are updated on the way, so they are available without the vacancies.
+        """
+        general = self.settings.general
+        path = make_jsonl_filename(_OUTPUT_DIR, general.output_filename, general.stream_gzip)
+        salaries = SalaryAccumulator(general.show_excluded)
+        top = TopSketches(show_excluded=general.show_excluded, stopwords=self._stopwords)
+        logger.info("Streaming vacancies...")
+        with self.metrics.stage("collect"), ExitStack() as stack:
+            sink = stack.enter_context(JsonLinesSink(path))
+            observers: list[Callable[[Vacancy], None]] = [sink.write, salaries.add]
+            if general.save_to_store:
+                store = stack.enter_context(self._open_store())
+                observers.append(stack.enter_context(store.start_run(general.output_filename, self.query)).write)
+            if general.save_top_sketches:
+                observers.append(top.add)
+
+            def write(vacancy: Vacancy) -> None:
+                for observe in observers:
+                    observe(vacancy)
+
+            count = self.collector.stream_vacancies(write)
+        self.metrics.set_value("vacancies", count)
+        printer.print(f"{count} vacancies are saved to '{path}'")
+        self._report_salaries(salaries)
+        if general.save_top_sketches:
+            top.save(self._make_output_filename(".top.json"))
+        return count
+
+    def process_vacancies(self, vacancies: list[Vacancy]) -> None:
+        """Print, save and analyze the collected vacancies as configured."""
+        if len(vacancies) == 0:
+            return
+        general = self.settings.general
+        self.print_vacancies(vacancies)
+        self.save_vacancies_to_json_html(vacancies)
+        if general.save_results_to_parquet or general.save_results_to_arrow:
+            self.save_vacancies_to_columnar(vacancies)
+        if general.save_to_store:
+            self.save_vacancies_to_store(vacancies)
+        if general.save_salary_stats:
+            self.save_salary_stats(vacancies)
+        if general.save_top_sketches:
+            self.save_top_sketches(vacancies)
+        self.analyze_vacancies(vacancies)
+
+    def save_salary_stats(self, vacancies: list[Vacancy]) -> None:
+        salaries = SalaryAccumulator(self.settings.general.show_excluded)
+        for vacancy in vacancies:
+            salaries.add(vacancy)
+        self._report_salaries(salaries, print_stats=False)  # Analyzer prints them from working_df
+
+    def _report_salaries(self, salaries: SalaryAccumulator, print_stats: bool = True) -> None:
+        if print_stats and self.settings.general.print_salary_stats:
+            salaries.print_stats()
+        if self.settings.general.save_salary_stats:
+            salaries.save(self._make_output_filename(".salary.json"))
+
+    def save_top_sketches(self, vacancies: list[Vacancy]) -> None:
+        """Save sketches of key skills and description words to be merged with other runs."""
+        top = TopSketches(show_excluded=self.settings.general.show_excluded, stopwords=self._stopwords)
+        with self.metrics.stage("top_sketches"):
+            for vacancy in vacancies:
+                top.add(vacancy)
+        top.save(self._make_output_filename(".top.json"))
+
+    @property
+    def _stopwords(self) -> frozenset[str]:
+        return DEFAULT_STOPWORDS.union(self.settings.general.extra_stopwords)
+
     def print_vacancies(self, vacancies: list[Vacancy]) -> None:
+        with self.metrics.stage("print"):
+            self._print_vacancies(vacancies)
+
+    def _print_vacancies(self, vacancies: list[Vacancy]) -> None:
         show_excluded = self.settings.general.show_excluded
         kindof = "ALL" if show_excluded else "NOT EXCLUDED"
         printer.print(f"Displaying {kindof} records")
@@ -60,16 +155,53 @@ class HHInspector:
                     break
 
     def save_vacancies_to_json_html(self, vacancies: list[Vacancy]) -> None:
-        json_str = convert_vacancies_to_json(vacancies, self.settings.general.show_excluded)
+        with self.metrics.stage("convert_json"):
+            json_str = convert_vacancies_to_json(vacancies, self.settings.general.show_excluded)
 
         if self.settings.general.save_results_to_json:
-            save_vacancies_to_json(json_str, self._make_output_filename(".json"))
+            with self.metrics.stage("save_json"):
+                save_vacancies_to_json(json_str, self._make_output_filename(".json"))
 
         if self.settings.general.save_results_to_html:
-            save_vacancies_to_html(json_str, self._make_output_filename(".html"))
+            with self.metrics.stage("save_html"):
+                save_vacancies_to_html(json_str, self._make_output_filename(".html"))
+
+    def save_vacancies_to_columnar(self, vacancies: list[Vacancy]) -> None:
+        from hh_inspect.columnar_export import save_vacancies_columnar  # noqa: PLC0415 (pyarrow is optional)
+
+        general = self.settings.general
+        for extension, enabled in (
+            (".parquet", general.save_results_to_parquet),
+            (".arrow", general.save_results_to_arrow),
+        ):
+            if enabled:
+                filename = self._make_output_filename(extension)
+                logger.info(f"Saving vacancies to '{filename}'...")
+                with self.metrics.stage(f"save_{extension[1:]}"):
+                    save_vacancies_columnar(vacancies, filename, general.show_excluded)
+
+    def save_vacancies_to_store(self, vacancies: list[Vacancy]) -> None:
+        """Add vacancies to the database of all runs."""
+        with (
+            self.metrics.stage("save_store"),
+            self._open_store() as store,
+            store.start_run(self.settings.general.output_filename, self.query) as run,
+        ):
+            store.upsert(run.run_id, vacancies)
+
+    @property
+    def query(self) -> QueryDict:
+        return self.settings.convert_query_to_dict()
+
+    def _open_store(self) -> VacancyStore:
+        return VacancyStore(_OUTPUT_DIR / self.settings.general.store_filename)
 
     def analyze_vacancies(self, vacancies: list[Vacancy]) -> None:
-        self.analyzer = Analyzer(vacancies, self.settings.general.show_excluded)
+        with self.metrics.stage("analyze"):
+            self._analyze_vacancies(vacancies)
+
+    def _analyze_vacancies(self, vacancies: list[Vacancy]) -> None:
+        self.analyzer = Analyzer(vacancies, self.settings.general.show_excluded, self.settings.general.extra_stopwords)
 
         if self.settings.general.save_results_to_csv:
             self.analyzer.save_vacancies_to_csv(self._make_output_filename(".csv"))
@@ -77,15 +209,32 @@ class HHInspector:
         if self.settings.general.print_salary_stats:
             self.analyzer.print_salary_stats()
 
+        for dimension in self.settings.general.print_salary_by:
+            self.analyzer.print_salary_by(dimension)
+
+        if self.settings.general.save_salary_cube:
+            self.analyzer.salary_cube.save(self._make_output_filename(".cube.json"))
+
         if self.settings.general.print_key_skills:
             self.analyzer.print_top_key_skills()
 
+        for skill in self.settings.general.print_related_skills:
+            self.analyzer.print_related_skills(skill)
+
+        if self.settings.general.save_skill_pairs:
+            self.analyzer.skill_cooccurrence.save_pairs(self._make_output_filename(".skill_pairs.csv"))
+
         if self.settings.general.print_top_words:
             self.analyzer.print_top_words_in_description()
 
         if self.settings.general.draw_salary_plots:
             self.analyzer.draw_plots()
 
+    def save_metrics(self) -> None:
+        """Write timings and counters of the run to output/<output_filename>.metrics.json and .prom."""
+        if self.settings.general.save_metrics:
+            self.metrics.save(_OUTPUT_DIR, self.settings.general.output_filename)
+
     def _make_output_filename(self, extension: str) -> Path:
         return _OUTPUT_DIR / f"{self.settings.general.output_filename}{extension}"
 
@@ -96,9 +245,25 @@ def main() -> None:
     settings = load_settings(_CONFIG_FILENAME)
     ConsolePrinter(settings.general.print_output_to_console)
 
-    hh = HHInspector(settings)
-    vacancies = hh.collect_vacancies()
-    if len(vacancies):
-        hh.print_vacancies(vacancies)
-        hh.save_vacancies_to_json_html(vacancies)
-        hh.analyze_vacancies(vacancies)
+    batch = settings.split_queries()
+    collector = create_collector(settings, _OUTPUT_DIR) if len(batch) > 1 else None
+    try:
+        for name, query_settings in batch.items():
+            if name:
+                logger.info(f"Running query '{name}'")
+                printer.print(f"\n=== Query '{name}' ===")
+
+            hh = HHInspector(query_settings, collector)
+            try:
+                if query_settings.general.stream_output:
+                    hh.stream_vacancies()
+                else:
+                    hh.process_vacancies(hh.collect_vacancies())
+                hh.save_metrics()
+            finally:
+                if collector is None:
+                    hh.collector.close()
+    finally:
+        # Stop the HTTP session and the parse workers also when a run fails or is interrupted
+        if collector is not None:
+            collector.close()
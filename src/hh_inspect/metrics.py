@@ -0,0 +1,178 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Final
+
+
+LATENCY_BUCKETS: Final = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+_PREFIX: Final = "hh_inspect"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Histogram:
+    """Prometheus-style histogram, bucket i counts observations <= LATENCY_BUCKETS[i] (not cumulative here)."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    total: float = 0.0
+    count: int = 0
+
+    def observe(self, value: float) -> None:
+        idx = next((i for i, bound in enumerate(LATENCY_BUCKETS) if value <= bound), len(LATENCY_BUCKETS))
+        self.counts[idx] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return (upper bound, count of observations <= bound) pairs, the last bound is '+Inf'."""
+        bounds = [*(f"{bound:g}" for bound in LATENCY_BUCKETS), "+Inf"]
+        result: list[tuple[str, int]] = []
+        running = 0
+        for bound, count in zip(bounds, self.counts, strict=True):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"buckets": dict(self.cumulative()), "sum": round(self.total, 6), "count": self.count}
+
+
+class RunMetrics:
+    """Thread-safe timings and counters of one run: HTTP requests, parsing, retries and HHInspector stages.
+
+    Saved at the end of the run as JSON and as a Prometheus text-format file.
+    """
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(UTC)
+        self.requests: dict[tuple[str, int], int] = {}  # (endpoint, status) -> number of responses
+        self.latency: dict[str, Histogram] = {}  # endpoint -> time of a single attempt
+        self.bytes_received: dict[str, int] = {}  # endpoint -> decoded response bytes
+        self.retries: dict[str, int] = {}  # reason -> number of retries
+        self.parsed = 0
+        self.parse_seconds = 0.0
+        self.stages: dict[str, float] = {}  # stage -> seconds
+        self.values: dict[str, float] = {}  # other gauges, e.g. the number of vacancies
+        self._lock = threading.Lock()
+
+    def observe_request(self, endpoint: str, status: int, seconds: float, num_bytes: int) -> None:
+        """Record an attempt, status 0 means that no response was received."""
+        with self._lock:
+            self.requests[endpoint, status] = self.requests.get((endpoint, status), 0) + 1
+            self.latency.setdefault(endpoint, Histogram()).observe(seconds)
+            self.bytes_received[endpoint] = self.bytes_received.get(endpoint, 0) + num_bytes
+
+    def observe_retry(self, reason: str) -> None:
+        with self._lock:
+            self.retries[reason] = self.retries.get(reason, 0) + 1
+
+    def observe_parse(self, seconds: float, count: int = 1) -> None:
+        with self._lock:
+            self.parsed += count
+            self.parse_seconds += seconds
+
+    def set_value(self, name: str, value: float) -> None:
+        with self._lock:
+            self.values[name] = value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the block to the duration of the stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now(UTC).isoformat(),
+                "requests": [
+                    {"endpoint": endpoint, "status": status, "count": count}
+                    for (endpoint, status), count in sorted(self.requests.items())
+                ],
+                "latency_seconds": {endpoint: hist.to_dict() for endpoint, hist in sorted(self.latency.items())},
+                "bytes_received": dict(sorted(self.bytes_received.items())),
+                "retries": dict(sorted(self.retries.items())),
+                "parse": {"count": self.parsed, "seconds": round(self.parse_seconds, 6)},
+                "stages_seconds": {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+                "values": dict(self.values),
+            }
+
+    def to_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def add(name: str, kind: str, help_text: str, samples: list[tuple[str, str, float]]) -> None:
+            lines.extend((f"# HELP {_PREFIX}_{name} {help_text}", f"# TYPE {_PREFIX}_{name} {kind}"))
+            lines.extend(f"{_PREFIX}_{name}{suffix}{labels} {_format(value)}" for suffix, labels, value in samples)
+
+        with self._lock:
+            add(
+                "requests_total",
+                "counter",
+                "HTTP responses by endpoint and status (0 = connection error).",
+                [("", _labels(endpoint=ep, status=str(st)), n) for (ep, st), n in sorted(self.requests.items())],
+            )
+            histogram: list[tuple[str, str, float]] = []
+            for endpoint, hist in sorted(self.latency.items()):
+                histogram.extend(("_bucket", _labels(endpoint=endpoint, le=le), n) for le, n in hist.cumulative())
+                histogram.append(("_sum", _labels(endpoint=endpoint), hist.total))
+                histogram.append(("_count", _labels(endpoint=endpoint), hist.count))
+            add("request_duration_seconds", "histogram", "Duration of a single HTTP request attempt.", histogram)
+            add(
+                "response_bytes_total",
+                "counter",
+                "Decoded bytes of HTTP responses.",
+                [("", _labels(endpoint=ep), n) for ep, n in sorted(self.bytes_received.items())],
+            )
+            add(
+                "retries_total",
+                "counter",
+                "Retried requests by reason.",
+                [("", _labels(reason=reason), n) for reason, n in sorted(self.retries.items())],
+            )
+            add("parsed_vacancies_total", "counter", "Parsed vacancy responses.", [("", "", self.parsed)])
+            add(
+                "parse_seconds_total",
+                "counter",
+                "Time spent parsing vacancy responses.",
+                [("", "", self.parse_seconds)],
+            )
+            add(
+                "stage_duration_seconds",
+                "gauge",
+                "Duration of the run stages.",
+                [("", _labels(stage=stage), seconds) for stage, seconds in self.stages.items()],
+            )
+            for name, value in self.values.items():
+                add(name, "gauge", name.replace("_", " ").capitalize() + ".", [("", "", value)])
+            add("run_timestamp_seconds", "gauge", "Start of the run.", [("", "", self.started_at.timestamp())])
+        return "\n".join(lines) + "\n"
+
+    def save(self, output_dir: Path, filename: str) -> None:
+        """Write <filename>.metrics.json and <filename>.prom to output_dir."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        json_filename = output_dir / f"{filename}.metrics.json"
+        logger.info(f"Saving metrics to '{json_filename}'...")
+        json_filename.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+        (output_dir / f"{filename}.prom").write_text(self.to_prometheus(), encoding="utf-8")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _labels(**labels: str) -> str:
+    pairs = (f"{key}={json.dumps(value, ensure_ascii=False)}" for key, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
@@ -0,0 +1,198 @@
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Final
+from urllib.parse import parse_qs, urlsplit
+
+from hh_inspect.query_planner import MAX_SEARCH_DEPTH
+
+
+_DESCRIPTION_PARAGRAPH: Final = (
+    "<p><strong>Обязанности:</strong></p><ul><li>разработка и поддержка сервисов на Python</li>"
+    "<li>проектирование API и схем данных</li><li>участие в code review</li></ul>"
+)
+_ID_PLACEHOLDER: Final = "__VACANCY_ID__"
+_REQUEST_QUEUE_SIZE: Final = 1024  # the default of 5 drops connections under high concurrency
+
+logger = logging.getLogger(__name__)
+
+
+def make_sample_vacancy(vacancy_id: str = "12345") -> dict[str, Any]:
+    """Vacancy JSON of the same shape and size as a typical api.hh.ru response."""
+    return {
+        "id": vacancy_id,
+        "premium": False,
+        "name": "Python-разработчик",
+        "department": None,
+        "has_test": False,
+        "response_letter_required": False,
+        "area": {"id": "1", "name": "Москва", "url": "https://api.hh.ru/areas/1"},
+        "salary_range": {
+            "from": 250000,
+            "to": 350000,
+            "currency": "RUR",
+            "gross": True,
+            "mode": {"id": "MONTH", "name": "в месяц"},
+            "frequency": {"id": "TWICE_PER_MONTH", "name": "Два раза в месяц"},
+        },
+        "type": {"id": "open", "name": "Открытая"},
+        "address": {
+            "city": "Москва",
+            "street": "Ленинградский проспект",
+            "building": "39",
+            "description": None,
+            "lat": 55.797,
+            "lng": 37.538,
+            "raw": "Москва, Ленинградский проспект, 39",
+            "metro_stations": [{"station_name": "Динамо", "line_name": "Замоскворецкая", "lat": 55.789}],
+        },
+        "experience": {"id": "between3And6", "name": "От 3 до 6 лет"},
+        "schedule": {"id": "fullDay", "name": "Полный день"},
+        "employment": {"id": "full", "name": "Полная занятость"},
+        "work_format": [{"id": "REMOTE", "name": "Удалённо"}, {"id": "HYBRID", "name": "Гибрид"}],
+        "description": _DESCRIPTION_PARAGRAPH * 20,
+        "key_skills": [{"name": name} for name in ("Python", "PostgreSQL", "Docker", "Kafka", "Git", "Linux")],
+        "professional_roles": [{"id": "96", "name": "Программист, разработчик"}],
+        "employer": {
+            "id": "1740",
+            "name": "Яндекс",
+            "url": "https://api.hh.ru/employers/1740",
+            "alternate_url": "https://hh.ru/employer/1740",
+            "logo_urls": {"90": "https://img.hhcdn.ru/employer-logo/1.png", "original": "https://img.hhcdn.ru/2.png"},
+            "trusted": True,
+            "accredited_it_employer": True,
+        },
+        "published_at": "2026-03-01T12:00:00+0300",
+        "created_at": "2026-03-01T12:00:00+0300",
+        "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+        "languages": [],
+    }
+
+
+def make_sample_search_item(vacancy_id: str) -> dict[str, Any]:
+    """Search page item of the sample vacancy: no key skills and a snippet instead of the description."""
+    vacancy = make_sample_vacancy(vacancy_id)
+    for key in ("description", "key_skills", "professional_roles", "languages"):
+        del vacancy[key]
+    return vacancy | {
+        "url": f"https://api.hh.ru/vacancies/{vacancy_id}",
+        "snippet": {"responsibility": "Разработка сервисов на Python.", "requirement": "Опыт от 3 лет."},
+    }
+
+
+@dataclass
+class MockApiConfig:
+    num_vacancies: int = 1000
+    latency: float = 0.05  # seconds before every response
+    jitter: float = 0.02  # latency is uniformly distributed in [latency - jitter, latency + jitter]
+    error_rate: float = 0.0  # share of '503 Service Unavailable' responses to vacancy requests
+    throttle_rate: float = 0.0  # share of '429 Too Many Requests' responses to vacancy requests
+    retry_after: int = 0  # Retry-After header of 429 responses, seconds
+
+
+class _MockApiHandler(BaseHTTPRequestHandler):
+    server: "_MockHTTPServer"
+
+    def do_GET(self) -> None:
+        config = self.server.config
+        url = urlsplit(self.path)
+        vacancy_id = url.path.rstrip("/").split("/")[-1]
+        self.server.count_request()
+        time.sleep(max(config.latency + random.uniform(-config.jitter, config.jitter), 0))  # noqa: S311
+
+        if vacancy_id == "vacancies":
+            query = parse_qs(url.query)
+            self._send_search_page(int(query.get("page", ["0"])[0]), int(query.get("per_page", ["20"])[0]))
+            return
+
+        roll = random.random()  # noqa: S311
+        if roll < config.throttle_rate:
+            self._send_json(429, {"errors": [{"type": "too_many_requests"}]}, {"Retry-After": str(config.retry_after)})
+        elif roll < config.throttle_rate + config.error_rate:
+            self._send_json(503, {"errors": [{"type": "service_unavailable"}]})
+        else:
+            self._send_body(200, self.server.vacancy_template.replace(_ID_PLACEHOLDER.encode(), vacancy_id.encode()))
+
+    def _send_search_page(self, page: int, per_page: int) -> None:
+        found = self.server.config.num_vacancies
+        per_page = max(per_page, 1)
+        first = page * per_page
+        last = min(first + per_page, found, MAX_SEARCH_DEPTH)
+        self._send_json(
+            200,
+            {
+                "items": [make_sample_search_item(str(idx)) for idx in range(first, last)],
+                "found": found,
+                "pages": math.ceil(min(found, MAX_SEARCH_DEPTH) / per_page),
+                "page": page,
+                "per_page": per_page,
+            },
+        )
+
+    def _send_json(self, status: int, data: object, headers: dict[str, str] | None = None) -> None:
+        self._send_body(status, json.dumps(data, ensure_ascii=False).encode(), headers)
+
+    def _send_body(self, status: int, body: bytes, headers: dict[str, str] | None = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass  # keep the output of benchmarks clean
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = _REQUEST_QUEUE_SIZE
+
+    def __init__(self, address: tuple[str, int], config: MockApiConfig) -> None:
+        super().__init__(address, _MockApiHandler)
+        self.config = config
+        self.vacancy_template = json.dumps(make_sample_vacancy(_ID_PLACEHOLDER), ensure_ascii=False).encode()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+
+class MockApiServer:
+    """Local stand-in for api.hh.ru with synthetic vacancies, configurable latency and failures.
+
+    Serves search pages at /vacancies/ and vacancy details at /vacancies/<id> in a background thread.
+    """
+
+    def __init__(self, config: MockApiConfig | None = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = _MockHTTPServer((host, port), config or MockApiConfig())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host!s}:{port}/vacancies/"
+
+    @property
+    def config(self) -> MockApiConfig:
+        return self._server.config
+
+    @property
+    def requests(self) -> int:
+        return self._server.requests
+
+    def start(self) -> None:
+        self._thread.start()
+        logger.info(f"Mock API is serving at {self.url}")
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,73 @@
+import logging
+import math
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Final
+
+from hh_inspect.settings import QueryDict
+
+
+MAX_SEARCH_DEPTH: Final = 2000  # api.hh.ru returns at most this many results for a query
+SEARCH_PERIOD: Final = timedelta(days=30)  # vacancies older than this are not searched by default
+
+_MIN_WINDOW: Final = timedelta(minutes=1)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SubQuery:
+    params: QueryDict
+    found: int
+
+    def num_pages(self, per_page: int) -> int:
+        return math.ceil(min(self.found, MAX_SEARCH_DEPTH) / max(per_page, 1))
+
+
+class QueryPlanner:
+    """Split a query with too many results into disjoint sub-queries by publication date.
+
+    The [date_from, date_to] window is halved until every part fits under `max_results`,
+    windows of the same level are counted concurrently. `count` returns the number of
+    vacancies found for the given query parameters.
+    """
+
+    def __init__(
+        self, count: Callable[[QueryDict], int], max_workers: int = 1, max_results: int = MAX_SEARCH_DEPTH
+    ) -> None:
+        self.count = count
+        self.max_workers = max(max_workers, 1)
+        self.max_results = max_results
+
+    def plan(self, params: QueryDict, date_from: datetime, date_to: datetime) -> list[SubQuery]:
+        """Return sub-queries ordered from the newest window to the oldest one."""
+        sub_queries: list[tuple[datetime, SubQuery]] = []
+        pending = [(date_from, date_to)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending:
+                window_params = [params | _make_window_params(start, end) for start, end in pending]
+                next_pending: list[tuple[datetime, datetime]] = []
+                for (start, end), sub_params, found in zip(
+                    pending, window_params, executor.map(self.count, window_params), strict=True
+                ):
+                    if found > self.max_results and end - start > _MIN_WINDOW:
+                        middle = (start + (end - start) / 2).replace(microsecond=0)
+                        next_pending.extend([(start, middle), (middle + timedelta(seconds=1), end)])
+                        continue
+                    if found > self.max_results:
+                        logger.warning(f"Cannot split window {start} - {end} further, {found} vacancies found")
+                    if found > 0:
+                        sub_queries.append((start, SubQuery(sub_params, found)))
+                pending = next_pending
+
+        logger.info(f"Query split into {len(sub_queries)} sub-queries")
+        return [sub_query for _, sub_query in sorted(sub_queries, key=lambda x: x[0], reverse=True)]
+
+
+def _make_window_params(start: datetime, end: datetime) -> QueryDict:
+    return {
+        "date_from": start.isoformat(timespec="seconds"),
+        "date_to": end.isoformat(timespec="seconds"),
+    }
@@ -0,0 +1,44 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket to limit the request rate of all workers together.
+
+    `rate` tokens are added per second up to `capacity` (burst size), every request takes one.
+    A rate of 0 disables limiting, but pause() still works (e.g. to obey Retry-After).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        self.rate = max(rate, 0.0)
+        self.capacity = capacity if capacity is not None else max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before sending a request."""
+        now = time.monotonic()
+        with self._lock:
+            wait = max(self._paused_until - now, 0.0)
+            if self.rate == 0:
+                return wait
+
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate  # spread the queued requests out after a pause too
+            return wait
+
+    def acquire(self) -> None:
+        """Block until a request can be sent."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Hold all workers for the given time, e.g. after '429 Too Many Requests'."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
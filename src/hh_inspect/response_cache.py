@@ -0,0 +1,125 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Final
+
+
+_SAFE_KEY_CHARS: Final = frozenset("0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ-_")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    body: dict[str, Any]
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float  # time.time() of the last successful fetch or revalidation
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Headers to ask the server whether the cached body is still valid."""
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # fresh entries used without a request
+    revalidated: int = 0  # stale entries confirmed by '304 Not Modified'
+    misses: int = 0
+    evicted: int = 0
+
+    def __str__(self) -> str:
+        return f"hits: {self.hits}, revalidated: {self.revalidated}, misses: {self.misses}, evicted: {self.evicted}"
+
+
+class ResponseCache:
+    """On-disk cache of API responses, one JSON file per key (vacancy id).
+
+    Entries younger than `ttl` seconds are used as is, older ones are revalidated
+    with ETag / Last-Modified if the server sent them. The least recently used
+    entries are evicted when the cache grows over `max_size` bytes.
+    """
+
+    def __init__(self, cache_dir: Path, ttl: float, max_size: int) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._make_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = CacheEntry(**json.load(f))
+            os.utime(path)  # mtime marks the last use for LRU eviction
+        except FileNotFoundError:
+            self._count("misses")
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Broken cache entry '{path}' ({e}), ignoring it")
+            self._count("misses")
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return time.time() - entry.fetched_at < self.ttl
+
+    def use(self, entry: CacheEntry) -> dict[str, Any]:
+        """Return the body of a fresh entry used instead of a request, counting it as a hit."""
+        self._count("hits")
+        return entry.body
+
+    def put(self, key: str, body: dict[str, Any], etag: str | None = None, last_modified: str | None = None) -> None:
+        self._write(key, CacheEntry(body=body, etag=etag, last_modified=last_modified, fetched_at=time.time()))
+
+    def refresh(self, key: str, entry: CacheEntry) -> None:
+        """Mark the entry as fresh again after the server answered '304 Not Modified'."""
+        self._count("revalidated")
+        entry.fetched_at = time.time()
+        self._write(key, entry)
+
+    def prune(self) -> int:
+        """Remove the least recently used entries until the cache fits into max_size, return their number."""
+        files = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in os.scandir(self.cache_dir)]
+        total_size = sum(size for _, size, _ in files)
+        evicted = 0
+        for _, size, path in sorted(files):
+            if total_size <= self.max_size:
+                break
+            Path(path).unlink(missing_ok=True)
+            total_size -= size
+            evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from '{self.cache_dir}'")
+        with self._lock:
+            self.stats.evicted += evicted
+        return evicted
+
+    def _write(self, key: str, entry: CacheEntry) -> None:
+        path = self._make_path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry.__dict__, f, ensure_ascii=False)
+        tmp_path.replace(path)  # atomic, readers never see a half-written file
+
+    def _make_path(self, key: str) -> Path:
+        if not key or not set(key) <= _SAFE_KEY_CHARS:
+            key = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + 1)
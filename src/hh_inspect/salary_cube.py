@@ -0,0 +1,122 @@
+# pyright: reportUnknownMemberType = false
+# pyright: reportUnknownVariableType = false
+
+import json
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Final, Self
+
+import numpy as np
+import pandas as pd
+
+
+DIMENSIONS: Final = ("experience", "region", "schedule", "work_format", "employer_name", "key_skills")
+LIST_DIMENSIONS: Final = frozenset({"work_format", "key_skills"})  # a vacancy counts in the group of each item
+# Dimensions of a cuboid are always in the order of DIMENSIONS
+DEFAULT_CUBOIDS: Final = (
+    *((dimension,) for dimension in DIMENSIONS),
+    ("experience", "key_skills"),
+    ("region", "key_skills"),
+)
+STATS: Final = ("count", "mean", "p25", "median", "p75")
+_QUANTILES: Final = [0.25, 0.5, 0.75]
+
+logger = logging.getLogger(__name__)
+
+
+def make_salary_column(df: pd.DataFrame) -> pd.Series:
+    """Return the salary of each vacancy: the middle of the range, or its only bound, NaN without a salary."""
+    salaries = [df[name].to_numpy(dtype="float64", na_value=np.nan) for name in ("salary_from", "salary_to")]
+    salary_from, salary_to = (np.where(values > 0, values, np.nan) for values in salaries)
+    both = (np.nan_to_num(salary_from) + np.nan_to_num(salary_to)) / 2
+    salary = np.where(np.isnan(salary_from) | np.isnan(salary_to), np.fmax(salary_from, salary_to), both)
+    return pd.Series(salary, index=df.index, name="salary")
+
+
+def aggregate_salaries(df: pd.DataFrame, dimensions: Iterable[str]) -> pd.DataFrame:
+    """Group vacancies with a salary by the dimensions and return STATS of each group.
+
+    The groupings are done by pandas in a pass over the rows each, list dimensions are exploded first.
+    The result is indexed by the dimension values and sorted, so that lookups are fast.
+    """
+    dimensions = list(dimensions)
+    salary = make_salary_column(df)
+    has_salary = salary.notna().to_numpy()
+    frame = df.loc[has_salary, dimensions].reset_index(drop=True)  # categoricals stay categoricals
+    frame["salary"] = salary.to_numpy()[has_salary]
+    for name in dimensions:
+        if name in LIST_DIMENSIONS:
+            frame = frame.explode(name)
+    frame = frame.dropna(subset=dimensions)
+
+    grouped = frame.groupby(dimensions, observed=True, sort=True)["salary"]
+    stats = grouped.agg(["count", "mean"])
+    quantiles = grouped.quantile(_QUANTILES).unstack().reindex(columns=_QUANTILES)  # noqa: PD010 (not a pivot)
+    stats[["p25", "median", "p75"]] = quantiles.to_numpy()
+    return stats
+
+
+class SalaryCube:
+    """Precomputed salary statistics grouped by one or more DIMENSIONS (cuboids).
+
+    Answers questions like "what does Python pay at 3-6 years of experience" with an index lookup.
+    Cuboids that were not precomputed are built on first use while the vacancies are at hand.
+    """
+
+    def __init__(self, cuboids: dict[tuple[str, ...], pd.DataFrame], df: pd.DataFrame | None = None) -> None:
+        self.cuboids = cuboids
+        self._df = df
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, cuboids: Iterable[tuple[str, ...]] = DEFAULT_CUBOIDS) -> Self:
+        return cls({dimensions: aggregate_salaries(df, dimensions) for dimensions in cuboids}, df)
+
+    def get_cuboid(self, *dimensions: str) -> pd.DataFrame:
+        """Return the statistics grouped by the dimensions, in any order."""
+        unknown = set(dimensions) - set(DIMENSIONS)
+        if unknown:
+            msg = f"Unknown dimensions {sorted(unknown)}, expected some of {DIMENSIONS}"
+            raise ValueError(msg)
+        key = tuple(name for name in DIMENSIONS if name in dimensions)
+        if key not in self.cuboids:
+            if self._df is None:
+                msg = f"Salaries by {key} were not precomputed"
+                raise KeyError(msg)
+            self.cuboids[key] = aggregate_salaries(self._df, key)
+        return self.cuboids[key]
+
+    def query(self, **values: str) -> dict[str, float] | None:
+        """Return STATS of the vacancies with the given values, None if none of them has a salary.
+
+        E.g. query(key_skills="Python", experience="between3And6").
+        """
+        cuboid = self.get_cuboid(*values)
+        key = tuple(values[name] for name in cuboid.index.names)
+        try:
+            row = cuboid.loc[key if len(key) > 1 else key[0]]
+        except KeyError:
+            return None
+        return {name: float(row[name]) for name in STATS}
+
+    def top(self, *dimensions: str, amount: int = 10, min_count: int = 1) -> pd.DataFrame:
+        """Return the groups with the most vacancies."""
+        cuboid = self.get_cuboid(*dimensions)
+        return cuboid[cuboid["count"] >= min_count].nlargest(amount, "count")
+
+    def save(self, path: Path) -> None:
+        logger.info(f"Saving the salary cube to '{path}'...")
+        data = [
+            {"dimensions": list(dimensions), "rows": cuboid.reset_index().to_numpy().tolist()}
+            for dimensions, cuboid in self.cuboids.items()
+        ]
+        path.write_text(json.dumps(data, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        cuboids: dict[tuple[str, ...], pd.DataFrame] = {}
+        for item in json.loads(path.read_text(encoding="utf-8")):
+            dimensions = item["dimensions"]
+            cuboid = pd.DataFrame(item["rows"], columns=[*dimensions, *STATS]).set_index(dimensions)
+            cuboids[tuple(dimensions)] = cuboid.astype({"count": "int64"})
+        return cls(cuboids)
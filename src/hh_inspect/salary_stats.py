@@ -0,0 +1,203 @@
+import argparse
+import json
+import logging
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final, Self
+
+from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.vacancy import Vacancy
+
+
+QUANTILES: Final = (0.1, 0.25, 0.5, 0.75, 0.9)
+SALARY_FIELDS: Final = ("salary_from", "salary_to")
+DEFAULT_RELATIVE_ACCURACY: Final = 0.01
+
+logger = logging.getLogger(__name__)
+printer = ConsolePrinter()
+
+
+class QuantileSketch:
+    """Mergeable sketch of positive values with quantiles within a relative error (DDSketch).
+
+    Values are counted in logarithmic buckets: bucket i holds values in (gamma^(i-1), gamma^i],
+    so a salary of 100 000 rub is reported within 1% with the default accuracy, whatever the number
+    of values. Sketches with the same accuracy are merged by adding their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> None:
+        if not 0 < relative_accuracy < 1:
+            msg = f"Relative accuracy must be in (0, 1), got {relative_accuracy}"
+            raise ValueError(msg)
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value <= 0:
+            msg = f"Only positive values can be added, got {value}"
+            raise ValueError(msg)
+        idx = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[idx] = self.buckets.get(idx, 0) + count
+        self.count += count
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            msg = f"Cannot merge sketches of accuracy {self.relative_accuracy} and {other.relative_accuracy}"
+            raise ValueError(msg)
+        for idx, count in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float:
+        """Return the value of rank q * (count - 1), NaN if the sketch is empty."""
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if seen > rank:
+                return 2 * self._gamma**idx / (self._gamma + 1)  # the middle of the bucket by relative error
+        return 2 * self._gamma ** max(self.buckets) / (self._gamma + 1)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(idx): count for idx, count in sorted(self.buckets.items())},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        sketch = cls(data["relative_accuracy"])
+        sketch.buckets = {int(idx): count for idx, count in data["buckets"].items()}
+        sketch.count = sum(sketch.buckets.values())
+        return sketch
+
+
+@dataclass
+class SalaryStats:
+    """Exact count, min, max and mean and approximate quantiles of salaries, zeros (no salary) are skipped."""
+
+    count: int = 0
+    min: int = 0
+    max: int = 0
+    total: int = 0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def add(self, value: int) -> None:
+        if value <= 0:
+            return
+        if self.count:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+        else:
+            self.min = self.max = value
+        self.count += 1
+        self.total += value
+        self.sketch.add(value)
+
+    def merge(self, other: "SalaryStats") -> None:
+        if other.count:
+            self.min = min(self.min, other.min) if self.count else other.min
+            self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        self.sketch.merge(other.sketch)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Return the approximate quantile clamped to the exact min and max."""
+        if not self.count:
+            return math.nan
+        return min(max(self.sketch.quantile(q), self.min), self.max)
+
+    def summary(self) -> dict[str, float]:
+        """Return count, min, max, mean, median and the p10..p90 QUANTILES."""
+        result: dict[str, float] = {"count": self.count, "min": self.min, "max": self.max, "mean": self.mean}
+        result["median"] = self.quantile(0.5)
+        result.update((f"p{round(q * 100)}", self.quantile(q)) for q in QUANTILES)
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "total": self.total,
+            "sketch": self.sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        return cls(data["count"], data["min"], data["max"], data["total"], QuantileSketch.from_dict(data["sketch"]))
+
+
+class SalaryAccumulator:
+    """Salary statistics updated vacancy by vacancy, e.g. as they arrive from the collector.
+
+    Nothing but the statistics is kept, so it works for any number of vacancies. Accumulators of
+    different runs or shards are combined with merge() or by loading their files together.
+    """
+
+    def __init__(self, show_excluded: bool = False) -> None:
+        self.show_excluded = show_excluded
+        self.stats = {name: SalaryStats() for name in SALARY_FIELDS}
+
+    def add(self, vacancy: Vacancy) -> None:
+        if self.show_excluded or not vacancy.excluded:
+            self.stats["salary_from"].add(vacancy.salary_from)
+            self.stats["salary_to"].add(vacancy.salary_to)
+
+    def merge(self, other: "SalaryAccumulator") -> None:
+        for name, stats in self.stats.items():
+            stats.merge(other.stats[name])
+
+    def print_stats(self) -> None:
+        printer.print("")
+        for prefix, name in (("SALARY FROM", "salary_from"), ("SALARY   TO", "salary_to")):
+            stats = self.stats[name].summary()
+            quantiles = ", ".join(f"p{round(q * 100)}: {stats[f'p{round(q * 100)}']:.0f}" for q in QUANTILES)
+            printer.print(
+                f"{prefix} min: {stats['min']}, max: {stats['max']}, mean: {stats['mean']:.0f}, "
+                f"median: {stats['median']:.0f} ({quantiles}; {stats['count']} salaries)"
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        accumulator = cls()
+        accumulator.stats = {name: SalaryStats.from_dict(data[name]) for name in SALARY_FIELDS}
+        return accumulator
+
+    def save(self, path: Path) -> None:
+        logger.info(f"Saving salary statistics to '{path}'...")
+        path.write_text(json.dumps(self.to_dict()) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+def main() -> None:
+    """Merge and print saved statistics with `python -m hh_inspect.salary_stats <file>...`."""
+    parser = argparse.ArgumentParser(description="Salary statistics of several runs")
+    parser.add_argument("files", type=Path, nargs="+", help="Files <output_filename>.salary.json")
+    args = parser.parse_args()
+
+    accumulator = SalaryAccumulator()
+    for path in args.files:
+        accumulator.merge(SalaryAccumulator.load(path))
+    accumulator.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,15 +2,17 @@ import argparse
 import logging
 import sys
 from pathlib import Path
-from typing import Final
+from typing import Any, Final, Literal
 
 import yaml
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ValidationError, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 type QueryValue = str | int | bool
 type QueryDict = dict[str, QueryValue | list[QueryValue]]
+type CollectorBackend = Literal["threads", "asyncio"]
+type SalaryDimension = Literal["experience", "region", "schedule", "work_format", "employer_name", "key_skills"]
 
 # fmt: off
 EXCHANGE_RATES: Final[dict[str, float]] = {
@@ -47,10 +49,24 @@ class QuerySettings(BaseModel):
 
 class FilterAfterSettings(BaseModel):
     excluded_companies: list[str] = []
+    excluded_employer_ids: list[str] = []
 
 
 class GeneralSettings(BaseModel):
     num_workers: int = 1
+    backend: CollectorBackend = "threads"
+    parse_workers: int = 0  # 0 parses responses in the fetching threads
+    requests_per_second: float = 0  # 0 means no limit
+    max_retries: int = 3
+
+    use_cache: bool = False
+    cache_ttl_hours: float = 24
+    cache_max_size_mb: int = 500
+    incremental: bool = False
+    checkpoint_every: int = 0  # save the progress every N vacancies, 0 disables checkpoints
+    resume: bool = False
+    list_only: bool = False
+    split_large_queries: bool = False
 
     print_output_to_console: bool = True
     max_to_display: int = 25
@@ -60,23 +76,63 @@ class GeneralSettings(BaseModel):
     save_results_to_csv: bool = True
     save_results_to_json: bool = True
     save_results_to_html: bool = True
+    save_results_to_parquet: bool = False
+    save_results_to_arrow: bool = False
+    save_metrics: bool = True
+    save_salary_stats: bool = False
+    save_top_sketches: bool = False
+    save_to_store: bool = False
+    store_filename: str = "vacancies.db"
+    stream_output: bool = False
+    stream_gzip: bool = False
 
     draw_salary_plots: bool = True
     print_salary_stats: bool = True
+    print_salary_by: list[SalaryDimension] = []
+    save_salary_cube: bool = False
     print_key_skills: bool = True
+    print_related_skills: list[str] = []  # key skills found together with these ones
+    save_skill_pairs: bool = False
     print_top_words: bool = True
+    extra_stopwords: list[str] = []  # words skipped in the description statistics besides the built-in ones
 
 
 class Settings(BaseSettings):
     # https://docs.pydantic.dev/latest/concepts/pydantic_settings/#the-basics
 
     query: QuerySettings = QuerySettings()
+    queries: dict[str, QuerySettings] = {}  # named queries for a batch run, missing fields are taken from `query`
     filter_after: FilterAfterSettings = FilterAfterSettings()
     general: GeneralSettings = GeneralSettings()
 
+    @field_validator("queries", mode="before")
+    @classmethod
+    def allow_empty_queries(cls, value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        return {name: {} if query is None else query for name, query in value.items()}
+
     def convert_query_to_dict(self) -> QueryDict:
         return self.query.to_dict()
 
+    def split_queries(self) -> dict[str, "Settings"]:
+        """Return settings for every named query with its own output filename, or just self if there are none."""
+        if not self.queries:
+            return {"": self}
+        # Fields not set in a named query are taken from `query` only now, after the CLI arguments are applied
+        return {
+            name: self.model_copy(
+                update={
+                    "query": self.query.model_copy(update=query.model_dump(include=query.model_fields_set)),
+                    "queries": {},
+                    "general": self.general.model_copy(
+                        update={"output_filename": f"{self.general.output_filename}_{name}"}
+                    ),
+                }
+            )
+            for name, query in self.queries.items()
+        }
+
     def __str__(self) -> str:
         return str(self.model_dump())
 
@@ -132,6 +188,22 @@ def _parse_args(settings: Settings, argv: list[str]) -> None:
         help="Number of parallel workers for multithreading.",
     )
 
+    parser.add_argument(
+        "-b",
+        "--backend",
+        action="store",
+        choices=["threads", "asyncio"],
+        default=None,
+        help="How to fetch vacancies in parallel: thread pool or asyncio (requires aiohttp).",
+    )
+
+    parser.add_argument(
+        "-r",
+        "--resume",
+        action="store_true",
+        help="Continue the interrupted collection from its last checkpoint.",
+    )
+
     args: Final = parser.parse_args(argv)
 
     if args.text is not None:
@@ -139,3 +211,9 @@ def _parse_args(settings: Settings, argv: list[str]) -> None:
 
     if args.num_workers is not None and isinstance(args.num_workers, int) and args.num_workers >= 1:
         settings.general.num_workers = args.num_workers
+
+    if args.backend is not None:
+        settings.general.backend = args.backend
+
+    if args.resume:
+        settings.general.resume = True
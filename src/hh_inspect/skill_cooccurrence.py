@@ -0,0 +1,153 @@
+# pyright: reportUnknownMemberType = false
+# pyright: reportUnknownVariableType = false
+
+import logging
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Final, Literal
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+
+type Score = Literal["count", "lift", "pmi"]
+
+_INDEX: Final = np.int64
+
+logger = logging.getLogger(__name__)
+
+
+class SkillCooccurrence:
+    """Sparse vacancy x skill incidence matrix and the skill co-occurrence matrix it gives.
+
+    Both are kept in CSR form as NumPy arrays: row i of a matrix is indices[indptr[i]:indptr[i + 1]],
+    so the memory is proportional to the number of non-zero cells, not to vacancies x skills.
+    The co-occurrence matrix X^T X (without the diagonal) is built from the skill pairs of every vacancy
+    without Python loops, and is symmetric: both (a, b) and (b, a) are stored for fast row lookups.
+
+    lift(a, b) = P(a and b) / (P(a) * P(b)), pmi(a, b) = log2(lift(a, b)), > 0 for skills found
+    together more often than by chance.
+    """
+
+    def __init__(self, key_skills: Iterable[list[str]]) -> None:
+        skill_lists = list(key_skills)
+        lengths = np.fromiter((len(skills) for skills in skill_lists), dtype=_INDEX, count=len(skill_lists))
+        codes, uniques = pd.factorize(pd.Series([skill for skills in skill_lists for skill in skills], dtype="str"))
+        self.skills: list[str] = list(uniques)
+        self._skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+        self.num_vacancies = len(skill_lists)
+        width = max(len(self.skills), 1)  # cells and pairs are encoded as row * width + column
+
+        # Incidence matrix, a skill listed twice in a vacancy counts once
+        rows = np.repeat(np.arange(self.num_vacancies, dtype=_INDEX), lengths)
+        cells = np.unique(rows * width + codes.astype(_INDEX))
+        self.incidence_indptr, self.incidence_indices = _to_csr(cells // width, cells % width, self.num_vacancies)
+        self.skill_counts = np.bincount(self.incidence_indices, minlength=len(self.skills)).astype(_INDEX)
+
+        # Co-occurrence matrix from the pairs of skills in every row of the incidence matrix
+        first, second = _row_pairs(self.incidence_indptr, self.incidence_indices)
+        pair_codes, pair_counts = np.unique(first * width + second, return_counts=True)
+        first, second = pair_codes // width, pair_codes % width
+        self.indptr, self.indices, self.counts = _to_csr(
+            np.concatenate([first, second]),
+            np.concatenate([second, first]),
+            len(self.skills),
+            np.concatenate([pair_counts, pair_counts]).astype(_INDEX),
+        )
+
+    @property
+    def num_pairs(self) -> int:
+        """Return the number of distinct pairs of skills found together."""
+        return len(self.indices) // 2
+
+    def skill_count(self, skill: str) -> int:
+        skill_id = self._skill_ids.get(skill)
+        return 0 if skill_id is None else int(self.skill_counts[skill_id])
+
+    def pair_count(self, first: str, second: str) -> int:
+        first_id, second_id = self._skill_ids.get(first), self._skill_ids.get(second)
+        if first_id is None or second_id is None:
+            return 0
+        start, end = self.indptr[first_id], self.indptr[first_id + 1]
+        pos = start + np.searchsorted(self.indices[start:end], second_id)
+        return int(self.counts[pos]) if pos < end and self.indices[pos] == second_id else 0
+
+    def related(
+        self, skill: str, amount: int = 10, score: Score = "lift", min_count: int = 2
+    ) -> list[tuple[str, int, float]]:
+        """Return (skill, count, score) of the skills most related to the given one.
+
+        Pairs seen fewer than min_count times are skipped, the lift of rare pairs is mostly noise.
+        """
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is None:
+            return []
+        start, end = self.indptr[skill_id], self.indptr[skill_id + 1]
+        others, counts = self.indices[start:end], self.counts[start:end]
+        keep = counts >= min_count
+        others, counts = others[keep], counts[keep]
+        scores = self._scores(np.full_like(others, skill_id), others, counts, score)
+        order = np.lexsort((-counts, -scores))[:amount]  # by score, then by count
+        return [(self.skills[others[i]], int(counts[i]), float(scores[i])) for i in order]
+
+    def to_frame(self, min_count: int = 1) -> pd.DataFrame:
+        """Return every pair of skills once, with its count, lift and pmi, the most frequent pairs first."""
+        rows = np.repeat(np.arange(len(self.skills), dtype=_INDEX), np.diff(self.indptr))
+        keep = (rows < self.indices) & (self.counts >= min_count)
+        first, second, counts = rows[keep], self.indices[keep], self.counts[keep]
+        skills = np.asarray(self.skills, dtype=object)
+        frame = pd.DataFrame(
+            {
+                "skill_a": skills[first],
+                "skill_b": skills[second],
+                "count": counts,
+                "lift": self._scores(first, second, counts, "lift"),
+                "pmi": self._scores(first, second, counts, "pmi"),
+            }
+        )
+        return frame.sort_values(["count", "lift"], ascending=False, ignore_index=True)
+
+    def save_pairs(self, path: Path, min_count: int = 2) -> None:
+        logger.info(f"Saving skill pairs to '{path}'...")
+        self.to_frame(min_count).to_csv(path, index=False)
+
+    def _scores(
+        self, first: npt.NDArray[np.int64], second: npt.NDArray[np.int64], counts: npt.NDArray[np.int64], score: Score
+    ) -> npt.NDArray[np.float64]:
+        if score == "count":
+            return counts.astype(np.float64)
+        lift = counts * self.num_vacancies / (self.skill_counts[first] * self.skill_counts[second]).astype(np.float64)
+        return lift if score == "lift" else np.log2(lift)
+
+
+def _to_csr(
+    rows: npt.NDArray[np.int64],
+    columns: npt.NDArray[np.int64],
+    num_rows: int,
+    values: npt.NDArray[np.int64] | None = None,
+) -> tuple[npt.NDArray[np.int64], ...]:
+    """Return indptr, indices (and values if given) of the CSR matrix with the given cells, sorted by row and column."""
+    order = np.lexsort((columns, rows))
+    indptr = np.zeros(num_rows + 1, dtype=_INDEX)
+    np.cumsum(np.bincount(rows, minlength=num_rows), out=indptr[1:])
+    if values is None:
+        return indptr, columns[order].astype(_INDEX)
+    return indptr, columns[order].astype(_INDEX), values[order]
+
+
+def _row_pairs(
+    indptr: npt.NDArray[np.int64], indices: npt.NDArray[np.int64]
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Return all pairs (indices[p], indices[q]), p < q, of the same row, without a loop over rows.
+
+    Entry p of a row ending at e pairs with the e - p - 1 entries after it: p is repeated that many
+    times, and q runs from p + 1 within each repetition.
+    """
+    row_ends = np.repeat(indptr[1:], np.diff(indptr))
+    positions = np.arange(len(indices), dtype=_INDEX)
+    pairs_per_entry = row_ends - positions - 1
+    first_positions = np.repeat(positions, pairs_per_entry)
+    group_starts = np.repeat(np.cumsum(pairs_per_entry) - pairs_per_entry, pairs_per_entry)
+    second_positions = first_positions + 1 + np.arange(len(first_positions), dtype=_INDEX) - group_starts
+    return indices[first_positions], indices[second_positions]
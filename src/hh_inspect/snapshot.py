@@ -0,0 +1,75 @@
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Final
+
+from hh_inspect.vacancy import Vacancy
+
+
+# Fields of a search-page item that change when the vacancy is edited or republished
+_FINGERPRINT_FIELDS: Final = (
+    "name",
+    "published_at",
+    "salary_range",
+    "area",
+    "experience",
+    "schedule",
+    "employment",
+    "work_format",
+    "archived",
+)
+
+logger = logging.getLogger(__name__)
+
+
+def fingerprint_search_item(item: dict[str, Any]) -> str:
+    """Return a short hash of the search-page metadata of a vacancy."""
+    data = {key: item.get(key) for key in _FINGERPRINT_FIELDS}
+    employer = item.get("employer") or {}
+    data["employer"] = (employer.get("id"), employer.get("name"))
+    serialized = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.blake2b(serialized.encode(), digest_size=12).hexdigest()
+
+
+@dataclass
+class SnapshotEntry:
+    fingerprint: str
+    vacancy: Vacancy
+
+
+class VacancySnapshot:
+    """Vacancies of the previous run with fingerprints of their search-page items, stored as JSON."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def load(self) -> dict[str, SnapshotEntry]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            entries = {
+                row["vacancy"]["vacancy_id"]: SnapshotEntry(row["fingerprint"], Vacancy(**row["vacancy"]))
+                for row in data["vacancies"]
+            }
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Cannot read snapshot '{self.path}' ({e!r}), starting from scratch")
+            return {}
+        logger.info(f"Loaded {len(entries)} vacancies from snapshot '{self.path}'")
+        return entries
+
+    def save(self, vacancies: list[Vacancy], fingerprints: dict[str, str]) -> None:
+        rows = [
+            {"fingerprint": fingerprints[vac.vacancy_id], "vacancy": asdict(vac)}
+            for vac in vacancies
+            if vac.vacancy_id in fingerprints
+        ]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"vacancies": rows}, f, ensure_ascii=False)
+        tmp_path.replace(self.path)
+        logger.info(f"Saved {len(rows)} vacancies to snapshot '{self.path}'")
@@ -0,0 +1,166 @@
+import argparse
+import heapq
+import json
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Final, Self
+
+from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.text_stats import DEFAULT_STOPWORDS, WordCounter
+from hh_inspect.vacancy import Vacancy
+
+
+DEFAULT_CAPACITY: Final = 1000
+
+logger = logging.getLogger(__name__)
+printer = ConsolePrinter()
+
+
+class SpaceSaving:
+    """Approximate counts of the most frequent items in bounded memory (Space-Saving heavy hitters).
+
+    At most 2 * capacity items are tracked. When there are more, only the capacity most frequent ones
+    are kept, and the floor becomes the largest count dropped. A new item starts from the floor, so
+    a count is never underestimated and overestimated by at most the error of the item (<= floor).
+    Updates take amortized constant time per item.
+
+    Sketches of different runs or shards are merged, and saved to / loaded from JSON.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            msg = f"Capacity must be positive, got {capacity}"
+            raise ValueError(msg)
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self.floor = 0
+        self.total = 0
+
+    def update(self, items: Iterable[str]) -> None:
+        """Count a batch of items, e.g. the key skills of a vacancy."""
+        self.update_counts(Counter(items).items())
+
+    def update_counts(self, item_counts: Iterable[tuple[str, int]]) -> None:
+        counts, errors, floor = self.counts, self.errors, self.floor
+        for item, count in item_counts:
+            if item in counts:
+                counts[item] += count
+            else:
+                counts[item] = floor + count
+                errors[item] = floor
+            self.total += count
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def merge(self, other: "SpaceSaving") -> None:
+        """Add the counts of another sketch, an item missing in one of them may have up to its floor there."""
+        counts: dict[str, int] = {}
+        errors: dict[str, int] = {}
+        for item in self.counts | other.counts:  # keys of both in a stable order
+            counts[item] = self.counts.get(item, self.floor) + other.counts.get(item, other.floor)
+            errors[item] = self.errors.get(item, self.floor) + other.errors.get(item, other.floor)
+        self.counts, self.errors = counts, errors
+        self.floor += other.floor
+        self.total += other.total
+        self.capacity = max(self.capacity, other.capacity)
+        if len(counts) > 2 * self.capacity:
+            self._prune()
+
+    def top(self, amount: int | None = None) -> list[tuple[str, int]]:
+        """Return the most frequent items with their (over)estimated counts, the most frequent first."""
+        if amount is None:
+            return sorted(self.counts.items(), key=lambda x: x[1], reverse=True)
+        return heapq.nlargest(amount, self.counts.items(), key=lambda x: x[1])
+
+    def guaranteed_count(self, item: str) -> int:
+        """Return the number of occurrences the item surely has."""
+        return self.counts[item] - self.errors[item] if item in self.counts else 0
+
+    def _prune(self) -> None:
+        kept = {item for item, _ in heapq.nlargest(self.capacity, self.counts.items(), key=lambda x: x[1])}
+        for item in self.counts.keys() - kept:
+            self.floor = max(self.floor, self.counts.pop(item))
+            del self.errors[item]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "floor": self.floor,
+            "total": self.total,
+            "items": [[item, count, self.errors[item]] for item, count in self.top()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Self:
+        sketch = cls(data["capacity"])
+        sketch.floor = data["floor"]
+        sketch.total = data["total"]
+        for item, count, error in data["items"]:
+            sketch.counts[item] = count
+            sketch.errors[item] = error
+        return sketch
+
+
+class TopSketches:
+    """Space-Saving sketches of key skills and description words of one or more runs."""
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        show_excluded: bool = False,
+        stopwords: Iterable[str] = DEFAULT_STOPWORDS,
+    ) -> None:
+        self.show_excluded = show_excluded
+        self.stopwords = frozenset(stopwords)
+        self.key_skills = SpaceSaving(capacity)
+        self.description_words = SpaceSaving(capacity)
+
+    def add(self, vacancy: Vacancy) -> None:
+        if self.show_excluded or not vacancy.excluded:
+            self.key_skills.update(vacancy.key_skills)
+            words = WordCounter(self.stopwords)
+            words.add(vacancy.description)
+            self.description_words.update_counts(words.counts().items())
+
+    def merge(self, other: "TopSketches") -> None:
+        self.key_skills.merge(other.key_skills)
+        self.description_words.merge(other.description_words)
+
+    def print_top(self, print_amount: int = 10) -> None:
+        for title, sketch in (("Key skills", self.key_skills), ("Description", self.description_words)):
+            printer.print(f"\nThe {print_amount} most frequently used words in {title} (approximately):")
+            for key, value in sketch.top(print_amount):
+                printer.print(f"{key[:20]:20} {value}")
+
+    def save(self, path: Path) -> None:
+        logger.info(f"Saving top sketches to '{path}'...")
+        data = {"key_skills": self.key_skills.to_dict(), "description_words": self.description_words.to_dict()}
+        path.write_text(json.dumps(data, ensure_ascii=False) + "\n", encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: Path) -> Self:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        sketches = cls()
+        sketches.key_skills = SpaceSaving.from_dict(data["key_skills"])
+        sketches.description_words = SpaceSaving.from_dict(data["description_words"])
+        return sketches
+
+
+def main() -> None:
+    """Merge and print saved sketches with `python -m hh_inspect.top_k <file>...`."""
+    parser = argparse.ArgumentParser(description="The most frequent key skills and words of several runs")
+    parser.add_argument("files", type=Path, nargs="+", help="Files <output_filename>.top.json")
+    parser.add_argument("-n", "--amount", type=int, default=10)
+    args = parser.parse_args()
+
+    sketches = TopSketches()
+    for path in args.files:
+        sketches.merge(TopSketches.load(path))
+    sketches.print_top(args.amount)
+
+
+if __name__ == "__main__":
+    main()
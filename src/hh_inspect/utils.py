@@ -4,9 +4,12 @@ from collections.abc import Iterable
 from typing import Any
 
 
-def find_top_words_in_list(iterable: Iterable[str]) -> list[tuple[str, int]]:
-    words_counter = Counter(iterable)
-    return sorted(words_counter.items(), key=lambda x: x[1], reverse=True)
+def find_top_words_in_list(iterable: Iterable[str], amount: int | None = None) -> list[tuple[str, int]]:
+    """Return the amount (all if None) most frequent words, equally frequent ones in the order of appearance.
+
+    Only the top is selected with a heap instead of sorting all distinct words.
+    """
+    return Counter(iterable).most_common(amount)
 
 
 def get_field_value(obj: dict[str, Any], field1: str, field2: str) -> str:
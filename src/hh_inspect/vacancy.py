@@ -1,5 +1,5 @@
 import logging
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from typing import Any, Final
 
 from hh_inspect.settings import EXCHANGE_RATES
@@ -13,6 +13,18 @@ _TAX_RATE: Final = 0.13
 _FIX_SALARY_TO: Final = True  # If salary_to is not set, make it = salary_from * _FIX_SALARY_TO_COEF
 _FIX_SALARY_TO_COEF: Final = 1.1
 
+# Fields of Vacancy with few distinct values, stored as pandas categoricals and as dictionary-encoded Arrow columns
+CATEGORICAL_FIELDS: Final = ("region", "employer_name", "employer_city", "experience", "employment", "schedule")
+
+# fmt: off
+EXPERIENCE_LABELS: Final[dict[str, str]] = {
+    "Нет опыта": "-",
+    "От 1 года до 3 лет": "1-3 года",
+    "От 3 до 6 лет": "3-6 лет",
+    "Более 6 лет": ">6 лет"
+}
+# fmt: on
+
 # Some optional fields in models are marked according to specification at
 # https://api.hh.ru/openapi/redoc#tag/Vakansii/operation/get-vacancy
 
@@ -43,6 +55,7 @@ class Vacancy:
     vacancy_url: str
     published_at: str
     excluded: bool
+    employer_id: str = ""  # "" for anonymous employers and in files saved before it was added
 
     def __repr__(self) -> str:
         exc = "-" if self.excluded else " "
@@ -126,6 +139,11 @@ class FullVacancy:
                 return self.employer.name
             return ""
 
+        def get_employer_id() -> str:
+            if self.employer is not None and self.employer.id is not None:
+                return self.employer.id
+            return ""
+
         def get_employer_city() -> str:
             if self.address is not None and self.address.city is not None:
                 return self.address.city
@@ -157,10 +175,11 @@ class FullVacancy:
             vacancy_url=self.vacancy_url,
             published_at=get_published_date(),
             excluded=excluded,
+            employer_id=get_employer_id(),
         )
 
 
-def parse_vacancy_data(vac_json: dict[str, Any]) -> FullVacancy:  # noqa: C901
+def parse_vacancy_data(vac_json: dict[str, Any]) -> FullVacancy:
     def parse_address(data: dict[str, Any] | None) -> Address | None:
         if not data:
             return None
@@ -207,30 +226,19 @@ def parse_vacancy_data(vac_json: dict[str, Any]) -> FullVacancy:  # noqa: C901
         ]
 
     def parse_experience() -> str:
-        # fmt: off
-        dic = {
-            "Нет опыта": "-",
-            "От 1 года до 3 лет": "1-3 года",
-            "От 3 до 6 лет": "3-6 лет",
-            "Более 6 лет": ">6 лет"
-        }
-        # fmt: on
         exp = get_field_value(vac_json, "experience", "name")
-        res = dic.get(exp)
-        if res is None:
-            return ""
-        return res
+        return EXPERIENCE_LABELS.get(exp, "")
 
     return FullVacancy(
         vacancy_id=vac_json.get("id", ""),
-        vacancy_name=vac_json.get("name", ""),
+        vacancy_name=vac_json.get("name") or "",
         area=Area(
             id=vac_json["area"]["id"],
             name=vac_json["area"]["name"],
             url=vac_json["area"]["url"],
         ),
         address=parse_address(vac_json.get("address")),
-        description=vac_json.get("description", ""),
+        description=vac_json.get("description") or "",
         employer=parse_employer(vac_json.get("employer")),
         employment=get_field_value(vac_json, "employment", "name"),
         experience=parse_experience(),
@@ -245,21 +253,31 @@ def parse_vacancy_data(vac_json: dict[str, Any]) -> FullVacancy:  # noqa: C901
     )
 
 
+def parse_search_item(item: dict[str, Any]) -> FullVacancy:
+    """Parse a vacancy from the `items` of a search page.
+
+    Search items have no key skills and only a short snippet instead of the full description.
+    """
+    snippet = item.get("snippet") or {}
+    description = " ".join(text for key in ("responsibility", "requirement") if (text := snippet.get(key)))
+    return parse_vacancy_data(item | {"description": description})
+
+
 def _extract_and_calc_salary(salary_range: SalaryRange | None) -> tuple[int, int]:
     if salary_range is None:
         return (0, 0)
+    return calc_net_salary(salary_range.currency, salary_range.from_, salary_range.to, salary_range.gross)
+
 
-    salary_dict = asdict(salary_range)
-    currency: Final[str] = salary_dict.get("currency", "")
-    rate = EXCHANGE_RATES.get(currency, 1.0)
-    gross_coef = (1 - _TAX_RATE) if salary_dict.get("gross") else 1
+def calc_net_salary(currency: str | None, from_: float | None, to: float | None, gross: bool | None) -> tuple[int, int]:
+    """Return (salary_from, salary_to) in roubles after taxes."""
+    rate = EXCHANGE_RATES.get(currency or "", 1.0)
+    gross_coef = (1 - _TAX_RATE) if gross else 1
 
-    raw_value = salary_dict.get("from_")
-    salary_from_val = raw_value if raw_value is not None else 0.0
+    salary_from_val = from_ if from_ is not None else 0.0
     salary_from = int(salary_from_val * rate * gross_coef)
 
-    raw_value = salary_dict.get("to")
-    salary_to_val = raw_value if raw_value is not None else 0.0
+    salary_to_val = to if to is not None else 0.0
     salary_to = int(salary_to_val * rate * gross_coef)
 
     if salary_to == 0 and _FIX_SALARY_TO:
@@ -0,0 +1,171 @@
+import argparse
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Final
+
+from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.vacancy import Vacancy
+from hh_inspect.vacancy_output import env
+from hh_inspect.vacancy_store import RunInfo, VacancyStore
+
+
+# Parts of a vacancy reported as changed, "other" means that only the remaining fields differ
+SALARY: Final = "salary"
+DESCRIPTION: Final = "description"
+OTHER: Final = "other"
+
+_SUMMARY_FIELDS: Final = ("vacancy_id", "vacancy_name", "employer_name", "salary_from", "salary_to", "vacancy_url")
+
+logger = logging.getLogger(__name__)
+printer = ConsolePrinter()
+
+
+@dataclass
+class ChangedVacancy:
+    vacancy_id: str
+    changes: list[str]
+    old_salary: tuple[int, int]
+    new_salary: tuple[int, int]
+
+
+@dataclass
+class RunDiff:
+    """Vacancies added, removed and changed between two runs, ids are sorted."""
+
+    old_run: RunInfo
+    new_run: RunInfo
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    changed: list[ChangedVacancy] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_runs(store: VacancyStore, old_run_id: int, new_run_id: int) -> RunDiff:
+    """Compare the vacancies seen by two runs by their content hashes, in time linear in the number of vacancies."""
+    runs = {run.run_id: run for run in store.get_runs()}
+    for run_id in (old_run_id, new_run_id):
+        if run_id not in runs:
+            msg = f"There is no run {run_id} in '{store.path}'"
+            raise ValueError(msg)
+
+    old_states = store.get_run_states(old_run_id)
+    new_states = store.get_run_states(new_run_id)
+    diff = RunDiff(
+        runs[old_run_id],
+        runs[new_run_id],
+        added=sorted(new_states.keys() - old_states.keys()),
+        removed=sorted(old_states.keys() - new_states.keys()),
+    )
+    for vacancy_id in sorted(old_states.keys() & new_states.keys()):
+        old_hash, old_description, *old_salary = old_states[vacancy_id]
+        new_hash, new_description, *new_salary = new_states[vacancy_id]
+        if old_hash == new_hash:
+            continue
+        changes = [
+            part
+            for part, is_changed in (
+                (SALARY, old_salary != new_salary),
+                (DESCRIPTION, old_description != new_description),
+            )
+            if is_changed
+        ]
+        diff.changed.append(ChangedVacancy(vacancy_id, changes or [OTHER], tuple(old_salary), tuple(new_salary)))
+    return diff
+
+
+def find_previous_run(store: VacancyStore, run_id: int | None = None) -> tuple[int, int]:
+    """Return (previous run, run) ids, the previous run is the latest earlier run with the same name.
+
+    The latest run is taken if run_id is None.
+    """
+    runs = store.get_runs()
+    if run_id is None and runs:
+        run_id = runs[-1].run_id
+    run = next((run for run in runs if run.run_id == run_id), None)
+    previous = [prev for prev in runs if run is not None and prev.name == run.name and prev.run_id < run.run_id]
+    if run is None or not previous:
+        msg = f"There is nothing to compare run {run_id} with in '{store.path}'"
+        raise ValueError(msg)
+    return previous[-1].run_id, run.run_id
+
+
+def diff_to_dict(diff: RunDiff, vacancies: dict[str, Vacancy]) -> dict[str, Any]:
+    """Return the diff with a short summary of each vacancy, vacancies are the latest stored ones by id."""
+
+    def summary(vacancy_id: str) -> dict[str, Any]:
+        vacancy = vacancies.get(vacancy_id)
+        if vacancy is None:
+            return {"vacancy_id": vacancy_id}
+        return {name: getattr(vacancy, name) for name in _SUMMARY_FIELDS}
+
+    return {
+        "old_run": _run_to_dict(diff.old_run),
+        "new_run": _run_to_dict(diff.new_run),
+        "added": [summary(vacancy_id) for vacancy_id in diff.added],
+        "removed": [summary(vacancy_id) for vacancy_id in diff.removed],
+        "changed": [
+            summary(vac.vacancy_id)
+            | {"changes": vac.changes, "old_salary": list(vac.old_salary), "new_salary": list(vac.new_salary)}
+            for vac in diff.changed
+        ],
+    }
+
+
+def load_diff_vacancies(store: VacancyStore, diff: RunDiff) -> dict[str, Vacancy]:
+    return store.get_vacancies([*diff.added, *diff.removed, *(vac.vacancy_id for vac in diff.changed)])
+
+
+def save_diff_to_json(diff_dict: dict[str, Any], json_filename: Path) -> None:
+    logger.info(f"Saving the diff to '{json_filename}'...")
+    with open(json_filename, "w", encoding="utf-8") as fp:
+        fp.write(f"{json.dumps(diff_dict, ensure_ascii=False, indent=2)}\n")
+
+
+def save_diff_to_html(diff_dict: dict[str, Any], html_filename: Path) -> None:
+    template = env.get_template("diff_template.html")
+    html_output = template.render(diff_dict)
+
+    logger.info(f"Saving the diff to '{html_filename}'...")
+    with open(html_filename, "w", encoding="utf-8") as f:
+        f.write(html_output)
+
+
+def _run_to_dict(run: RunInfo) -> dict[str, Any]:
+    return {"run_id": run.run_id, "name": run.name, "started_at": run.started_at, "num_vacancies": run.num_vacancies}
+
+
+def main() -> None:
+    """Compare two stored runs with `python -m hh_inspect.vacancy_diff <database> [--old N] [--new M]`."""
+    parser = argparse.ArgumentParser(description="Show vacancies added, removed and changed between two runs")
+    parser.add_argument("database", type=Path)
+    parser.add_argument("--old", type=int, help="Run to compare with, the previous run of the same query by default")
+    parser.add_argument("--new", type=int, help="Run to compare, the latest one by default")
+    parser.add_argument("--json", type=Path, help="Save the diff to this JSON file")
+    parser.add_argument("--html", type=Path, help="Save the diff to this HTML file")
+    args = parser.parse_args()
+
+    with VacancyStore(args.database) as store:
+        old_run_id, new_run_id = (args.old, args.new) if args.old is not None else find_previous_run(store, args.new)
+        if new_run_id is None:
+            new_run_id = store.get_runs()[-1].run_id
+        diff = diff_runs(store, old_run_id, new_run_id)
+        vacancies = load_diff_vacancies(store, diff) if args.json or args.html else {}
+
+    printer.print(
+        f"Run {old_run_id} -> {new_run_id}: {len(diff.added)} added, "
+        f"{len(diff.removed)} removed, {len(diff.changed)} changed"
+    )
+    if args.json or args.html:
+        diff_dict = diff_to_dict(diff, vacancies)
+        if args.json:
+            save_diff_to_json(diff_dict, args.json)
+        if args.html:
+            save_diff_to_html(diff_dict, args.html)
+
+
+if __name__ == "__main__":
+    main()
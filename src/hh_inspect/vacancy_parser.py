@@ -0,0 +1,82 @@
+import json
+import logging
+import multiprocessing
+import time
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import batched
+from typing import Final
+
+from hh_inspect.vacancy import Vacancy, parse_vacancy_data
+
+
+try:
+    from hh_inspect import fast_parser
+except ImportError:  # msgspec is optional, without it vacancies are parsed from dicts
+    fast_parser = None  # type: ignore[assignment]
+
+
+PARSE_BATCH_SIZE: Final = 50
+
+logger = logging.getLogger(__name__)
+
+
+def parse_vacancy_body(content: bytes) -> Vacancy:
+    """Parse the raw body of a vacancy response into Vacancy (not excluded), raise ValueError if it is invalid."""
+    if fast_parser is not None:
+        return fast_parser.decode_vacancy(content)
+    return parse_vacancy_data(json.loads(content)).to_basic_vacancy()
+
+
+def _parse_batch(contents: list[bytes]) -> tuple[list[Vacancy | str], float]:
+    """Run in a worker process, return Vacancy or the reason why the body cannot be parsed and the parse time."""
+    start = time.perf_counter()
+    results: list[Vacancy | str] = []
+    for content in contents:
+        try:
+            results.append(parse_vacancy_body(content))
+        except ValueError as e:
+            results.append(type(e).__name__)
+    return results, time.perf_counter() - start
+
+
+class ParsePool:
+    """Worker processes that parse raw vacancy bodies in batches, so parsing is not limited by the GIL.
+
+    One pool serves all parse() calls of a collector, the workers are started once.
+    """
+
+    def __init__(self, num_workers: int, batch_size: int = PARSE_BATCH_SIZE) -> None:
+        self.num_workers = max(num_workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.parsed = 0  # by the last parse()
+        self.parse_seconds = 0.0  # by the last parse(), total over all workers
+        # 'spawn' is safe with the fetching threads already running and works the same on all platforms
+        self.executor = ProcessPoolExecutor(self.num_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def parse(self, contents: Iterable[bytes]) -> Iterator[Vacancy | str]:
+        """Yield the parsed bodies in their order.
+
+        Every batch is sent to the workers as soon as it is complete, and the results of finished batches
+        are yielded while the following bodies are still being produced (fetched). No more than
+        2 * num_workers batches wait for the workers, so memory stays bounded if parsing falls behind.
+        """
+        self.parsed = 0
+        self.parse_seconds = 0.0
+        futures: deque[Future[tuple[list[Vacancy | str], float]]] = deque()
+        for batch in batched(contents, self.batch_size, strict=False):
+            futures.append(self.executor.submit(_parse_batch, list(batch)))
+            while futures and (futures[0].done() or len(futures) > 2 * self.num_workers):
+                yield from self._take_results(futures.popleft())
+        while futures:
+            yield from self._take_results(futures.popleft())
+
+    def _take_results(self, future: Future[tuple[list[Vacancy | str], float]]) -> list[Vacancy | str]:
+        results, seconds = future.result()
+        self.parsed += len(results)
+        self.parse_seconds += seconds
+        return results
+
+    def close(self) -> None:
+        self.executor.shutdown(cancel_futures=True)
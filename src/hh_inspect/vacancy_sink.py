@@ -0,0 +1,72 @@
+import gzip
+import json
+import logging
+from collections.abc import Iterator
+from dataclasses import asdict
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Self
+
+from hh_inspect.vacancy import Vacancy
+
+
+logger = logging.getLogger(__name__)
+
+
+def make_jsonl_filename(output_dir: Path, output_filename: str, compress: bool) -> Path:
+    return output_dir / f"{output_filename}.jsonl{'.gz' if compress else ''}"
+
+
+class JsonLinesSink:
+    """Write vacancies one per line as they arrive, so none of them has to be kept in memory.
+
+    The file is gzip-compressed if its name ends with '.gz'. Vacancies of the previous run are overwritten.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == ".gz":
+            self._file: IO[str] = gzip.open(path, "wt", encoding="utf-8")  # noqa: SIM115 (closed in close())
+        else:
+            self._file = open(path, "w", encoding="utf-8")  # noqa: SIM115
+        logger.info(f"Streaming vacancies to '{path}'")
+
+    def write(self, vacancy: Vacancy) -> None:
+        self._file.write(f"{json.dumps(asdict(vacancy), ensure_ascii=False)}\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._file.close()
+        logger.info(f"{self.count} vacancies are saved to '{self.path}'")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+def read_vacancies_jsonl(path: Path) -> Iterator[Vacancy]:
+    """Yield vacancies from a JSON Lines file written by JsonLinesSink, one at a time."""
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = iter(f)
+        while True:
+            try:
+                line = next(lines)
+            except StopIteration:
+                return
+            except EOFError:  # a gzip file of a run killed before the sink was closed
+                logger.warning(f"'{path}' is cut off, the rest of it is skipped")
+                return
+            try:
+                vacancy = Vacancy(**json.loads(line))
+            except (ValueError, TypeError) as e:
+                # e.g. the run was killed in the middle of a write
+                logger.warning(f"Skipping broken line in '{path}' ({e!r})")
+                continue
+            yield vacancy
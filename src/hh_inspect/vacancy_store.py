@@ -0,0 +1,360 @@
+import argparse
+import hashlib
+import json
+import logging
+import sqlite3
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, fields
+from datetime import UTC, datetime
+from itertools import batched
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Final, Self
+
+from hh_inspect.console_printer import ConsolePrinter
+from hh_inspect.salary_stats import SalaryAccumulator
+from hh_inspect.settings import QueryDict
+from hh_inspect.vacancy import Vacancy
+
+
+STORE_BATCH_SIZE: Final = 500
+
+_VACANCY_FIELDS: Final = tuple(f.name for f in fields(Vacancy))
+_LIST_FIELDS: Final = frozenset({"work_format", "key_skills"})  # stored as JSON arrays
+_BOOL_FIELDS: Final = frozenset({"accredited_it", "excluded"})
+
+_SCHEMA: Final = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    query TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    num_vacancies INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS vacancies (
+    vacancy_id TEXT PRIMARY KEY,
+    region TEXT NOT NULL,
+    employer_name TEXT NOT NULL,
+    employer_city TEXT NOT NULL,
+    accredited_it INTEGER NOT NULL,
+    vacancy_name TEXT NOT NULL,
+    salary_from INTEGER NOT NULL,
+    salary_to INTEGER NOT NULL,
+    experience TEXT NOT NULL,
+    employment TEXT NOT NULL,
+    schedule TEXT NOT NULL,
+    work_format TEXT NOT NULL,
+    key_skills TEXT NOT NULL,
+    description TEXT NOT NULL,
+    vacancy_url TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    excluded INTEGER NOT NULL,
+    employer_id TEXT NOT NULL,
+    first_run_id INTEGER NOT NULL REFERENCES runs,
+    last_run_id INTEGER NOT NULL REFERENCES runs
+);
+CREATE INDEX IF NOT EXISTS vacancies_published_at ON vacancies (published_at);
+CREATE INDEX IF NOT EXISTS vacancies_employer_name ON vacancies (employer_name);
+CREATE INDEX IF NOT EXISTS vacancies_employer_id ON vacancies (employer_id);
+CREATE INDEX IF NOT EXISTS vacancies_region ON vacancies (region);
+CREATE TABLE IF NOT EXISTS run_vacancies (
+    run_id INTEGER NOT NULL REFERENCES runs,
+    vacancy_id TEXT NOT NULL REFERENCES vacancies,
+    content_hash INTEGER NOT NULL,
+    description_hash INTEGER NOT NULL,
+    salary_from INTEGER NOT NULL,
+    salary_to INTEGER NOT NULL,
+    PRIMARY KEY (run_id, vacancy_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS run_vacancies_vacancy_id ON run_vacancies (vacancy_id);
+"""
+
+# State of a vacancy as seen by a run, to compare runs without the full vacancies
+_RUN_STATE_COLUMNS: Final = ("content_hash", "description_hash", "salary_from", "salary_to")
+
+# Fields of Vacancy that make up its content, exclusion depends on settings and is not a part of it
+_CONTENT_FIELDS: Final = tuple(
+    name for name in _VACANCY_FIELDS if name not in {"vacancy_id", "description", "excluded"}
+)
+
+# Column names come from Vacancy, not from the user
+_UPSERT: Final = (
+    f"INSERT INTO vacancies ({', '.join(_VACANCY_FIELDS)}, first_run_id, last_run_id) "  # noqa: S608
+    f"VALUES ({', '.join(f':{name}' for name in _VACANCY_FIELDS)}, :run_id, :run_id) "
+    "ON CONFLICT (vacancy_id) DO UPDATE SET "
+    f"{', '.join(f'{name} = excluded.{name}' for name in _VACANCY_FIELDS if name != 'vacancy_id')}, "
+    "last_run_id = excluded.last_run_id"
+)
+
+_UPSERT_RUN_STATE: Final = (
+    f"INSERT INTO run_vacancies (run_id, vacancy_id, {', '.join(_RUN_STATE_COLUMNS)}) "  # noqa: S608
+    f"VALUES (:run_id, :vacancy_id, {', '.join(f':{name}' for name in _RUN_STATE_COLUMNS)}) "
+    "ON CONFLICT (run_id, vacancy_id) DO UPDATE SET "
+    f"{', '.join(f'{name} = excluded.{name}' for name in _RUN_STATE_COLUMNS)}"
+)
+_MAX_SQL_PARAMS: Final = 900  # below the default SQLITE_MAX_VARIABLE_NUMBER of old SQLite versions
+
+logger = logging.getLogger(__name__)
+printer = ConsolePrinter()
+
+
+@dataclass
+class RunInfo:
+    run_id: int
+    name: str
+    query: QueryDict
+    started_at: str
+    finished_at: str | None
+    num_vacancies: int
+
+
+class VacancyStore:
+    """Vacancies of all runs in a local SQLite database.
+
+    A vacancy is stored once, in its latest state, and `run_vacancies` records which runs have seen it.
+    Vacancies are indexed by id, publication date, employer and region.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")  # safe with WAL, much faster than FULL
+        self.connection.executescript(_SCHEMA)
+
+    def start_run(self, name: str, query: QueryDict) -> "RunWriter":
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (name, query, started_at) VALUES (?, ?, ?)",
+                (name, json.dumps(query, ensure_ascii=False), _now()),
+            )
+        if cursor.lastrowid is None:
+            msg = "Cannot create a run"
+            raise sqlite3.DatabaseError(msg)
+        return RunWriter(self, cursor.lastrowid)
+
+    def upsert(self, run_id: int, vacancies: Iterable[Vacancy], batch_size: int = STORE_BATCH_SIZE) -> int:
+        """Insert new vacancies or update stored ones, one transaction per batch. Return the number of vacancies."""
+        count = 0
+        batch: list[dict[str, Any]] = []
+        for vacancy in vacancies:
+            batch.append(_to_row(vacancy) | {"run_id": run_id})
+            if len(batch) >= batch_size:
+                count += self._upsert_batch(batch)
+                batch = []
+        if batch:
+            count += self._upsert_batch(batch)
+        return count
+
+    def _upsert_batch(self, rows: list[dict[str, Any]]) -> int:
+        with self.connection:
+            self.connection.executemany(_UPSERT, rows)
+            self.connection.executemany(_UPSERT_RUN_STATE, rows)
+        return len(rows)
+
+    def finish_run(self, run_id: int) -> None:
+        with self.connection:
+            self.connection.execute(
+                "UPDATE runs SET finished_at = ?, "
+                "num_vacancies = (SELECT count(*) FROM run_vacancies WHERE run_id = ?) WHERE run_id = ?",
+                (_now(), run_id, run_id),
+            )
+
+    def get_run_states(self, run_id: int) -> dict[str, tuple[int, int, int, int]]:
+        """Return vacancy id -> (content hash, description hash, salary_from, salary_to) of the run."""
+        rows = self.connection.execute(
+            f"SELECT vacancy_id, {', '.join(_RUN_STATE_COLUMNS)} FROM run_vacancies WHERE run_id = ?",  # noqa: S608
+            (run_id,),
+        )
+        return {vacancy_id: tuple(state) for vacancy_id, *state in rows}
+
+    def get_runs(self) -> list[RunInfo]:
+        rows = self.connection.execute(
+            "SELECT run_id, name, query, started_at, finished_at, num_vacancies FROM runs ORDER BY run_id"
+        )
+        return [
+            RunInfo(run_id, name, json.loads(query), started_at, finished_at, num_vacancies)
+            for run_id, name, query, started_at, finished_at, num_vacancies in rows
+        ]
+
+    def iter_vacancies(  # noqa: PLR0913
+        self,
+        run_id: int | None = None,
+        published_from: str | None = None,
+        published_to: str | None = None,
+        employer: str | None = None,
+        region: str | None = None,
+        include_excluded: bool = False,
+    ) -> Iterator[Vacancy]:
+        """Yield stored vacancies, dates are 'YYYY-MM-DD' and inclusive, employer is an exact name or id."""
+        conditions: list[str] = []
+        params: list[str | int] = []
+        if run_id is not None:
+            conditions.append("vacancy_id IN (SELECT vacancy_id FROM run_vacancies WHERE run_id = ?)")
+            params.append(run_id)
+        if published_from is not None:
+            conditions.append("published_at >= ?")
+            params.append(published_from)
+        if published_to is not None:
+            conditions.append("published_at <= ?")
+            params.append(published_to)
+        if employer is not None:
+            conditions.append("(employer_name = ? OR employer_id = ?)")
+            params.extend((employer, employer))
+        if region is not None:
+            conditions.append("region = ?")
+            params.append(region)
+        if not include_excluded:
+            conditions.append("excluded = 0")
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        cursor = self.connection.execute(
+            f"SELECT {', '.join(_VACANCY_FIELDS)} FROM vacancies{where} ORDER BY published_at DESC, vacancy_id",  # noqa: S608
+            params,
+        )
+        for row in cursor:
+            yield _from_row(row)
+
+    def load_vacancies(self, **filters: Any) -> list[Vacancy]:
+        """Return the vacancies of iter_vacancies(), e.g. to feed Analyzer."""
+        return list(self.iter_vacancies(**filters))
+
+    def get_vacancies(self, vacancy_ids: Iterable[str]) -> dict[str, Vacancy]:
+        """Return the latest state of the given vacancies."""
+        vacancies: dict[str, Vacancy] = {}
+        for batch in batched(vacancy_ids, _MAX_SQL_PARAMS, strict=False):
+            cursor = self.connection.execute(
+                f"SELECT {', '.join(_VACANCY_FIELDS)} FROM vacancies "  # noqa: S608
+                f"WHERE vacancy_id IN ({', '.join('?' * len(batch))})",
+                batch,
+            )
+            vacancies.update((vac.vacancy_id, vac) for vac in map(_from_row, cursor))
+        return vacancies
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        self.close()
+
+
+class RunWriter:
+    """Add vacancies of a run to the store one by one, they are written in batches."""
+
+    def __init__(self, store: VacancyStore, run_id: int, batch_size: int = STORE_BATCH_SIZE) -> None:
+        self.store = store
+        self.run_id = run_id
+        self.batch_size = batch_size
+        self._buffer: list[Vacancy] = []
+
+    def write(self, vacancy: Vacancy) -> None:
+        self._buffer.append(vacancy)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self.store.upsert(self.run_id, self._buffer, self.batch_size)
+        self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self.store.finish_run(self.run_id)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        """Finish the run only if it has completed, vacancies written before an error are kept anyway."""
+        if exc_type is None:
+            self.close()
+        else:
+            self.flush()
+
+
+def _to_row(vacancy: Vacancy) -> dict[str, Any]:
+    row = dict(vars(vacancy))
+    for name in _LIST_FIELDS:
+        row[name] = json.dumps(row[name], ensure_ascii=False)
+    row["content_hash"], row["description_hash"] = hash_vacancy(vacancy)
+    return row
+
+
+def hash_vacancy(vacancy: Vacancy) -> tuple[int, int]:
+    """Return signed 64-bit hashes (they fit SQLite integers) of the vacancy content and of its description."""
+    description = hashlib.blake2b(vacancy.description.encode(), digest_size=8).digest()
+    content = hashlib.blake2b(description, digest_size=8)
+    content.update(json.dumps([getattr(vacancy, name) for name in _CONTENT_FIELDS], ensure_ascii=False).encode())
+    return (
+        int.from_bytes(content.digest(), signed=True),
+        int.from_bytes(description, signed=True),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> Vacancy:
+    values = dict(zip(_VACANCY_FIELDS, row, strict=True))
+    for name in _LIST_FIELDS:
+        values[name] = json.loads(values[name])
+    for name in _BOOL_FIELDS:
+        values[name] = bool(values[name])
+    return Vacancy(**values)
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
+
+def main() -> None:
+    """Analyze stored vacancies with `python -m hh_inspect.vacancy_store <database> [filters]`."""
+    from hh_inspect.analyzer import Analyzer  # noqa: PLC0415 (pandas and matplotlib are slow to import)
+
+    parser = argparse.ArgumentParser(description="Analyze vacancies stored by HH Inspector")
+    parser.add_argument("database", type=Path)
+    parser.add_argument("--runs", action="store_true", help="List stored runs and exit")
+    parser.add_argument("--run", type=int, help="Only vacancies seen by this run")
+    parser.add_argument("--since", help="Published on or after YYYY-MM-DD")
+    parser.add_argument("--until", help="Published on or before YYYY-MM-DD")
+    parser.add_argument("--employer", help="Employer name or id")
+    parser.add_argument("--region")
+    parser.add_argument(
+        "--salaries", action="store_true", help="Only salary statistics, computed without loading the vacancies"
+    )
+    args = parser.parse_args()
+    filters = {
+        "run_id": args.run,
+        "published_from": args.since,
+        "published_to": args.until,
+        "employer": args.employer,
+        "region": args.region,
+    }
+
+    with VacancyStore(args.database) as store:
+        if args.runs:
+            for run in store.get_runs():
+                printer.print(f"{run.run_id:5} {run.started_at} {run.num_vacancies:6} {run.name}")
+            return
+        if args.salaries:
+            salaries = SalaryAccumulator()
+            for vacancy in store.iter_vacancies(**filters):
+                salaries.add(vacancy)
+            salaries.print_stats()
+            return
+        vacancies = store.load_vacancies(**filters)
+
+    printer.print(f"{len(vacancies)} vacancies")
+    if vacancies:
+        analyzer = Analyzer(vacancies)
+        analyzer.print_salary_stats()
+        analyzer.print_top_key_skills()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Final
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+
+_EXAMPLE_VACANCY: Final = Path(__file__).parent / "example_vacancy.json"
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    """Serve search pages at /vacancies/ and details at /vacancies/{id}.
+
+    Search returns `num_pages` pages with ids like "0-1", "2-15" (page-index).
+    Details are the example vacancy with the requested id, ids starting with '404' are not found,
+    ids starting with '503' always fail. The first `throttle_first` detail requests get 429.
+    Details have an ETag, requests with a matching If-None-Match get '304 Not Modified'.
+    """
+
+    protocol_version = "HTTP/1.1"
+    num_pages = 3
+    throttle_first = 0
+    lock = threading.Lock()
+    vacancy_json: dict[str, Any] = json.loads(_EXAMPLE_VACANCY.read_text(encoding="utf-8"))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        vacancy_id = url.path.rstrip("/").split("/")[-1]
+        if vacancy_id == "vacancies":
+            query = parse_qs(url.query)
+            self._send_search_page(int(query.get("page", ["0"])[0]), int(query.get("per_page", ["20"])[0]))
+        elif self._should_throttle():
+            self._send_json(429, {"errors": [{"type": "too_many_requests"}]}, {"Retry-After": "0"})
+        elif vacancy_id.startswith("404"):
+            self._send_json(404, {"errors": [{"type": "not_found"}]})
+        elif vacancy_id.startswith("503"):
+            self._send_json(503, {"errors": [{"type": "service_unavailable"}]})
+        elif self.headers.get("If-None-Match") == f'"{vacancy_id}"':
+            self.send_response(304)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(200, self.vacancy_json | {"id": vacancy_id}, {"ETag": f'"{vacancy_id}"'})
+
+    def _send_search_page(self, page: int, per_page: int) -> None:
+        items = [self.make_search_item(f"{page}-{idx}") for idx in range(per_page)] if page < self.num_pages else []
+        self._send_json(
+            200,
+            {"items": items, "found": self.num_pages * per_page, "pages": self.num_pages, "page": page},
+        )
+
+    def make_search_item(self, vacancy_id: str) -> dict[str, Any]:
+        fields = ("name", "area", "salary_range", "address", "employer", "experience", "schedule", "employment")
+        return {key: self.vacancy_json[key] for key in fields} | {
+            "id": vacancy_id,
+            "work_format": self.vacancy_json["work_format"],
+            "published_at": self.vacancy_json["published_at"],
+            "alternate_url": f"https://hh.ru/vacancy/{vacancy_id}",
+            "snippet": {"requirement": "Знание <highlighttext>Python</highlighttext>", "responsibility": None},
+        }
+
+    def _should_throttle(self) -> bool:
+        with self.lock:
+            if FakeApiHandler.throttle_first > 0:
+                FakeApiHandler.throttle_first -= 1
+                return True
+        return False
+
+    def _send_json(self, status: int, data: object, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def api_url() -> Iterator[str]:
+    """Start a local fake of api.hh.ru and return its vacancies URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/vacancies/"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,40 @@
+from hh_inspect.vacancy import Vacancy
+
+
+def create_vacancy(  # noqa: PLR0913
+    vacancy_id: str,
+    region: str = "TestRegion",
+    employer_name: str = "TestCompany",
+    employer_city: str = "City1",
+    accredited_it: bool = False,
+    vacancy_name: str = "TestVacancy",
+    salary_from: int = 0,
+    salary_to: int = 0,
+    experience: str = "from1to3",
+    employment: str = "full",
+    schedule: str = "remote",
+    work_format: list[str] = [],  # noqa: B006
+    key_skills: list[str] = [],  # noqa: B006
+    description: str = "",
+    vacancy_url: str = "http://example.com/url",
+    published_at: str = "2025-01-01",
+) -> Vacancy:
+    return Vacancy(
+        vacancy_id=vacancy_id,
+        region=region,
+        employer_name=employer_name,
+        employer_city=employer_city,
+        accredited_it=accredited_it,
+        vacancy_name=vacancy_name,
+        salary_from=salary_from,
+        salary_to=salary_to,
+        experience=experience,
+        employment=employment,
+        schedule=schedule,
+        work_format=work_format,
+        key_skills=key_skills,
+        description=description,
+        vacancy_url=vacancy_url,
+        published_at=published_at,
+        excluded=False,
+    )
@@ -1,49 +1,16 @@
 # pyright: reportUnknownMemberType = false
 # pyright: reportUnknownVariableType = false
 
+import math
+from dataclasses import fields
+from pathlib import Path
+
+import pandas as pd
 import pytest
 
 from hh_inspect.analyzer import Analyzer
 from hh_inspect.vacancy import Vacancy
-
-
-def create_vacancy(  # noqa: PLR0913
-    vacancy_id: str,
-    region: str = "TestRegion",
-    employer_name: str = "TestCompany",
-    employer_city: str = "City1",
-    accredited_it: bool = False,
-    vacancy_name: str = "TestVacancy",
-    salary_from: int = 0,
-    salary_to: int = 0,
-    experience: str = "from1to3",
-    employment: str = "full",
-    schedule: str = "remote",
-    work_format: list[str] = [],  # noqa: B006
-    key_skills: list[str] = [],  # noqa: B006
-    description: str = "",
-    vacancy_url: str = "http://example.com/url",
-    published_at: str = "2025-01-01",
-) -> Vacancy:
-    return Vacancy(
-        vacancy_id=vacancy_id,
-        region=region,
-        employer_name=employer_name,
-        employer_city=employer_city,
-        accredited_it=accredited_it,
-        vacancy_name=vacancy_name,
-        salary_from=salary_from,
-        salary_to=salary_to,
-        experience=experience,
-        employment=employment,
-        schedule=schedule,
-        work_format=work_format,
-        key_skills=key_skills,
-        description=description,
-        vacancy_url=vacancy_url,
-        published_at=published_at,
-        excluded=False,
-    )
+from tests.helpers import create_vacancy
 
 
 def test_calc_salary_stats_from() -> None:
@@ -221,3 +188,58 @@ def test_get_top_description_words_with_punctuation() -> None:
     assert ("Python", 2) in top_words
     assert ("SQL", 1) in top_words
     assert ("Pandas", 2) in top_words
+
+
+def test_save_vacancies_to_csv(tmp_path: Path) -> None:
+    vacancies = [
+        create_vacancy("1", region="Москва", salary_from=100_000, published_at="2026-03-01"),
+        create_vacancy("2", region="Москва", key_skills=["Python"], description="<p>Python</p>", published_at=""),
+    ]
+    analyzer = Analyzer(vacancies)
+    assert analyzer.working_df["region"].dtype == "category"
+    assert analyzer.working_df["salary_from"].dtype == "Int32"
+
+    path = tmp_path / "vacancies.csv"
+    analyzer.save_vacancies_to_csv(path)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == (
+        "vacancy_id,region,employer_name,employer_city,accredited_it,vacancy_name,salary_from,salary_to,"
+        "experience,employment,schedule,work_format,key_skills,description,vacancy_url,published_at,excluded,"
+        "employer_id"
+    )
+    assert lines == pd.DataFrame([vars(v) for v in vacancies]).to_csv(index=False).splitlines()
+    assert ",http://example.com/url,2026-03-01,False," in lines[1]
+
+
+def test_descriptions_are_loaded_on_demand() -> None:
+    analyzer = Analyzer([create_vacancy("1", description="Python")])
+    assert "description" not in analyzer.working_df
+    assert analyzer.get_top_description_words() == [("Python", 1)]
+    assert "description" not in analyzer.working_df
+    analyzer.load_descriptions()
+    assert list(analyzer.working_df.columns) == [f.name for f in fields(Vacancy)]
+    assert analyzer.get_memory_usage()["description"] > 0
+
+
+def test_calc_salary_stats_without_salaries() -> None:
+    stats = Analyzer([create_vacancy("1")]).get_salary_stats_for_field("salary_to")
+    assert math.isnan(stats["mean"])
+
+
+def test_get_top_description_words_html_and_cyrillic() -> None:
+    vacancies = [
+        create_vacancy("1", description="<p>Разработка на <b>Python</b></p><p>Разработка&nbsp;API</p>"),
+        create_vacancy("2", description="<ul><li>&quot;Python&quot; и back-end</li></ul>"),
+    ]
+    analyzer = Analyzer(vacancies, extra_stopwords=["back", "end"])
+    assert analyzer.get_top_description_words() == [("Разработка", 2), ("Python", 2)]
+
+
+def test_skill_cooccurrence() -> None:
+    vacancies = [
+        create_vacancy("1", key_skills=["Python", "Django"]),
+        create_vacancy("2", key_skills=["Python", "Django"]),
+        create_vacancy("3", key_skills=["Java"]),
+    ]
+    analyzer = Analyzer(vacancies)
+    assert analyzer.skill_cooccurrence.related("Django") == [("Python", 2, pytest.approx(1.5))]
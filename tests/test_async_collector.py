@@ -0,0 +1,39 @@
+import pytest
+
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, Settings
+
+
+pytest.importorskip("aiohttp")
+
+from hh_inspect.async_collector import AsyncDataCollector
+
+
+@pytest.fixture
+def settings() -> Settings:
+    return Settings(
+        filter_after=FilterAfterSettings(excluded_companies=["копыта"]),
+        general=GeneralSettings(num_workers=4, backend="asyncio", print_output_to_console=False),
+    )
+
+
+def test_async_build_vacancy_list(api_url: str, settings: Settings) -> None:
+    dc = AsyncDataCollector(settings)
+    dc.api_url = api_url
+
+    vacancies = dc.build_vacancy_list(["1", "404", "3", "4"])
+
+    assert [vac.vacancy_id for vac in vacancies] == ["1", "3", "4"]
+    assert all(vac.vacancy_name == "Инженер данных" for vac in vacancies)
+    assert all(vac.excluded for vac in vacancies)
+
+
+def test_async_and_threads_give_same_result(api_url: str, settings: Settings) -> None:
+    from hh_inspect.data_collector import DataCollector  # noqa: PLC0415
+
+    ids = [str(idx) for idx in range(20)]
+    async_dc = AsyncDataCollector(settings)
+    async_dc.api_url = api_url
+    threads_dc = DataCollector(settings)
+    threads_dc.api_url = api_url
+
+    assert async_dc.build_vacancy_list(ids) == threads_dc.build_vacancy_list(ids)
@@ -0,0 +1,114 @@
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.checkpoint import Checkpoint
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.settings import GeneralSettings, Settings
+from hh_inspect.vacancy import Vacancy
+from tests.helpers import create_vacancy
+
+
+def test_checkpoint_roundtrip(tmp_path: Path) -> None:
+    checkpoint = Checkpoint(tmp_path, flush_every=2)
+    assert checkpoint.load_ids() is None
+    assert checkpoint.load_vacancies() == {}
+
+    assert list(checkpoint.track_ids(["1", "2", "3"])) == ["1", "2", "3"]
+    checkpoint.add(create_vacancy("1"))
+    assert not checkpoint.vacancies_path.exists()  # still buffered
+    checkpoint.add(create_vacancy("2"))
+    checkpoint.add(create_vacancy("3"))
+    checkpoint.flush()
+
+    restored = Checkpoint(tmp_path)
+    assert restored.load_ids() == ["1", "2", "3"]
+    assert restored.load_vacancies() == {str(i): create_vacancy(str(i)) for i in range(1, 4)}
+
+    restored.clear()
+    assert restored.load_ids() is None
+    assert restored.load_vacancies() == {}
+
+
+def test_checkpoint_skips_broken_lines(tmp_path: Path) -> None:
+    checkpoint = Checkpoint(tmp_path, flush_every=1)
+    checkpoint.add(create_vacancy("1"))
+    with open(checkpoint.vacancies_path, "a", encoding="utf-8") as f:
+        f.write('{"vacancy_id": "2", "na')  # the process was killed in the middle of a write
+
+    assert list(checkpoint.load_vacancies()) == ["1"]
+
+
+def test_ids_are_saved_only_when_harvest_is_complete(tmp_path: Path) -> None:
+    checkpoint = Checkpoint(tmp_path)
+    ids = checkpoint.track_ids(["1", "2"])
+    next(ids)
+    assert checkpoint.load_ids() is None
+
+
+def _interrupt_collection(settings: Settings, api_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    get_vacancy_or_none = dc.get_vacancy_or_none
+
+    def patch_get_vacancy(vacancy_id: str) -> Vacancy | bytes | None:
+        if vacancy_id == "2-0":
+            msg = "interrupted"
+            raise RuntimeError(msg)
+        return get_vacancy_or_none(vacancy_id)
+
+    monkeypatch.setattr(dc, "get_vacancy_or_none", patch_get_vacancy)
+    with pytest.raises(RuntimeError, match="interrupted"):
+        dc.collect_vacancies()
+    dc.close()
+
+
+def test_resume_interrupted_collection(api_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(general=GeneralSettings(num_workers=1, checkpoint_every=4, print_output_to_console=False))
+    settings.query.per_page = 5
+    _interrupt_collection(settings, api_url, tmp_path, monkeypatch)
+
+    settings.general.resume = True
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    vacancies = dc.collect_vacancies()
+
+    assert len(vacancies) == 3 * 5
+    assert vacancies[0].vacancy_id == "0-0"
+    assert dc.session.get_stats().requests == 1 + 1  # the number of pages and the only missing vacancy
+    assert Checkpoint(tmp_path / "checkpoints" / settings.general.output_filename).load_ids() is None
+
+
+def test_resume_interrupted_collection_with_parse_workers(
+    api_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = Settings(
+        general=GeneralSettings(num_workers=1, checkpoint_every=4, parse_workers=1, print_output_to_console=False)
+    )
+    settings.query.per_page = 5
+    _interrupt_collection(settings, api_url, tmp_path, monkeypatch)
+
+    settings.general.resume = True
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    vacancies = dc.collect_vacancies()
+    requests = dc.session.get_stats().requests
+    dc.close()
+
+    assert len(vacancies) == 3 * 5
+    # The bodies fetched before the failed one were parsed and saved, the failed one and the rest are fetched again
+    assert requests == 1 + 5
+
+
+def test_resume_with_no_ids_left(api_url: str, tmp_path: Path) -> None:
+    settings = Settings(
+        general=GeneralSettings(num_workers=1, checkpoint_every=4, resume=True, print_output_to_console=False)
+    )
+    checkpoint = Checkpoint(tmp_path / "checkpoints" / settings.general.output_filename)
+    assert list(checkpoint.track_ids([])) == []
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+
+    assert dc.collect_vacancies() == []
+    assert dc.session.get_stats().requests == 1  # the saved (empty) list of ids is used, pages are not fetched again
@@ -0,0 +1,60 @@
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from hh_inspect.vacancy import CATEGORICAL_FIELDS, Vacancy
+from tests.helpers import create_vacancy
+
+
+pytest.importorskip("pyarrow")
+
+from hh_inspect.columnar_export import (
+    load_vacancies_dataframe,
+    read_vacancies_table,
+    save_vacancies_columnar,
+    vacancies_to_table,
+)
+
+
+@pytest.fixture
+def vacancies() -> list[Vacancy]:
+    return [
+        create_vacancy("1", region="Москва", key_skills=["Python", "SQL"], work_format=["REMOTE"], salary_from=100),
+        create_vacancy("2", region="Москва", key_skills=[], published_at="2026-03-01"),
+        create_vacancy("3", region="Казань", key_skills=["Go"], work_format=["ON_SITE", "HYBRID"]),
+    ]
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".arrow"])
+def test_columnar_roundtrip(tmp_path: Path, vacancies: list[Vacancy], extension: str) -> None:
+    path = tmp_path / f"vacancies{extension}"
+    save_vacancies_columnar(vacancies, path)
+
+    frame = load_vacancies_dataframe(path)
+
+    assert list(frame["vacancy_id"]) == ["1", "2", "3"]
+    assert isinstance(frame["region"].dtype, pd.CategoricalDtype)
+    assert set(frame["region"].cat.categories) == {"Москва", "Казань"}
+    assert all(isinstance(frame[name].dtype, pd.CategoricalDtype) for name in CATEGORICAL_FIELDS)
+    assert [list(skills) for skills in frame["key_skills"]] == [["Python", "SQL"], [], ["Go"]]
+    assert [list(formats) for formats in frame["work_format"]] == [["REMOTE"], [], ["ON_SITE", "HYBRID"]]
+    assert list(frame["salary_from"]) == [100, 0, 0]
+    assert frame["published_at"][1] == date(2026, 3, 1)
+
+
+def test_read_selected_columns(tmp_path: Path, vacancies: list[Vacancy]) -> None:
+    path = tmp_path / "vacancies.arrow"
+    save_vacancies_columnar(vacancies, path)
+
+    table = read_vacancies_table(path, ["vacancy_id", "key_skills"])
+
+    assert table.column_names == ["vacancy_id", "key_skills"]
+    assert table.column("key_skills").to_pylist() == [["Python", "SQL"], [], ["Go"]]
+
+
+def test_excluded_and_empty(vacancies: list[Vacancy]) -> None:
+    vacancies[0].excluded = True
+    assert vacancies_to_table(vacancies, show_excluded=False).num_rows == 2
+    assert vacancies_to_table([]).num_rows == 0
@@ -3,7 +3,7 @@ from typing import Final
 
 import pytest
 
-from hh_inspect.vacancy import FullVacancy, parse_vacancy_data
+from hh_inspect.vacancy import FullVacancy, parse_search_item, parse_vacancy_data
 
 
 @pytest.fixture
@@ -67,3 +67,21 @@ def test_convert_to_basic_vacancy(example_vacancy: FullVacancy) -> None:
     assert vac.description.startswith("<p><em><strong>Приглашаем в команду")
     assert vac.vacancy_url == "https://hh.ru/vacancy/12345"
     assert vac.published_at == "2025-05-15"
+
+
+def test_parse_search_item() -> None:
+    with open("tests/example_vacancy.json", encoding="utf-8") as f:
+        vacancy_json: Final = json.load(f)
+    del vacancy_json["description"], vacancy_json["key_skills"]
+    vacancy_json["snippet"] = {"requirement": "Знание SQL.", "responsibility": "Писать ETL."}
+
+    vac = parse_search_item(vacancy_json).to_basic_vacancy()
+
+    assert vac.vacancy_id == "12345"
+    assert vac.employer_name == "Рога и копыта"
+    assert vac.salary_from == 100000
+    assert vac.salary_to == 200000
+    assert vac.experience == "-"
+    assert vac.key_skills == []
+    assert vac.description == "Писать ETL. Знание SQL."
+    assert vac.published_at == "2025-05-15"
@@ -1,10 +1,15 @@
+import json
+from datetime import datetime, timedelta
 from typing import Final
 
 import pytest
 
+from hh_inspect import vacancy_parser
 from hh_inspect.data_collector import DataCollector
-from hh_inspect.settings import FilterAfterSettings, GeneralSettings, QuerySettings, Settings
-from hh_inspect.vacancy import Vacancy
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, QueryDict, QuerySettings, Settings
+from hh_inspect.vacancy import Vacancy, parse_vacancy_data
+from tests.conftest import FakeApiHandler
+from tests.helpers import create_vacancy
 
 
 @pytest.fixture
@@ -163,3 +168,137 @@ def test_excluded_company_filtering(monkeypatch: pytest.MonkeyPatch, settings: S
 
     vac_list: Final = dc.build_vacancy_list(["id1", "id2"])
     assert all("badcompany" not in vac.employer_name for vac in vac_list)
+
+
+def test_build_vacancy_ids_keeps_page_order(api_url: str, settings: Settings) -> None:
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    dc.query_params["per_page"] = 4
+
+    ids = list(dc._build_vacancy_ids(3))  # noqa: SLF001
+    assert ids == [f"{page}-{idx}" for page in range(3) for idx in range(4)]
+
+
+def test_collect_vacancies_pipelined(api_url: str, settings: Settings) -> None:
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    dc.query_params["per_page"] = 10
+
+    vacancies = dc.collect_vacancies()
+    assert len(vacancies) == 30
+    assert vacancies[0].vacancy_id == "0-0"
+    assert vacancies[-1].vacancy_id == "2-9"
+    assert dc.session.get_stats().requests == 1 + 3 + 30
+
+
+def test_report_dropped_ids(api_url: str, settings: Settings) -> None:
+    settings.general.max_retries = 1
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+
+    vacancies = dc.build_vacancy_list(["1", "404", "503"])
+    report = dc.get_report()
+
+    assert [vac.vacancy_id for vac in vacancies] == ["1"]
+    assert report.dropped_ids == {"404": "HTTP 404", "503": "HTTP 503"}
+    assert report.retries.retries == 1
+    assert report.connections.requests == 4
+
+
+def test_collect_vacancies_list_only(api_url: str, settings: Settings) -> None:
+    settings.general.list_only = True
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    dc.query_params["per_page"] = 100
+
+    vacancies = dc.collect_vacancies()
+    assert len(vacancies) == 300
+    assert vacancies[0].vacancy_url == "https://hh.ru/vacancy/0-0"
+    assert vacancies[0].salary_from == 100000
+    assert dc.session.get_stats().requests == 1 + 3
+
+
+def test_plan_search_pages_splits_large_query(monkeypatch: pytest.MonkeyPatch, settings: Settings) -> None:
+    settings.general.split_large_queries = True
+    dc = DataCollector(settings)
+    dc.found = 3000  # per_page is 50, so 40 pages would be needed
+
+    def patch_count_found(params: QueryDict) -> int:
+        window = datetime.fromisoformat(str(params["date_to"])) - datetime.fromisoformat(str(params["date_from"]))
+        return round(3000 * window / timedelta(days=30))
+
+    monkeypatch.setattr(dc, "_count_found", patch_count_found)
+    pages = dc._plan_search_pages(40)  # noqa: SLF001
+
+    assert len(pages) == 2 * 30
+    assert all("date_from" in params for params in pages)
+    assert [params["page"] for params in pages[:30]] == list(range(30))
+
+
+def test_plan_search_pages_small_query(settings: Settings) -> None:
+    settings.general.split_large_queries = True
+    dc = DataCollector(settings)
+    dc.found = 120
+
+    pages = dc._plan_search_pages(3)  # noqa: SLF001
+    assert [params["page"] for params in pages] == [0, 1, 2]
+    assert all("date_from" not in params for params in pages)
+
+
+def test_batch_fetches_each_vacancy_once(monkeypatch: pytest.MonkeyPatch, settings: Settings) -> None:
+    dc = DataCollector(settings)
+    requested: list[str] = []
+
+    def patch_get_vacancy(vacancy_id: str) -> Vacancy | None:
+        requested.append(vacancy_id)
+        return create_vacancy(vacancy_id)
+
+    monkeypatch.setattr(dc, "get_vacancy_or_none", patch_get_vacancy)
+    dc.set_query(settings)
+    first = dc._fetch_vacancies(["1", "2", "3"])  # noqa: SLF001
+    dc.set_query(Settings(query=QuerySettings(text="Go")))
+    second = dc._fetch_vacancies(["3", "4", "1"])  # noqa: SLF001
+
+    assert sorted(requested) == ["1", "2", "3", "4"]
+    assert [vac.vacancy_id for vac in first] == ["1", "2", "3"]
+    assert [vac.vacancy_id for vac in second] == ["3", "4", "1"]
+    assert dc.query_params["text"] == "Go"
+
+
+def test_batch_streams_each_vacancy_once(monkeypatch: pytest.MonkeyPatch, settings: Settings) -> None:
+    dc = DataCollector(settings)
+    requested: list[str] = []
+
+    def patch_get_vacancy(vacancy_id: str) -> Vacancy | None:
+        requested.append(vacancy_id)
+        return create_vacancy(vacancy_id)
+
+    monkeypatch.setattr(dc, "get_vacancy_or_none", patch_get_vacancy)
+    dc.set_query(settings)
+    first: list[str] = []
+    assert dc._stream_vacancies(["1", "2", "3"], lambda vac: first.append(vac.vacancy_id)) == 3  # noqa: SLF001
+    dc.set_query(Settings(query=QuerySettings(text="Go")))
+    second: list[str] = []
+    assert dc._stream_vacancies(["3", "4", "1"], lambda vac: second.append(vac.vacancy_id)) == 3  # noqa: SLF001
+
+    assert sorted(requested) == ["1", "2", "3", "4"]
+    assert sorted(first) == ["1", "2", "3"]
+    assert sorted(second) == ["1", "3", "4"]
+
+
+@pytest.mark.parametrize("use_fast_parser", [True, False])
+def test_handle_response_parses_body(
+    monkeypatch: pytest.MonkeyPatch, settings: Settings, use_fast_parser: bool
+) -> None:
+    if not use_fast_parser:
+        monkeypatch.setattr(vacancy_parser, "fast_parser", None)
+    elif vacancy_parser.fast_parser is None:
+        pytest.skip("msgspec is not installed")
+    dc = DataCollector(settings)
+    vacancy_json = FakeApiHandler.vacancy_json | {"employer": {"name": "Альфа-Банк"}}
+
+    vacancy = dc.handle_response("1", 200, {}, json.dumps(vacancy_json).encode(), None)
+    assert vacancy == parse_vacancy_data(vacancy_json).to_basic_vacancy(excluded=True)
+
+    assert dc.handle_response("2", 200, {}, b"<html>Bad gateway</html>", None) is None
+    assert dc.dropped_ids["2"] in {"DecodeError", "JSONDecodeError"}
@@ -0,0 +1,55 @@
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.employer_filter import EmployerFilter
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, Settings
+
+
+def test_employer_filter_matches_name_parts() -> None:
+    employer_filter = EmployerFilter(["Альфа", "he", "she", "hers", "bc"])
+
+    assert employer_filter.is_excluded("АЛЬФА-Банк")
+    assert employer_filter.is_excluded("ushers")
+    assert employer_filter.is_excluded("abcd")
+    assert not employer_filter.is_excluded("Бета")
+    assert not employer_filter.is_excluded("")
+    assert employer_filter.is_excluded("ushers")  # memoized
+
+
+def test_employer_filter_matches_same_as_substring_search() -> None:
+    names = ["рога", "ога и к", "яндекс", "abab", "bab", "a"]
+    employers = ["Рога и копыта", "Яндекс.Маркет", "xbabx", "ОГА", "b", "Сбер", "aaa"]
+    employer_filter = EmployerFilter(names)
+
+    for employer in employers:
+        expected = any(name in employer.lower() for name in names)
+        assert employer_filter.is_excluded(employer) == expected, employer
+
+
+def test_employer_filter_by_id() -> None:
+    employer_filter = EmployerFilter([], ids=["1740", 3529])
+
+    assert employer_filter
+    assert employer_filter.is_excluded("Яндекс", "1740")
+    assert employer_filter.is_excluded_item({"employer": {"id": "3529", "name": "Сбер"}})
+    assert not employer_filter.is_excluded_item({"employer": None})
+    assert not EmployerFilter([""])
+
+
+def test_excluded_employers_are_not_fetched(api_url: str) -> None:
+    settings = Settings(
+        filter_after=FilterAfterSettings(excluded_employer_ids=["55555"]),
+        general=GeneralSettings(num_workers=2, checkpoint_every=0, print_output_to_console=False),
+    )
+    settings.query.per_page = 5
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+
+    assert dc.collect_vacancies() == []
+    assert dc.session.get_stats().requests == 1 + 3  # search pages only
+
+    settings.general.show_excluded = True
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    vacancies = dc.collect_vacancies()
+
+    assert len(vacancies) == 15
+    assert all(vac.excluded and vac.employer_id == "55555" for vac in vacancies)
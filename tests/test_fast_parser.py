@@ -0,0 +1,53 @@
+import json
+from typing import Any, Final
+
+import pytest
+
+from hh_inspect.vacancy import parse_vacancy_data
+from tests.conftest import FakeApiHandler
+
+
+fast_parser = pytest.importorskip("hh_inspect.fast_parser")
+
+_EXAMPLE_VACANCY: Final = FakeApiHandler.vacancy_json
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {},
+        {"employer": None, "address": None, "salary_range": None, "experience": None},
+        {"employer": {}, "address": {"city": None}, "salary_range": {}},
+        {"employer": {"name": None, "accredited_it_employer": None}},
+        {"salary_range": {"currency": "USD", "from": 1000, "to": None, "gross": True}},
+        {"salary_range": {"currency": "EUR", "from": None, "to": 1500.5, "gross": False}},
+        {"experience": {"id": "noExperience", "name": "Нет опыта"}, "schedule": {"name": None}},
+        {"key_skills": [], "work_format": []},
+        {"name": None, "description": None},
+    ],
+)
+def test_decode_vacancy_matches_dict_parser(changes: dict[str, Any]) -> None:
+    vacancy_json = _EXAMPLE_VACANCY | changes
+    expected = parse_vacancy_data(vacancy_json).to_basic_vacancy()
+
+    assert fast_parser.decode_vacancy(json.dumps(vacancy_json).encode()) == expected
+
+
+def test_decode_vacancy_with_missing_fields() -> None:
+    vacancy_json = {"area": _EXAMPLE_VACANCY["area"]}
+    expected = parse_vacancy_data(vacancy_json).to_basic_vacancy()
+
+    assert fast_parser.decode_vacancy(json.dumps(vacancy_json).encode()) == expected
+
+
+def test_decode_vacancy_with_null_text() -> None:
+    vacancy_json = _EXAMPLE_VACANCY | {"name": None, "description": None}
+
+    vacancy = fast_parser.decode_vacancy(json.dumps(vacancy_json).encode())
+    assert (vacancy.vacancy_name, vacancy.description) == ("", "")
+
+
+@pytest.mark.parametrize("content", [b"", b"<html>Bad gateway</html>", b'{"id": "1"}', b'{"area": 1}'])
+def test_decode_vacancy_invalid(content: bytes) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        fast_parser.decode_vacancy(content)
@@ -0,0 +1,71 @@
+import pytest
+
+from hh_inspect.http_session import ConnectionStats, HttpSession, RetryStats, _parse_retry_after
+from tests.conftest import FakeApiHandler
+
+
+def test_connection_stats_reused() -> None:
+    assert ConnectionStats(requests=10, opened=3).reused == 7
+    assert ConnectionStats().reused == 0
+
+
+def test_session_settings() -> None:
+    session = HttpSession(pool_size=8)
+    assert session.pool_size == 8
+    assert "gzip" in str(session.session.headers["Accept-Encoding"])
+    assert session.get_stats() == ConnectionStats()
+
+
+def test_session_reuses_connection(api_url: str) -> None:
+    session = HttpSession(pool_size=2)
+    for idx in range(5):
+        response = session.get(f"{api_url}{idx}", timeout=5)
+        assert response.json()["id"] == str(idx)
+
+    stats = session.get_stats()
+    assert stats.requests == 5
+    assert stats.opened == 1
+    assert stats.reused == 4
+    session.close()
+
+
+def test_retry_on_throttling(monkeypatch: pytest.MonkeyPatch, api_url: str) -> None:
+    monkeypatch.setattr(FakeApiHandler, "throttle_first", 2)
+    session = HttpSession(pool_size=1, max_retries=3)
+
+    response = session.get(f"{api_url}1", timeout=5)
+    assert response.status_code == 200
+    assert session.retry_stats == RetryStats(retries=2, throttled=2)
+
+
+def test_retry_gives_up(api_url: str) -> None:
+    session = HttpSession(pool_size=1, max_retries=2)
+
+    response = session.get(f"{api_url}503", timeout=5)
+    assert response.status_code == 503
+    assert session.retry_stats.retries == 2
+    assert session.retry_stats.server_errors == 2
+
+
+def test_no_retry_on_client_error(api_url: str) -> None:
+    session = HttpSession(pool_size=1, max_retries=2)
+
+    response = session.get(f"{api_url}404", timeout=5)
+    assert response.status_code == 404
+    assert session.retry_stats == RetryStats()
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "result"),
+    [
+        (None, None),
+        ("", None),
+        ("3", 3.0),
+        ("-1", 0.0),
+        ("100500", 30.0),
+        ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+        ("garbage", None),
+    ],
+)
+def test_parse_retry_after(retry_after: str | None, result: float | None) -> None:
+    assert _parse_retry_after(retry_after) == result
@@ -0,0 +1,65 @@
+import json
+import time
+from pathlib import Path
+
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.metrics import Histogram, RunMetrics
+from hh_inspect.settings import GeneralSettings, Settings
+
+
+def test_histogram_buckets() -> None:
+    hist = Histogram()
+    for value in (0.001, 0.02, 0.02, 0.3, 60):
+        hist.observe(value)
+
+    buckets = dict(hist.cumulative())
+    assert buckets["0.005"] == 1
+    assert buckets["0.025"] == 3
+    assert buckets["0.5"] == 4
+    assert buckets["10"] == 4
+    assert buckets["+Inf"] == 5
+    assert hist.count == 5
+
+
+def test_stage_accumulates() -> None:
+    metrics = RunMetrics()
+    for _ in range(2):
+        with metrics.stage("collect"):
+            time.sleep(0.01)
+
+    assert metrics.stages["collect"] >= 0.02
+
+
+def test_prometheus_format() -> None:
+    metrics = RunMetrics()
+    metrics.observe_request("vacancy", 200, 0.03, 1000)
+    metrics.observe_request("vacancy", 429, 0.01, 50)
+    metrics.observe_retry("throttled")
+    metrics.set_value("vacancies", 1)
+
+    text = metrics.to_prometheus()
+
+    assert 'hh_inspect_requests_total{endpoint="vacancy",status="200"} 1' in text
+    assert 'hh_inspect_request_duration_seconds_bucket{endpoint="vacancy",le="0.025"} 1' in text
+    assert 'hh_inspect_request_duration_seconds_bucket{endpoint="vacancy",le="+Inf"} 2' in text
+    assert 'hh_inspect_response_bytes_total{endpoint="vacancy"} 1050' in text
+    assert 'hh_inspect_retries_total{reason="throttled"} 1' in text
+    assert "# TYPE hh_inspect_vacancies gauge" in text
+
+
+def test_collector_records_metrics(api_url: str, tmp_path: Path) -> None:
+    settings = Settings(general=GeneralSettings(num_workers=2, checkpoint_every=0, print_output_to_console=False))
+    settings.query.per_page = 5
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+
+    dc.collect_vacancies()
+    dc.metrics.save(tmp_path, "run")
+
+    data = json.loads((tmp_path / "run.metrics.json").read_text(encoding="utf-8"))
+    counts = {(item["endpoint"], item["status"]): item["count"] for item in data["requests"]}
+    assert counts == {("search", 200): 1 + 3, ("vacancy", 200): 15}
+    assert data["latency_seconds"]["vacancy"]["count"] == 15
+    assert data["bytes_received"]["vacancy"] > 0
+    assert data["parse"]["count"] == 15
+    assert (tmp_path / "run.prom").read_text(encoding="utf-8").endswith("\n")
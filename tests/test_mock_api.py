@@ -0,0 +1,59 @@
+import json
+from collections.abc import Iterator
+
+import pytest
+import requests
+
+from hh_inspect.benchmark import check_parser, run_collection
+from hh_inspect.mock_api import MockApiConfig, MockApiServer, make_sample_vacancy
+from hh_inspect.vacancy import parse_vacancy_data
+from tests.helpers import create_vacancy
+
+
+@pytest.fixture
+def server() -> Iterator[MockApiServer]:
+    server = MockApiServer(MockApiConfig(num_vacancies=120, latency=0.0, jitter=0.0))
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_mock_api_serves_search_pages_and_details(server: MockApiServer) -> None:
+    page = requests.get(server.url, params={"page": 1, "per_page": 50}, timeout=5).json()
+    vacancy = requests.get(f"{server.url}77", timeout=5).json()
+
+    assert page["found"] == 120
+    assert page["pages"] == 3
+    assert [item["id"] for item in page["items"]] == [str(idx) for idx in range(50, 100)]
+    assert vacancy["id"] == "77"
+    assert vacancy["alternate_url"] == "https://hh.ru/vacancy/77"
+    assert server.requests == 2
+
+
+def test_mock_api_throttles_and_fails() -> None:
+    server = MockApiServer(MockApiConfig(latency=0.0, jitter=0.0, throttle_rate=0.5, error_rate=0.5))
+    server.start()
+    try:
+        statuses = {requests.get(f"{server.url}1", timeout=5).status_code for _ in range(30)}
+    finally:
+        server.stop()
+
+    assert statuses == {429, 503}
+
+
+def test_run_collection_measures_every_vacancy(server: MockApiServer) -> None:
+    result = run_collection(server.url, "threads", 4)
+
+    assert result.vacancies == 120
+    assert len(result.latencies) == 120
+    assert result.dropped == 0
+    assert result.vacancies_per_second > 0
+    assert 0 < result.percentile(50) <= result.percentile(99)
+
+
+def test_check_parser_reports_the_mismatching_vacancy() -> None:
+    bodies = [json.dumps(make_sample_vacancy(str(i)), ensure_ascii=False).encode() for i in range(3)]
+    check_parser(lambda body: parse_vacancy_data(json.loads(body)).to_basic_vacancy(), bodies)
+
+    with pytest.raises(RuntimeError, match="vacancy 0"):
+        check_parser(lambda body: create_vacancy(json.loads(body)["id"]), bodies)
@@ -0,0 +1,58 @@
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from itertools import pairwise
+
+import pytest
+
+from hh_inspect.query_planner import QueryPlanner, SubQuery
+from hh_inspect.settings import QueryDict
+
+
+_START = datetime(2025, 5, 1, tzinfo=UTC)
+_END = _START + timedelta(days=30)
+
+
+def make_counter(per_day: int) -> tuple[list[QueryDict], Callable[[QueryDict], int]]:
+    requests: list[QueryDict] = []
+
+    def count(params: QueryDict) -> int:
+        requests.append(params)
+        date_from = datetime.fromisoformat(str(params["date_from"]))
+        date_to = datetime.fromisoformat(str(params["date_to"]))
+        return int((date_to - date_from).total_seconds() / 86400 * per_day)
+
+    return requests, count
+
+
+def test_small_query_is_not_split() -> None:
+    requests, count = make_counter(per_day=10)
+    sub_queries = QueryPlanner(count).plan({"text": "Python"}, _START, _END)
+
+    assert len(requests) == 1
+    assert len(sub_queries) == 1
+    assert sub_queries[0].params["text"] == "Python"
+    assert sub_queries[0].found == 300
+
+
+def test_large_query_is_split_into_disjoint_windows() -> None:
+    _, count = make_counter(per_day=500)
+    sub_queries = QueryPlanner(count, max_workers=4).plan({"text": "Python"}, _START, _END)
+
+    assert len(sub_queries) == 8
+    assert all(sub_query.found <= 2000 for sub_query in sub_queries)
+    windows = [(str(sq.params["date_from"]), str(sq.params["date_to"])) for sq in sub_queries]
+    assert windows[0][1] == _END.isoformat()
+    assert windows[-1][0] == _START.isoformat()
+    for newer, older in pairwise(windows):
+        assert datetime.fromisoformat(older[1]) + timedelta(seconds=1) == datetime.fromisoformat(newer[0])
+
+
+def test_window_too_small_to_split() -> None:
+    sub_queries = QueryPlanner(lambda _: 5000).plan({}, _START, _START + timedelta(seconds=30))
+    assert len(sub_queries) == 1
+    assert sub_queries[0].found == 5000
+
+
+@pytest.mark.parametrize(("found", "per_page", "pages"), [(0, 20, 0), (1, 20, 1), (1999, 100, 20), (5000, 100, 20)])
+def test_sub_query_num_pages(found: int, per_page: int, pages: int) -> None:
+    assert SubQuery({}, found).num_pages(per_page) == pages
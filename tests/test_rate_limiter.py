@@ -0,0 +1,32 @@
+import time
+
+import pytest
+
+from hh_inspect.rate_limiter import TokenBucket
+
+
+def test_unlimited_bucket_never_waits() -> None:
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.reserve() == 0 for _ in range(1000))
+
+
+def test_bucket_allows_burst_then_waits() -> None:
+    bucket = TokenBucket(rate=10, capacity=3)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(0.1, abs=0.01)
+    assert waits[4] == pytest.approx(0.2, abs=0.01)
+
+
+def test_bucket_refills_over_time() -> None:
+    bucket = TokenBucket(rate=100, capacity=1)
+    assert bucket.reserve() == 0
+    time.sleep(0.02)
+    assert bucket.reserve() == 0
+
+
+def test_pause_holds_all_requests() -> None:
+    bucket = TokenBucket(rate=0)
+    bucket.pause(0.5)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
+    assert bucket.reserve() == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,100 @@
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.response_cache import CacheEntry, CacheStats, ResponseCache
+from hh_inspect.settings import GeneralSettings, Settings
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ResponseCache:
+    return ResponseCache(tmp_path / "cache", ttl=60, max_size=1_000_000)
+
+
+def test_get_missing(cache: ResponseCache) -> None:
+    assert cache.get("123") is None
+    assert cache.stats.misses == 1
+
+
+def test_put_and_get(cache: ResponseCache) -> None:
+    cache.put("123", {"id": "123", "name": "Вакансия"}, etag='"abc"')
+    entry = cache.get("123")
+
+    assert entry is not None
+    assert entry.body == {"id": "123", "name": "Вакансия"}
+    assert entry.conditional_headers() == {"If-None-Match": '"abc"'}
+    assert cache.is_fresh(entry)
+    assert cache.is_fresh(entry)
+    assert cache.stats == CacheStats()
+    assert cache.use(entry) == entry.body
+    assert cache.stats == CacheStats(hits=1)
+
+
+def test_stale_entry(cache: ResponseCache) -> None:
+    entry = CacheEntry(body={}, etag=None, last_modified="Wed, 21 Oct 2015 07:28:00 GMT", fetched_at=time.time() - 61)
+    assert not cache.is_fresh(entry)
+    assert entry.conditional_headers() == {"If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT"}
+
+    cache.refresh("1", entry)
+    assert cache.is_fresh(entry)
+    assert cache.stats.revalidated == 1
+
+
+def test_unsafe_key_is_hashed(cache: ResponseCache) -> None:
+    cache.put("../escape", {"id": "x"})
+    assert not (cache.cache_dir.parent / "escape.json").exists()
+    assert cache.get("../escape") is not None
+
+
+def test_broken_entry_is_ignored(cache: ResponseCache) -> None:
+    (cache.cache_dir / "1.json").write_text("{not json", encoding="utf-8")
+    assert cache.get("1") is None
+
+
+def test_prune_evicts_least_recently_used(cache: ResponseCache) -> None:
+    for idx in range(5):
+        cache.put(str(idx), {"text": "x" * 100})
+        os.utime(cache.cache_dir / f"{idx}.json", (idx, idx))
+    cache.get("0")  # "0" becomes the most recently used
+    cache.max_size = sum((cache.cache_dir / f"{key}.json").stat().st_size for key in ("0", "3", "4"))
+
+    assert cache.prune() == 2
+    assert sorted(path.stem for path in cache.cache_dir.iterdir()) == ["0", "3", "4"]
+
+
+def test_collector_uses_cache(api_url: str, tmp_path: Path) -> None:
+    settings = Settings(general=GeneralSettings(use_cache=True, print_output_to_console=False))
+    ids = ["1", "2", "3"]
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    first = dc.build_vacancy_list(ids)
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    second = dc.build_vacancy_list(ids)
+
+    assert first == second
+    assert dc.session.get_stats().requests == 0
+    assert dc.cache is not None
+    assert dc.cache.stats.hits == 3
+
+
+def test_collector_revalidates_stale_entries(api_url: str, tmp_path: Path) -> None:
+    settings = Settings(general=GeneralSettings(use_cache=True, cache_ttl_hours=0, print_output_to_console=False))
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    first = dc.build_vacancy_list(["1", "2"])
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    second = dc.build_vacancy_list(["1", "2"])
+
+    assert first == second
+    assert dc.session.get_stats().requests == 2
+    assert dc.cache is not None
+    assert dc.cache.stats.revalidated == 2
@@ -0,0 +1,83 @@
+# pyright: reportUnknownMemberType = false
+
+import math
+import time
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.analyzer import Analyzer
+from hh_inspect.salary_cube import SalaryCube, make_salary_column
+from tests.helpers import create_vacancy
+
+
+@pytest.fixture
+def cube() -> SalaryCube:
+    vacancies = [
+        create_vacancy("1", experience="noExperience", key_skills=["Python", "SQL"], salary_from=100, salary_to=200),
+        create_vacancy("2", experience="noExperience", key_skills=["Python"], salary_from=300),
+        create_vacancy("3", experience="between1And3", key_skills=["Python"], salary_to=500),
+        create_vacancy("4", experience="between1And3", key_skills=["Go"]),
+        create_vacancy("5", experience="between1And3", key_skills=[], salary_from=700, region="Казань"),
+    ]
+    return Analyzer(vacancies).salary_cube
+
+
+def test_make_salary_column(cube: SalaryCube) -> None:
+    df = Analyzer([create_vacancy("1", salary_from=100, salary_to=200), create_vacancy("2")]).working_df
+    salary = make_salary_column(df).to_list()
+    assert salary[0] == 150
+    assert math.isnan(salary[1])
+
+
+def test_salary_cube_query(cube: SalaryCube) -> None:
+    assert cube.query(key_skills="Python", experience="noExperience") == {
+        "count": 2,
+        "mean": 225,
+        "p25": 187.5,
+        "median": 225,
+        "p75": 262.5,
+    }
+    python = cube.query(key_skills="Python")
+    assert python is not None
+    assert (python["count"], python["median"]) == (3, 300)
+    assert cube.query(key_skills="Go") is None
+    assert cube.query(experience="between1And3") == pytest.approx(
+        {"count": 2, "mean": 600, "p25": 550, "median": 600, "p75": 650}
+    )
+    assert cube.query(region="Казань", experience="between1And3") is not None  # built on demand
+    with pytest.raises(ValueError, match="Unknown dimensions"):
+        cube.query(salary="1")
+
+
+def test_salary_cube_top_and_roundtrip(cube: SalaryCube, tmp_path: Path) -> None:
+    assert cube.top("key_skills", amount=1).index.to_list() == ["Python"]
+    cube.save(tmp_path / "cube.json")
+    loaded = SalaryCube.load(tmp_path / "cube.json")
+    assert loaded.query(experience="noExperience", key_skills="SQL") == cube.query(
+        key_skills="SQL", experience="noExperience"
+    )
+    with pytest.raises(KeyError, match="not precomputed"):
+        loaded.query(schedule="remote", employer_name="TestCompany")
+
+
+EXPERIENCE = ("noExperience", "between1And3", "between3And6", "moreThan6")
+
+
+def test_salary_cube_is_fast() -> None:
+    vacancies = [
+        create_vacancy(
+            str(i),
+            experience=EXPERIENCE[i % 4],
+            region=f"Region {i % 80}",
+            employer_name=f"Employer {i % 3000}",
+            key_skills=[f"Skill {i % 500}", f"Skill {i % 37}", "Python"],
+            salary_from=100_000 + i % 200 * 1000,
+        )
+        for i in range(100_000)
+    ]
+    cube = Analyzer(vacancies).salary_cube
+    start = time.perf_counter()
+    for i in range(100):
+        assert cube.query(key_skills=f"Skill {i}", experience=EXPERIENCE[i % 4]) is not None
+    assert (time.perf_counter() - start) / 100 < 0.01
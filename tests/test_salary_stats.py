@@ -0,0 +1,66 @@
+import math
+import random
+import statistics
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.salary_stats import QuantileSketch, SalaryAccumulator, SalaryStats
+from tests.helpers import create_vacancy
+
+
+def test_sketch_quantiles_within_relative_accuracy() -> None:
+    rng = random.Random(7)
+    values = [rng.lognormvariate(12, 0.5) for _ in range(20_000)]
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    for value in values:
+        sketch.add(value)
+
+    exact = statistics.quantiles(values, n=10, method="inclusive")
+    for i, q in enumerate((0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9)):
+        assert sketch.quantile(q) == pytest.approx(exact[i], rel=0.02)
+    assert len(sketch.buckets) < 300
+
+
+def test_sketch_merge_and_roundtrip() -> None:
+    first, second, both = QuantileSketch(), QuantileSketch(), QuantileSketch()
+    for value in range(1000, 100_000, 100):
+        (first if value % 3 else second).add(value)
+        both.add(value)
+    first.merge(QuantileSketch.from_dict(second.to_dict()))
+    assert first.buckets == both.buckets
+    assert first.quantile(0.5) == both.quantile(0.5)
+
+    with pytest.raises(ValueError, match="Cannot merge"):
+        first.merge(QuantileSketch(relative_accuracy=0.05))
+    with pytest.raises(ValueError, match="positive"):
+        first.add(0)
+    assert math.isnan(QuantileSketch().quantile(0.5))
+
+
+def test_salary_stats() -> None:
+    stats = SalaryStats()
+    for value in (0, 100_000, 150_000, 200_000):
+        stats.add(value)
+    summary = stats.summary()
+    assert (summary["count"], summary["min"], summary["max"]) == (3, 100_000, 200_000)
+    assert summary["mean"] == pytest.approx(150_000)
+    assert summary["median"] == pytest.approx(150_000, rel=0.01)
+    assert summary["p10"] >= 100_000
+    assert summary["p90"] <= 200_000
+    assert math.isnan(SalaryStats().summary()["mean"])
+
+
+def test_salary_accumulator_merges_saved_runs(tmp_path: Path) -> None:
+    first, second = SalaryAccumulator(), SalaryAccumulator()
+    first.add(create_vacancy("1", salary_from=100_000, salary_to=150_000))
+    second.add(create_vacancy("2", salary_from=200_000))
+    excluded = create_vacancy("3", salary_from=1)
+    excluded.excluded = True
+    second.add(excluded)
+    second.save(tmp_path / "second.salary.json")
+
+    first.merge(SalaryAccumulator.load(tmp_path / "second.salary.json"))
+    salary_from = first.stats["salary_from"]
+    assert (salary_from.count, salary_from.min, salary_from.max, salary_from.mean) == (2, 100_000, 200_000, 150_000)
+    assert first.stats["salary_to"].count == 1
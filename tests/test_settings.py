@@ -1,7 +1,7 @@
 import pytest
 from pydantic import ValidationError
 
-from hh_inspect.settings import FilterAfterSettings, GeneralSettings, QuerySettings, Settings
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, QuerySettings, Settings, _parse_args
 
 
 def test_default_settings() -> None:
@@ -91,3 +91,47 @@ def test_regular_settings() -> None:
     assert st.general.print_output_to_console is False
     assert st.general.save_results_to_json is False
     assert st.general.save_results_to_csv is True
+
+
+def test_named_queries_inherit_base_query() -> None:
+    st = Settings.model_validate(
+        {
+            "query": {"text": "Python", "area": ["2"], "per_page": 100},
+            "queries": {"go": {"text": "Go"}, "data": {"area": ["1"]}, "same": None},
+            "general": {"output_filename": "vac"},
+        }
+    )
+    batch = st.split_queries()
+
+    assert batch["go"].query.text == "Go"
+    assert batch["go"].query.area == ["2"]
+    assert batch["data"].query.text == "Python"
+    assert batch["data"].query.area == ["1"]
+    assert batch["same"].query == st.query
+    assert all(settings.query.per_page == 100 for settings in batch.values())
+
+
+def test_named_queries_inherit_cli_arguments() -> None:
+    st = Settings.model_validate({"queries": {"go": {"text": "Go"}, "remote": {"work_format": ["REMOTE"]}}})
+    _parse_args(st, ["--text", "Rust"])
+    batch = st.split_queries()
+
+    assert batch["go"].query.text == "Go"
+    assert batch["remote"].query.text == "Rust"
+    assert batch["remote"].query.work_format == ["REMOTE"]
+
+
+def test_split_queries() -> None:
+    st = Settings.model_validate({"queries": {"go": {"text": "Go"}, "rust": {"text": "Rust"}}})
+    batch = st.split_queries()
+
+    assert list(batch) == ["go", "rust"]
+    assert batch["go"].query.text == "Go"
+    assert batch["go"].general.output_filename == "vacancies_go"
+    assert batch["rust"].general.output_filename == "vacancies_rust"
+    assert st.general.output_filename == "vacancies"
+
+
+def test_split_queries_single_query() -> None:
+    st = Settings()
+    assert st.split_queries() == {"": st}
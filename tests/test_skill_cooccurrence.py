@@ -0,0 +1,65 @@
+import itertools
+import math
+import random
+from collections import Counter
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from hh_inspect.skill_cooccurrence import SkillCooccurrence
+
+
+@pytest.fixture
+def cooccurrence() -> SkillCooccurrence:
+    return SkillCooccurrence(
+        [
+            ["Python", "Django", "SQL"],
+            ["Python", "Django"],
+            ["Python", "SQL", "SQL"],
+            ["Java", "Spring"],
+            ["Java", "Spring", "SQL"],
+            [],
+        ]
+    )
+
+
+def test_counts(cooccurrence: SkillCooccurrence) -> None:
+    assert cooccurrence.num_vacancies == 6
+    assert cooccurrence.skill_count("SQL") == 3
+    assert cooccurrence.pair_count("Python", "Django") == 2
+    assert cooccurrence.pair_count("SQL", "Python") == 2
+    assert cooccurrence.pair_count("Django", "Java") == 0
+    assert cooccurrence.pair_count("Python", "Go") == 0
+    assert cooccurrence.num_pairs == 6
+
+
+def test_related(cooccurrence: SkillCooccurrence) -> None:
+    related = cooccurrence.related("Python", min_count=1)
+    assert [skill for skill, _, _ in related] == ["Django", "SQL"]
+    assert related[0][1:] == (2, pytest.approx(6 * 2 / (3 * 2)))
+    assert cooccurrence.related("Java", score="pmi", min_count=1)[0] == ("Spring", 2, pytest.approx(math.log2(3)))
+    assert cooccurrence.related("Java") == [("Spring", 2, pytest.approx(3))]
+    assert cooccurrence.related("Go") == []
+
+
+def test_export(cooccurrence: SkillCooccurrence, tmp_path: Path) -> None:
+    cooccurrence.save_pairs(tmp_path / "pairs.csv", min_count=2)
+    pairs = pd.read_csv(tmp_path / "pairs.csv")
+    assert set(zip(pairs["skill_a"], pairs["skill_b"], strict=True)) == {
+        ("Python", "Django"),
+        ("Python", "SQL"),
+        ("Java", "Spring"),
+    }
+
+
+def test_matches_pairwise_counting() -> None:
+    rng = random.Random(3)
+    skill_lists = [rng.sample([f"skill{i}" for i in range(40)], rng.randint(0, 8)) for _ in range(2000)]
+    expected = Counter(frozenset(pair) for skills in skill_lists for pair in itertools.combinations(skills, 2))
+
+    cooccurrence = SkillCooccurrence(skill_lists)
+    assert cooccurrence.num_pairs == len(expected)
+    for pair, count in expected.items():
+        first, second = sorted(pair)
+        assert cooccurrence.pair_count(first, second) == count
@@ -0,0 +1,66 @@
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, Settings
+from hh_inspect.snapshot import VacancySnapshot, fingerprint_search_item
+from tests.conftest import FakeApiHandler
+
+
+def test_fingerprint_depends_on_metadata() -> None:
+    item = {"id": "1", "name": "Dev", "published_at": "2025-01-01", "employer": {"id": "7", "name": "Co"}}
+
+    assert fingerprint_search_item(item) == fingerprint_search_item(item | {"snippet": {"requirement": "..."}})
+    assert fingerprint_search_item(item) != fingerprint_search_item(item | {"published_at": "2025-01-02"})
+    assert fingerprint_search_item(item) != fingerprint_search_item(item | {"employer": {"id": "8", "name": "Co"}})
+
+
+def test_snapshot_missing_or_broken(tmp_path: Path) -> None:
+    snapshot = VacancySnapshot(tmp_path / "snapshot.json")
+    assert snapshot.load() == {}
+
+    snapshot.path.write_text('{"vacancies": [{"oops": 1}]}', encoding="utf-8")
+    assert snapshot.load() == {}
+
+
+def test_incremental_collection(api_url: str, tmp_path: Path) -> None:
+    settings = Settings(
+        filter_after=FilterAfterSettings(excluded_companies=[]),
+        general=GeneralSettings(num_workers=2, incremental=True, show_excluded=True, print_output_to_console=False),
+    )
+    settings.query.per_page = 5
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    first = dc.collect_vacancies()
+    first_requests = dc.session.get_stats().requests
+
+    settings.filter_after.excluded_companies = ["копыта"]
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    second = dc.collect_vacancies()
+
+    assert len(first) == len(second) == 3 * 5
+    assert first_requests == 1 + 3 + 15
+    assert dc.session.get_stats().requests == 1 + 3  # search pages only
+    assert [vac.vacancy_id for vac in first] == [vac.vacancy_id for vac in second]
+    assert all(vac.excluded for vac in second)  # exclusion is re-evaluated for reused vacancies
+
+
+def test_incremental_fetches_changed(api_url: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    settings = Settings(general=GeneralSettings(incremental=True, print_output_to_console=False))
+    settings.query.per_page = 2
+
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    dc.collect_vacancies()
+
+    vacancy_json = FakeApiHandler.vacancy_json | {"published_at": "2030-01-01T00:00:00+0300"}
+    monkeypatch.setattr(FakeApiHandler, "vacancy_json", vacancy_json)
+    dc = DataCollector(settings, tmp_path)
+    dc.api_url = api_url
+    vacancies = dc.collect_vacancies()
+
+    assert dc.session.get_stats().requests == 1 + 3 + 6
+    assert all(vac.published_at == "2030-01-01" for vac in vacancies)
@@ -0,0 +1,14 @@
+from hh_inspect.text_stats import WordCounter
+
+
+def test_word_counter() -> None:
+    counter = WordCounter(stopwords=["и", "the"])
+    counter.update(["Python и SQL", "The Python, the Go", "Ёлка 2026 1С year_end И"])
+    assert counter.most_common(2) == [("Python", 2), ("SQL", 1)]
+    assert {word for word, _ in counter.most_common()} == {"Python", "SQL", "Go", "Ёлка", "1С", "year_end"}
+
+
+def test_word_counter_skips_html() -> None:
+    counter = WordCounter(stopwords=[])
+    counter.add("<p class='x'>Разработка&nbsp;сервисов</p><ul><li>&quot;Python&quot;&#8212;</li></ul>")
+    assert counter.most_common() == [("Разработка", 1), ("сервисов", 1), ("Python", 1)]
@@ -0,0 +1,55 @@
+import random
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.top_k import SpaceSaving, TopSketches
+from tests.helpers import create_vacancy
+
+
+def _zipf_items(num_items: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [f"skill{int(rng.paretovariate(1.2))}" for _ in range(num_items)]
+
+
+def test_space_saving_finds_heavy_hitters() -> None:
+    items = _zipf_items(50_000, seed=1)
+    sketch = SpaceSaving(capacity=50)
+    for i in range(0, len(items), 7):
+        sketch.update(items[i : i + 7])
+
+    exact = Counter(items)
+    assert len(sketch.counts) <= 100
+    assert [item for item, _ in sketch.top(10)] == [item for item, _ in exact.most_common(10)]
+    for item, count in sketch.top():
+        assert sketch.guaranteed_count(item) <= exact[item] <= count
+    assert sketch.total == len(items)
+
+
+def test_space_saving_merge_and_roundtrip() -> None:
+    items = _zipf_items(20_000, seed=2)
+    first, second = SpaceSaving(capacity=30), SpaceSaving(capacity=30)
+    first.update(items[:10_000])
+    second.update(items[10_000:])
+    first.merge(SpaceSaving.from_dict(second.to_dict()))
+
+    exact = Counter(items)
+    assert [item for item, _ in first.top(5)] == [item for item, _ in exact.most_common(5)]
+    for item, count in first.top():
+        assert first.guaranteed_count(item) <= exact[item] <= count
+
+    with pytest.raises(ValueError, match="positive"):
+        SpaceSaving(capacity=0)
+
+
+def test_top_sketches(tmp_path: Path) -> None:
+    sketches = TopSketches()
+    sketches.add(create_vacancy("1", key_skills=["Python", "SQL"], description="<p>Python и Django</p>"))
+    sketches.add(create_vacancy("2", key_skills=["Python"], description="Python"))
+    sketches.save(tmp_path / "run.top.json")
+
+    merged = TopSketches.load(tmp_path / "run.top.json")
+    merged.merge(sketches)
+    assert merged.key_skills.top(1) == [("Python", 4)]
+    assert merged.description_words.top() == [("Python", 4), ("Django", 2)]
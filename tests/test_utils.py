@@ -20,6 +20,12 @@ def test_find_top_words_in_list(iterable: Iterable[str], result: list[tuple[str,
     assert find_top_words_in_list(iterable) == result
 
 
+def test_find_top_words_in_list_amount() -> None:
+    words = ["c", "a", "b", "b", "a", "d", "b"]
+    assert find_top_words_in_list(words, 2) == [("b", 3), ("a", 2)]
+    assert find_top_words_in_list(words, 3) == [("b", 3), ("a", 2), ("c", 1)]
+
+
 @pytest.mark.parametrize(
     ("obj", "field1", "field2", "result"),
     [
@@ -0,0 +1,81 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.vacancy_diff import (
+    diff_runs,
+    diff_to_dict,
+    find_previous_run,
+    load_diff_vacancies,
+    save_diff_to_html,
+    save_diff_to_json,
+)
+from hh_inspect.vacancy_store import VacancyStore
+from tests.helpers import create_vacancy
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> VacancyStore:
+    store = VacancyStore(tmp_path / "vacancies.db")
+    with store.start_run("python", {}) as run:
+        store.upsert(
+            run.run_id,
+            [
+                create_vacancy("1", salary_from=100),
+                create_vacancy("2"),
+                create_vacancy("3", key_skills=["SQL"]),
+                create_vacancy("4"),
+            ],
+        )
+    with store.start_run("java", {}) as run:
+        store.upsert(run.run_id, [create_vacancy("9")])
+    with store.start_run("python", {}) as run:
+        new_description = create_vacancy("2")
+        new_description.description = "Новое описание"
+        store.upsert(
+            run.run_id,
+            [
+                create_vacancy("1", salary_from=200),
+                new_description,
+                create_vacancy("3", key_skills=["SQL", "Python"]),
+                create_vacancy("5"),
+            ],
+        )
+    return store
+
+
+def test_diff_runs(store: VacancyStore) -> None:
+    assert find_previous_run(store) == (1, 3)
+    diff = diff_runs(store, 1, 3)
+
+    assert diff.added == ["5"]
+    assert diff.removed == ["4"]
+    assert {vac.vacancy_id: vac.changes for vac in diff.changed} == {
+        "1": ["salary"],
+        "2": ["description"],
+        "3": ["other"],
+    }
+    assert diff.changed[0].old_salary == (100, 0)
+    assert diff.changed[0].new_salary == (200, 0)
+    assert not diff_runs(store, 3, 3)
+
+
+def test_find_previous_run_fails_without_previous_run(store: VacancyStore) -> None:
+    with pytest.raises(ValueError, match="nothing to compare"):
+        find_previous_run(store, 2)
+    with pytest.raises(ValueError, match="no run 7"):
+        diff_runs(store, 1, 7)
+
+
+def test_save_diff(store: VacancyStore, tmp_path: Path) -> None:
+    diff = diff_runs(store, 1, 3)
+    diff_dict = diff_to_dict(diff, load_diff_vacancies(store, diff))
+    save_diff_to_json(diff_dict, tmp_path / "diff.json")
+    save_diff_to_html(diff_dict, tmp_path / "diff.html")
+
+    saved = json.loads((tmp_path / "diff.json").read_text(encoding="utf-8"))
+    assert saved["new_run"]["run_id"] == 3
+    assert [vac["vacancy_id"] for vac in saved["removed"]] == ["4"]
+    assert saved["changed"][0]["new_salary"] == [200, 0]
+    assert "Изменённые" in (tmp_path / "diff.html").read_text(encoding="utf-8")
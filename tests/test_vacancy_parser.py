@@ -0,0 +1,77 @@
+import json
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.settings import FilterAfterSettings, GeneralSettings, Settings
+from hh_inspect.vacancy import parse_vacancy_data
+from hh_inspect.vacancy_parser import ParsePool, parse_vacancy_body
+from tests.conftest import FakeApiHandler
+
+
+def test_parse_vacancy_body() -> None:
+    vacancy = parse_vacancy_body(json.dumps(FakeApiHandler.vacancy_json).encode())
+    assert vacancy == parse_vacancy_data(FakeApiHandler.vacancy_json).to_basic_vacancy()
+
+    with pytest.raises(ValueError):  # noqa: PT011
+        parse_vacancy_body(b"<html>Bad gateway</html>")
+
+
+def test_parse_pool_keeps_order() -> None:
+    contents = [json.dumps(FakeApiHandler.vacancy_json | {"id": str(i)}).encode() for i in range(7)]
+    contents.insert(3, b"not json")
+
+    pool = ParsePool(2, batch_size=3)
+    try:
+        results = list(pool.parse(iter(contents)))
+    finally:
+        pool.close()
+
+    assert isinstance(results[3], str)
+    assert [vac.vacancy_id for vac in results if not isinstance(vac, str)] == [str(i) for i in range(7)]
+
+
+def test_parse_pool_yields_parsed_batches_before_the_end_of_input() -> None:
+    content = json.dumps(FakeApiHandler.vacancy_json).encode()
+    produced: list[bytes] = []
+
+    def slow_contents() -> Iterator[bytes]:
+        for _ in range(10_000):
+            time.sleep(0.001)
+            produced.append(content)
+            yield content
+
+    pool = ParsePool(1, batch_size=2)
+    try:
+        first = next(pool.parse(slow_contents()))
+    finally:
+        pool.close()
+
+    assert not isinstance(first, str)
+    assert len(produced) < 10_000
+
+
+def test_collect_vacancies_with_parse_workers(api_url: str) -> None:
+    settings = Settings(
+        filter_after=FilterAfterSettings(excluded_companies=["копыта"]),
+        general=GeneralSettings(num_workers=4, show_excluded=True, print_output_to_console=False),
+    )
+    settings.query.per_page = 10
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    expected = dc.collect_vacancies()
+
+    settings.general.parse_workers = 2
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    vacancies = dc.collect_vacancies()
+    pool = dc.parse_pool
+    assert dc.collect_vacancies() == vacancies
+    assert dc.parse_pool is pool  # the workers are started once per collector
+    dc.close()
+
+    assert len(vacancies) == 30
+    assert vacancies == expected
+    assert all(vac.excluded for vac in vacancies)
@@ -0,0 +1,83 @@
+import gzip
+from pathlib import Path
+
+import pytest
+
+from hh_inspect.data_collector import DataCollector
+from hh_inspect.settings import GeneralSettings, Settings
+from hh_inspect.vacancy_sink import JsonLinesSink, make_jsonl_filename, read_vacancies_jsonl
+from tests.helpers import create_vacancy
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_sink_roundtrip(tmp_path: Path, compress: bool) -> None:
+    path = make_jsonl_filename(tmp_path, "vacancies", compress)
+    vacancies = [create_vacancy(str(i), key_skills=["Python"]) for i in range(3)]
+
+    with JsonLinesSink(path) as sink:
+        for vac in vacancies:
+            sink.write(vac)
+
+    assert sink.count == 3
+    assert list(read_vacancies_jsonl(path)) == vacancies
+
+
+def test_read_skips_cut_off_files(tmp_path: Path) -> None:
+    path = tmp_path / "vacancies.jsonl"
+    with JsonLinesSink(path) as sink:
+        sink.write(create_vacancy("1"))
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"vacancy_id": "2", "na')
+    assert [vac.vacancy_id for vac in read_vacancies_jsonl(path)] == ["1"]
+
+    gz_path = tmp_path / "vacancies.jsonl.gz"
+    with JsonLinesSink(gz_path) as sink:
+        sink.write(create_vacancy("1"))
+        sink.write(create_vacancy("2"))
+    gz_path.write_bytes(gz_path.read_bytes()[:-10])
+    assert [vac.vacancy_id for vac in read_vacancies_jsonl(gz_path)] == ["1", "2"]
+
+
+@pytest.mark.parametrize("parse_workers", [0, 2])
+@pytest.mark.parametrize("backend", ["threads", "asyncio"])
+def test_stream_vacancies(api_url: str, tmp_path: Path, backend: str, parse_workers: int) -> None:
+    if backend == "asyncio":
+        pytest.importorskip("aiohttp")
+        from hh_inspect.async_collector import AsyncDataCollector as Collector  # noqa: PLC0415
+    else:
+        Collector = DataCollector  # noqa: N806
+    settings = Settings(general=GeneralSettings(num_workers=2, print_output_to_console=False))
+    settings.query.per_page = 5
+    dc = Collector(settings)
+    dc.api_url = api_url
+    expected = dc.collect_vacancies()
+
+    settings.general.stream_output = True
+    settings.general.parse_workers = parse_workers
+    dc = Collector(settings)
+    dc.api_url = api_url
+    path = tmp_path / "vacancies.jsonl.gz"
+    with JsonLinesSink(path) as sink:
+        count = dc.stream_vacancies(sink.write)
+    assert (dc.parse_pool is not None) == (parse_workers > 0)  # the bodies are parsed by the worker processes
+    assert dc.metrics.parsed == 15
+    dc.close()
+
+    streamed = list(read_vacancies_jsonl(path))
+    assert count == 15
+    assert sorted(streamed, key=lambda vac: vac.vacancy_id) == sorted(expected, key=lambda vac: vac.vacancy_id)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert len(f.readlines()) == 15
+
+
+def test_stream_drops_invalid_bodies(api_url: str) -> None:
+    settings = Settings(general=GeneralSettings(num_workers=1, parse_workers=1, print_output_to_console=False))
+    dc = DataCollector(settings)
+    dc.api_url = api_url
+    written: list[str] = []
+
+    count = dc.stream_vacancy_list(["1", "404", "2"], lambda vac: written.append(vac.vacancy_id))
+
+    assert count == 2
+    assert sorted(written) == ["1", "2"]
+    assert dc.dropped_ids == {"404": "HTTP 404"}
@@ -0,0 +1,96 @@
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from hh_inspect.vacancy_store import VacancyStore
+from tests.helpers import create_vacancy
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> VacancyStore:
+    return VacancyStore(tmp_path / "vacancies.db")
+
+
+def test_store_roundtrip(store: VacancyStore) -> None:
+    vacancies = [
+        create_vacancy("1", key_skills=["Python", "SQL"], work_format=["REMOTE"], published_at="2026-01-02"),
+        create_vacancy("2", accredited_it=True, published_at="2026-01-01"),
+    ]
+    with store.start_run("python", {"text": "Python", "area": ["1"]}) as run:
+        for vac in vacancies:
+            run.write(vac)
+
+    assert store.load_vacancies() == vacancies
+    [info] = store.get_runs()
+    assert info.name == "python"
+    assert info.query == {"text": "Python", "area": ["1"]}
+    assert info.num_vacancies == 2
+    assert info.finished_at is not None
+
+
+def test_store_upserts_across_runs(store: VacancyStore) -> None:
+    first = store.start_run("first", {})
+    store.upsert(first.run_id, [create_vacancy("1", salary_from=100), create_vacancy("2")], batch_size=1)
+    store.finish_run(first.run_id)
+    second = store.start_run("second", {})
+    store.upsert(second.run_id, [create_vacancy("2", salary_from=200), create_vacancy("3")])
+    store.finish_run(second.run_id)
+
+    assert [vac.vacancy_id for vac in store.iter_vacancies()] == ["1", "2", "3"]
+    assert [vac.salary_from for vac in store.iter_vacancies(run_id=second.run_id)] == [200, 0]
+    assert [vac.vacancy_id for vac in store.iter_vacancies(run_id=first.run_id)] == ["1", "2"]
+    assert [run.num_vacancies for run in store.get_runs()] == [2, 2]
+
+
+def test_store_filters(store: VacancyStore) -> None:
+    vacancies = [
+        create_vacancy("1", region="Москва", employer_name="Яндекс", published_at="2026-01-01"),
+        create_vacancy("2", region="Москва", employer_name="Сбер", published_at="2026-02-01"),
+        create_vacancy("3", region="Казань", employer_name="Яндекс", published_at="2026-03-01"),
+        replace(create_vacancy("4", employer_name="Яндекс"), excluded=True, employer_id="1740"),
+    ]
+    with store.start_run("run", {}) as run:
+        store.upsert(run.run_id, vacancies)
+
+    assert [vac.vacancy_id for vac in store.iter_vacancies(region="Москва")] == ["2", "1"]
+    assert [vac.vacancy_id for vac in store.iter_vacancies(employer="Яндекс")] == ["3", "1"]
+    february = store.iter_vacancies(published_from="2026-02-01", published_to="2026-02-28")
+    assert [vac.vacancy_id for vac in february] == ["2"]
+    assert [vac.vacancy_id for vac in store.iter_vacancies(employer="1740", include_excluded=True)] == ["4"]
+
+
+@pytest.mark.parametrize(
+    ("filters", "expected"),
+    [
+        ({"region": "Москва", "published_from": "2026-01-01"}, "SEARCH vacancies USING INDEX"),
+        ({"employer": "Яндекс"}, "SEARCH vacancies USING INDEX vacancies_employer_id"),
+        ({"run_id": 1}, "SEARCH run_vacancies USING PRIMARY KEY"),
+    ],
+)
+def test_store_uses_indexes(store: VacancyStore, filters: dict[str, Any], expected: str) -> None:
+    executed: list[str] = []
+    store.connection.set_trace_callback(executed.append)  # the queries with their parameters filled in
+    list(store.iter_vacancies(**filters))
+    store.connection.set_trace_callback(None)
+
+    [query] = executed
+    plan = " ".join(row[3] for row in store.connection.execute(f"EXPLAIN QUERY PLAN {query}"))
+    assert expected in plan
+    assert "SCAN vacancies" not in plan
+
+
+def test_crashed_run_is_not_finished(store: VacancyStore) -> None:
+    def crash() -> None:
+        with store.start_run("run", {}) as run:
+            run.write(create_vacancy("1"))
+            msg = "interrupted"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="interrupted"):
+        crash()
+
+    [info] = store.get_runs()
+    assert info.finished_at is None
+    assert store.load_vacancies() == [create_vacancy("1")]